@@ -1,8 +1,9 @@
 import time
 import random
 import string
-import re
-from flashtext import KeywordProcessor
+import tracemalloc
+from flashtext import KeywordProcessor, OverlayKeywordProcessor
+from flashtext.bench import generate_keywords, generate_corpus
 
 def generate_random_corpus(num_words=100000):
     words = []
@@ -11,7 +12,17 @@ def generate_random_corpus(num_words=100000):
         words.append(word)
     return ' '.join(words)
 
+def generate_zipfian_corpus(num_words=100000, vocabulary_size=2000):
+    vocabulary = [
+        ''.join(random.choices(string.ascii_letters, k=random.randint(3, 10)))
+        for _ in range(vocabulary_size)
+    ]
+    weights = [1.0 / rank for rank in range(1, vocabulary_size + 1)]
+    return ' '.join(random.choices(vocabulary, weights=weights, k=num_words))
+
 def benchmark():
+    # Feature comparisons. The scenario matrix (dictionary sizes, scripts, hit
+    # densities, regex baseline) is run with `python -m flashtext.bench run`.
     # Setup
     print("Generating corpus...")
     corpus = generate_random_corpus(500000) # 500k words
@@ -45,19 +56,308 @@ def benchmark():
     flashtext_strict_time = end_time - start_time
     print(f"FlashText (Case-Sensitive):   {flashtext_strict_time:.4f} seconds")
 
-    # 3. Regex (Baseline comparison)
-    # Compile regex for all keywords
-    # escaped_keywords = [re.escape(k) for k in keywords]
-    # pattern_str = r'\b(' + '|'.join(escaped_keywords) + r')\b'
-    # pattern = re.compile(pattern_str, re.IGNORECASE)
-    
-    # start_time = time.time()
-    # pattern.findall(corpus)
-    # end_time = time.time()
-    # regex_time = end_time - start_time
-    # print(f"Regex (Compiled):             {regex_time:.4f} seconds")
-    
-    # print(f"Speedup vs Regex: {regex_time / flashtext_time:.2f}x")
+    # 2b. ASCII-only word boundaries (pre Issue #4 behaviour), for comparison with 1.
+    kp_ascii = KeywordProcessor(case_sensitive=False, unicode_boundaries=False)
+    kp_ascii.add_keywords_from_list(keywords)
+
+    start_time = time.time()
+    kp_ascii.extract_keywords(corpus)
+    end_time = time.time()
+    flashtext_ascii_time = end_time - start_time
+    print(f"FlashText (ASCII Boundaries): {flashtext_ascii_time:.4f} seconds "
+          f"(Unicode boundaries: {flashtext_time / flashtext_ascii_time:.2f}x)")
+
+    benchmark_fuzzy_index(keywords)
+    benchmark_fuzzy_index_long()
+    benchmark_fuzzy_cache(keywords)
+    benchmark_char_variants()
+    benchmark_match_array(keywords)
+    benchmark_overlay()
+    benchmark_batch_update()
+    benchmark_apply_delta()
+    benchmark_kernels()
+    benchmark_kernel_calls()
+
+
+def benchmark_fuzzy_index(keywords, max_cost=1):
+    # 4. Fuzzy lookup: trie-wide search vs symmetric-delete index
+    corpus = generate_random_corpus(20000)
+    print(f"Fuzzy corpus length: {len(corpus)} chars (max_cost={max_cost})")
+
+    kp_fuzzy = KeywordProcessor()
+    kp_fuzzy.add_keywords_from_list(keywords)
+    start_time = time.time()
+    kp_fuzzy.extract_keywords(corpus, max_cost=max_cost)
+    end_time = time.time()
+    print(f"FlashText (Fuzzy, Trie Search): {end_time - start_time:.4f} seconds")
+
+    kp_indexed = KeywordProcessor(fuzzy_index=max_cost)
+    start_time = time.time()
+    kp_indexed.add_keywords_from_list(keywords)
+    build_time = time.time() - start_time
+    start_time = time.time()
+    kp_indexed.extract_keywords(corpus, max_cost=max_cost, indexed=True)
+    end_time = time.time()
+    print(f"FlashText (Fuzzy, Delete Index): {end_time - start_time:.4f} seconds")
+    print(f"Delete Index: build {build_time:.4f} seconds, "
+          f"{kp_indexed.fuzzy_index.memory_usage() / 1024 / 1024:.2f} MiB")
+
+
+def benchmark_fuzzy_index_long(num_keywords=2000, num_words=20000, max_cost=2):
+    # 4b. Fuzzy index with long multi-word keywords: every probed window builds
+    # O(len ** max_cost) deletion variants, so only windows near an indexed length are probed
+    words = [''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 9))) for _ in range(5000)]
+    keywords = [' '.join(random.choices(words, k=8)) for _ in range(num_keywords)]
+    text = []
+    for _ in range(num_words // 10):
+        text.extend(random.choices(words, k=10))
+        keyword = random.choice(keywords)
+        typo = random.randrange(len(keyword))
+        text.append(keyword[:typo] + keyword[typo + 1:])
+    corpus = ' '.join(text)
+    lengths = sorted(len(keyword) for keyword in keywords)
+    print(f"Fuzzy corpus length: {len(corpus)} chars, keywords of {lengths[0]}-{lengths[-1]} chars "
+          f"(max_cost={max_cost})")
+    for label, processor in (('Trie Search', KeywordProcessor()),
+                             ('Delete Index', KeywordProcessor(fuzzy_index=max_cost))):
+        processor.add_keywords_from_list(keywords)
+        start_time = time.time()
+        found = processor.extract_keywords(corpus, max_cost=max_cost, indexed=processor.fuzzy_index is not None)
+        print(f"FlashText (Fuzzy Long Keywords, {label}): {time.time() - start_time:.4f} seconds, "
+              f"{len(found)} matches")
+
+
+def benchmark_fuzzy_cache(keywords, max_cost=1):
+    # 5. Fuzzy lookup on repeated (Zipfian) words, with and without the fuzzy cache
+    corpus = generate_zipfian_corpus(50000)
+    print(f"Zipfian corpus length: {len(corpus)} chars (max_cost={max_cost})")
+
+    kp_exact = KeywordProcessor()
+    kp_exact.add_keywords_from_list(keywords)
+    start_time = time.time()
+    kp_exact.extract_keywords(corpus)
+    exact_time = time.time() - start_time
+    print(f"FlashText (Exact):              {exact_time:.4f} seconds")
+
+    for cache_size in (0, 4096):
+        kp = KeywordProcessor(fuzzy_cache_size=cache_size)
+        kp.add_keywords_from_list(keywords)
+        start_time = time.time()
+        kp.extract_keywords(corpus, max_cost=max_cost)
+        fuzzy_time = time.time() - start_time
+        stats = kp.fuzzy_stats()
+        print(f"FlashText (Fuzzy, cache={cache_size}): {fuzzy_time:.4f} seconds "
+              f"({fuzzy_time / exact_time:.1f}x exact, {stats['cache_hits']} hits / {stats['cache_misses']} misses)")
+
+
+def benchmark_char_variants(num_keywords=5000, num_pairs=500):
+    # 6. Script variants: folding table vs inserting every variant of every keyword
+    # synthetic (canonical, variant) ideograph pairs stand in for a Simplified/Traditional table
+    canonical = [chr(0x4E00 + i) for i in range(num_pairs)]
+    variant = [chr(0x6000 + i) for i in range(num_pairs)]
+    shared = [chr(0x8000 + i) for i in range(num_pairs)]
+    to_variant = dict(zip(canonical, variant))
+    keywords = set()
+    while len(keywords) < num_keywords:
+        keywords.add(''.join(random.choices(canonical + shared, k=random.randint(2, 4))))
+    keywords = list(keywords)
+    # sentences in either script, some mixing both
+    pieces = []
+    for _ in range(50000):
+        word = random.choice(keywords) if random.random() < 0.3 else ''.join(random.choices(shared, k=3))
+        mode = random.random()
+        if mode < 0.4:
+            word = ''.join(to_variant.get(char, char) for char in word)
+        elif mode < 0.6:
+            word = ''.join(to_variant.get(char, char) if random.random() < 0.5 else char for char in word)
+        pieces.append(word)
+    corpus = '，'.join(pieces)
+    print(f"Variant corpus length: {len(corpus)} chars")
+
+    def build(processor, keyword_list):
+        tracemalloc.start()
+        for keyword in keyword_list:
+            processor.add_keyword(keyword, keyword)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size
+
+    kp_duplicated = KeywordProcessor()
+    duplicated = keywords + [''.join(to_variant.get(char, char) for char in kw) for kw in keywords]
+    size = build(kp_duplicated, duplicated)
+    start_time = time.time()
+    found_duplicated = kp_duplicated.extract_keywords(corpus)
+    end_time = time.time()
+    print(f"FlashText (Duplicated Variants): {end_time - start_time:.4f} seconds, "
+          f"{size / 1024 / 1024:.2f} MiB, {len(found_duplicated)} matches")
+
+    kp_folded = KeywordProcessor(char_variants=dict(zip(variant, canonical)))
+    size = build(kp_folded, keywords)
+    start_time = time.time()
+    found_folded = kp_folded.extract_keywords(corpus)
+    end_time = time.time()
+    print(f"FlashText (Folded Variants):     {end_time - start_time:.4f} seconds, "
+          f"{size / 1024 / 1024:.2f} MiB, {len(found_folded)} matches")
+
+
+def benchmark_match_array(keywords):
+    # 7. Many hits: list of (clean_name, start, end) tuples vs columnar MatchArray
+    corpus = ' '.join(random.choices(keywords, k=300000))
+    kp = KeywordProcessor()
+    kp.add_keywords_from_list(keywords)
+    for label, options in (("Tuples", {'span_info': True}), ("MatchArray", {'as_array': True})):
+        start_time = time.time()
+        kp.extract_keywords(corpus, **options)
+        end_time = time.time()
+        # memory is measured on a second run, tracemalloc slows allocations down
+        tracemalloc.start()
+        matches = kp.extract_keywords(corpus, **options)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"FlashText ({label}): {end_time - start_time:.4f} seconds, "
+              f"{len(matches)} hits, {size / 1024 / 1024:.2f} MiB")
+        del matches
+
+
+def benchmark_overlay(num_keywords=100000, num_tenants=10, num_changes=2000):
+    # 8. Tenants: overlays on one shared base vs one merged processor per tenant
+    base_keywords = list({
+        ''.join(random.choices(string.ascii_lowercase, k=random.randint(4, 10))) for _ in range(num_keywords)
+    })
+    base = KeywordProcessor()
+    base.add_keywords_from_list(base_keywords)
+    tenant_changes = [
+        ([''.join(random.choices(string.ascii_lowercase, k=random.randint(4, 10))) for _ in range(num_changes)],
+         random.sample(base_keywords, num_changes // 4))
+        for _ in range(num_tenants)
+    ]
+    corpus = ' '.join(random.choices(base_keywords, k=100000))
+
+    def build_merged(additions, removals):
+        processor = KeywordProcessor()
+        processor.add_keywords_from_list(base_keywords)
+        processor.add_keywords_from_list(additions)
+        processor.remove_keywords_from_list(removals)
+        return processor
+
+    def build_overlay(additions, removals):
+        processor = OverlayKeywordProcessor(base)
+        processor.add_keywords_from_list(additions)
+        processor.remove_keywords_from_list(removals)
+        return processor
+
+    print(f"Tenants: {num_tenants} x {num_changes} additions and {num_changes // 4} removals "
+          f"over {len(base_keywords)} keywords")
+    for label, build in (("Merged", build_merged), ("Overlay", build_overlay)):
+        start_time = time.time()
+        tenants = [build(*changes) for changes in tenant_changes]
+        build_time = time.time() - start_time
+        start_time = time.time()
+        tenants[0].extract_keywords(corpus)
+        scan_time = time.time() - start_time
+        del tenants
+        tracemalloc.start()
+        tenants = [build(*changes) for changes in tenant_changes]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del tenants
+        print(f"FlashText ({label} Tenants): build {build_time:.4f} seconds, scan {scan_time:.4f} seconds, "
+              f"{size / 1024 / 1024:.2f} MiB")
+
+
+def benchmark_batch_update(num_changes=1000):
+    # 9. Copy-on-write batches: latency follows the size of the change, not of the dictionary
+    for num_keywords in (10000, 100000):
+        keywords = [''.join(random.choices(string.ascii_lowercase, k=random.randint(4, 10)))
+                    for _ in range(num_keywords)]
+        processor = KeywordProcessor()
+        processor.add_keywords_from_list(keywords)
+        start_time = time.time()
+        rebuilt = KeywordProcessor()
+        rebuilt.add_keywords_from_list(keywords)
+        rebuild_time = time.time() - start_time
+        start_time = time.time()
+        with processor.batch_update() as batch:
+            batch.add_keywords_from_list(
+                ''.join(random.choices(string.ascii_lowercase, k=8)) for _ in range(num_changes))
+        print(f"FlashText (Batch Update): {num_changes} changes over {num_keywords} keywords in "
+              f"{time.time() - start_time:.4f} seconds (rebuild: {rebuild_time:.4f} seconds)")
+
+
+def benchmark_apply_delta(num_keywords=200000, num_changes=20000):
+    # 10. Daily changelog: one sorted copy-on-write traversal vs a batch of the same changes
+    #     (also published atomically) vs in-place keyword by keyword calls
+    keywords = list({''.join(random.choices(string.ascii_lowercase, k=random.randint(4, 10)))
+                     for _ in range(num_keywords)})
+    removals = random.sample(keywords, num_changes // 2)
+    additions = [''.join(random.choices(string.ascii_lowercase, k=random.randint(4, 10)))
+                 for _ in range(num_changes // 2)]
+    delta = ['- ' + keyword for keyword in removals] + ['+ ' + keyword for keyword in additions]
+    processor = KeywordProcessor()
+    processor.add_keywords_from_list(keywords)
+    start_time = time.time()
+    processor.remove_keywords_from_list(removals)
+    processor.add_keywords_from_list(additions)
+    list_time = time.time() - start_time
+    processor = KeywordProcessor()
+    processor.add_keywords_from_list(keywords)
+    start_time = time.time()
+    with processor.batch_update() as batch:
+        batch.remove_keywords_from_list(removals)
+        batch.add_keywords_from_list(additions)
+    batch_time = time.time() - start_time
+    processor = KeywordProcessor()
+    processor.add_keywords_from_list(keywords)
+    report = processor.apply_delta(delta)
+    print(f"FlashText (Delta): {num_changes} changes over {len(keywords)} keywords: "
+          f"apply_delta {report['seconds']:.4f} seconds, batch_update {batch_time:.4f} seconds, "
+          f"keyword by keyword in place {list_time:.4f} seconds")
+
+
+def benchmark_kernels(num_keywords=10000, num_words=200000):
+    # 11. Specialized scan kernels vs the generic scan loop, per dictionary script and output
+    for script in ('latin', 'cjk', 'mixed'):
+        keywords = generate_keywords(num_keywords, script)
+        corpus = generate_corpus(keywords, num_words, script, density=0.05)
+        plain = KeywordProcessor()
+        plain.add_keywords_from_list(keywords)
+        multi_label = KeywordProcessor()
+        for keyword in keywords:
+            multi_label.add_keyword(keyword, [keyword, script])
+        for label, processor in (('string', plain), ('multi-label', multi_label)):
+            kernel = processor._select_kernel(processor._get_char_classes()).__name__
+            for span_info in (False, True):
+                times = []
+                for use_kernels in (True, False):
+                    processor._use_kernels = use_kernels
+                    start_time = time.time()
+                    processor.extract_keywords(corpus, span_info=span_info)
+                    times.append(time.time() - start_time)
+                processor._use_kernels = True
+                print(f"FlashText (Kernels): {script} {label} span_info={span_info} {kernel}: "
+                      f"{times[0]:.4f} seconds, generic loop {times[1]:.4f} seconds ({times[1] / times[0]:.2f}x)")
+
+
+def benchmark_kernel_calls(num_keywords=20000, num_sentences=2000, alphabet_size=20000):
+    # 11b. Per-call cost on short sentences: the kernel choice must not grow with the
+    #      number of distinct keyword characters (CJK dictionaries over a large alphabet)
+    alphabet = [chr(0x4E00 + index) for index in range(alphabet_size)]
+    keywords = [''.join(random.choices(alphabet, k=random.randint(2, 4))) for _ in range(num_keywords)]
+    sentences = [''.join(random.choices(alphabet, k=8)) + random.choice(keywords) for _ in range(num_sentences)]
+    for label, extra in (('cjk', []), ('mixed', ['iPhone'])):
+        processor = KeywordProcessor()
+        processor.add_keywords_from_list(keywords + extra)
+        kernel = processor._select_kernel(processor._get_char_classes()).__name__
+        times = []
+        for use_kernels in (True, False):
+            processor._use_kernels = use_kernels
+            start_time = time.time()
+            for sentence in sentences:
+                processor.extract_keywords(sentence)
+            times.append((time.time() - start_time) / num_sentences * 1e6)
+        print(f"FlashText (Kernel Calls): {label} {len(processor._keyword_chars)} keyword chars {kernel}: "
+              f"{times[0]:.1f} us per call, generic loop {times[1]:.1f} us per call")
+
 
 if __name__ == "__main__":
     benchmark()
@@ -1 +1,3 @@
 from flashtext.keyword import KeywordProcessor
+from flashtext.overlay import OverlayKeywordProcessor
+from flashtext.disk import DiskKeywordProcessor
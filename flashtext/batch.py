@@ -0,0 +1,60 @@
+class KeywordBatch(object):
+    """Keyword changes published together by `KeywordProcessor.batch_update`.
+
+    Changes are recorded, not applied: the processor is untouched until
+    `commit`, which applies them copy-on-write and swaps the new trie in.
+    Used as a context manager, the batch is committed when the block exits
+    normally and dropped if it raises.
+
+    Examples:
+        >>> batch = keyword_processor.batch_update()
+        >>> batch.add_keyword('Big Apple', 'New York')
+        >>> batch.remove_keyword('NY')
+        >>> batch.commit()
+        >>> # 1
+    """
+
+    def __init__(self, processor):
+        self.processor = processor
+        self._operations = []
+
+    def __len__(self):
+        return len(self._operations)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self._operations = []
+        return False
+
+    def add_keyword(self, keyword, clean_name=None, case_sensitive=None, categories=None):
+        """Record a keyword to add, see `KeywordProcessor.add_keyword`."""
+        self._operations.append(('_add_keyword_to_trie', (keyword, clean_name, case_sensitive, categories)))
+
+    def remove_keyword(self, keyword):
+        """Record a keyword to remove, see `KeywordProcessor.remove_keyword`."""
+        self._operations.append(('_remove_keyword_from_trie', (keyword,)))
+
+    def add_keywords_from_list(self, keyword_list):
+        """Record keywords to add, each one its own clean name."""
+        for keyword in keyword_list:
+            self.add_keyword(keyword)
+
+    def remove_keywords_from_list(self, keyword_list):
+        """Record keywords to remove."""
+        for keyword in keyword_list:
+            self.remove_keyword(keyword)
+
+    def commit(self):
+        """
+        Apply the recorded changes and publish the new trie.
+
+        Returns:
+            int: the new `version` of the processor
+        """
+        operations, self._operations = self._operations, []
+        return self.processor._publish_batch(operations)
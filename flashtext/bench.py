@@ -0,0 +1,583 @@
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import string
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+
+from .keyword import KeywordProcessor
+
+SCRIPTS = ('latin', 'cjk', 'mixed')
+CASE_MODES = ('insensitive', 'sensitive', 'mixed')
+OPERATIONS = ('build', 'extract', 'extract_spans', 'extract_fuzzy1', 'extract_fuzzy2', 'replace',
+              'extract_sentences', 'remove_churn', 'regex')
+
+PRESETS = {
+    'quick': {'sizes': (1000, 10000), 'densities': (0.01, 0.1), 'num_words': 20000},
+    'default': {'sizes': (1000, 100000, 1000000), 'densities': (0.01, 0.1), 'num_words': 200000},
+    'full': {'sizes': (1000, 10000, 100000, 1000000, 5000000), 'densities': (0.001, 0.01, 0.1),
+             'num_words': 1000000},
+}
+
+# CJK Unified Ideographs, the bulk of Chinese and Japanese kanji text
+_CJK_FIRST, _CJK_LAST = 0x4E00, 0x9FFF
+_SENTENCE_WORDS = 20
+
+# dictionary shapes of the memory benchmark -> (keyword script, words per keyword, case sensitive, labels)
+MEMORY_SHAPES = {
+    'cjk_short': ('cjk', (1, 1), False, 0),
+    'english_phrases': ('latin', (3, 6), False, 0),
+    'latin_insensitive': ('latin', (1, 3), False, 0),
+    'latin_sensitive': ('latin', (1, 3), True, 0),
+    'multi_label': ('latin', (1, 3), False, 3),
+}
+
+
+def random_word(rng, script):
+    """
+    One random word of a script.
+
+    Args:
+        rng (random.Random): seeded generator
+        script (str): 'latin' (3 to 10 ASCII letters) or 'cjk' (2 to 4 ideographs)
+
+    Returns:
+        str: the word
+    """
+    if script == 'cjk':
+        return ''.join(chr(rng.randint(_CJK_FIRST, _CJK_LAST)) for _ in range(rng.randint(2, 4)))
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+
+def generate_keywords(size, script='latin', seed=0):
+    """
+    Distinct keywords of one to three words, reproducible for a seed.
+
+    Args:
+        size (int): number of keywords
+        script (str): 'latin', 'cjk' or 'mixed' (every other keyword is CJK)
+        seed (int): seed of the generator
+
+    Returns:
+        list: `size` distinct keywords, in generation order
+    """
+    rng = random.Random(seed)
+    keywords = []
+    seen = set()
+    while len(keywords) < size:
+        word_script = script if script != 'mixed' else SCRIPTS[len(keywords) % 2]
+        separator = '' if word_script == 'cjk' else ' '
+        keyword = separator.join(random_word(rng, word_script) for _ in range(rng.choice((1, 1, 1, 2, 3))))
+        if keyword not in seen:
+            seen.add(keyword)
+            keywords.append(keyword)
+    return keywords
+
+
+def generate_corpus(keywords, num_words, script='latin', density=0.01, zipf_exponent=1.0, seed=0,
+                    mixed_case=False):
+    """
+    Text where keywords occur with a Zipfian distribution among random filler words.
+
+    Latin words are separated by spaces, CJK words are written without spaces,
+    and a sentence delimiter ends every 20 words.
+
+    Args:
+        keywords (list): dictionary, its first keywords are the most frequent
+        num_words (int): number of words (keywords count as one) in the text
+        script (str): script of the filler words, 'latin', 'cjk' or 'mixed'
+        density (float): share of the words that are keywords
+        zipf_exponent (float): exponent of the rank distribution of the keywords
+        seed (int): seed of the generator
+        mixed_case (bool): capitalize or upper case some of the Latin words
+
+    Returns:
+        str: the text
+    """
+    rng = random.Random(seed)
+    cumulative = list(itertools.accumulate(1.0 / rank ** zipf_exponent for rank in range(1, len(keywords) + 1)))
+    total = cumulative[-1]
+    # a pool of filler words keeps the vocabulary realistic and the generation fast
+    filler = [random_word(rng, script if script != 'mixed' else SCRIPTS[index % 2]) for index in range(4096)]
+    parts = []
+    for index in range(num_words):
+        if rng.random() < density:
+            word = keywords[min(bisect_left(cumulative, rng.random() * total), len(keywords) - 1)]
+        else:
+            word = rng.choice(filler)
+        if mixed_case and rng.random() < 0.2:
+            word = word.upper() if rng.random() < 0.5 else word.capitalize()
+        parts.append(word)
+        if index % _SENTENCE_WORDS == _SENTENCE_WORDS - 1:
+            parts.append('。' if _is_cjk(word[-1]) else '.')
+        if not _is_cjk(word[-1]) or script != 'cjk':
+            parts.append(' ')
+    return ''.join(parts)
+
+
+def _is_cjk(character):
+    return _CJK_FIRST <= ord(character) <= _CJK_LAST
+
+
+def build_processor(keywords, case='insensitive'):
+    """
+    Processor holding `keywords`.
+
+    Args:
+        keywords (list): keywords to add
+        case (str): 'insensitive', 'sensitive', or 'mixed' (case insensitive
+            processor where every tenth keyword is added case sensitive, capitalized)
+
+    Returns:
+        KeywordProcessor: the processor
+    """
+    processor = KeywordProcessor(case_sensitive=case == 'sensitive')
+    if case == 'mixed':
+        for index, keyword in enumerate(keywords):
+            if index % 10 == 9:
+                processor.add_keyword(keyword.capitalize(), case_sensitive=True)
+            else:
+                processor.add_keyword(keyword)
+    else:
+        processor.add_keywords_from_list(keywords)
+    return processor
+
+
+def time_runs(function, repeat):
+    """
+    Run `function` `repeat` times.
+
+    Returns:
+        seconds, result (tuple): list of durations, result of the last run
+    """
+    seconds = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - start)
+    return seconds, result
+
+
+def summarize(seconds, chars=None, items=None):
+    """
+    Statistics of repeated durations.
+
+    Args:
+        seconds (list): durations of the runs
+        chars (int): characters processed by one run, to report a throughput
+        items (int): results of one run (matches, keywords)
+
+    Returns:
+        dict: repeat, min, median, mean, stdev (seconds), chars_per_sec and items when given
+    """
+    median = statistics.median(seconds)
+    summary = {
+        'repeat': len(seconds),
+        'min': min(seconds),
+        'median': median,
+        'mean': statistics.mean(seconds),
+        'stdev': statistics.stdev(seconds) if len(seconds) > 1 else 0.0,
+    }
+    if chars is not None:
+        summary['chars_per_sec'] = chars / median if median else None
+    if items is not None:
+        summary['items'] = items
+    return summary
+
+
+def scenario_name(scenario):
+    """Stable name of a scenario, the key used to compare two result files."""
+    return '{script}-{size}-d{density:g}-{case}'.format(**scenario)
+
+
+def iter_scenarios(sizes, scripts=SCRIPTS, densities=(0.01,), cases=('insensitive', 'mixed')):
+    """Scenarios of the matrix, smallest dictionaries first."""
+    for size, script, density, case in itertools.product(sizes, scripts, densities, cases):
+        yield {'size': size, 'script': script, 'density': density, 'case': case}
+
+
+def run_scenario(scenario, operations=OPERATIONS, num_words=20000, repeat=3, seed=0, fuzzy_words=2000,
+                 churn=1000, regex_limit=10000):
+    """
+    Time the operations of one scenario.
+
+    Args:
+        scenario (dict): size, script, density and case (see `iter_scenarios`)
+        operations (iterable): names among `OPERATIONS`
+        num_words (int): words in the corpus
+        repeat (int): runs per operation
+        seed (int): seed of the keyword and corpus generators
+        fuzzy_words (int): words of the corpus scanned by the fuzzy operations
+        churn (int): keywords removed and added back by 'remove_churn'
+        regex_limit (int): largest dictionary timed with the regex baseline
+
+    Returns:
+        dict: operation name -> statistics (see `summarize`)
+    """
+    keywords = generate_keywords(scenario['size'], scenario['script'], seed)
+    corpus = generate_corpus(keywords, num_words, scenario['script'], scenario['density'], seed=seed + 1,
+                             mixed_case=scenario['case'] != 'sensitive')
+    results = {}
+    seconds, processor = time_runs(lambda: build_processor(keywords, scenario['case']),
+                                   repeat if 'build' in operations else 1)
+    if 'build' in operations:
+        results['build'] = summarize(seconds, items=len(processor))
+    if 'extract' in operations:
+        seconds, found = time_runs(lambda: processor.extract_keywords(corpus), repeat)
+        results['extract'] = summarize(seconds, len(corpus), len(found))
+        # scan kernel picked for exact scans, see KeywordProcessor._select_kernel
+        results['extract']['kernel'] = processor._select_kernel(processor._get_char_classes()).__name__
+    if 'extract_spans' in operations:
+        seconds, found = time_runs(lambda: processor.extract_keywords(corpus, span_info=True), repeat)
+        results['extract_spans'] = summarize(seconds, len(corpus), len(found))
+    fuzzy_corpus = corpus[:len(corpus) * fuzzy_words // num_words]
+    for max_cost in (1, 2):
+        name = 'extract_fuzzy{}'.format(max_cost)
+        if name in operations:
+            def extract_fuzzy():
+                # every run starts with an empty fuzzy cache, as a new document would
+                if processor._fuzzy_cache is not None:
+                    processor._fuzzy_cache.clear()
+                return processor.extract_keywords(fuzzy_corpus, max_cost=max_cost)
+            # the first fuzzy lookup builds the pruning table, it is not timed
+            extract_fuzzy()
+            seconds, found = time_runs(extract_fuzzy, repeat)
+            results[name] = summarize(seconds, len(fuzzy_corpus), len(found))
+    if 'replace' in operations:
+        seconds, replaced = time_runs(lambda: processor.replace_keywords(corpus), repeat)
+        results['replace'] = summarize(seconds, len(corpus))
+    if 'extract_sentences' in operations:
+        seconds, sentences = time_runs(lambda: processor.extract_sentences(corpus), repeat)
+        results['extract_sentences'] = summarize(seconds, len(corpus), len(sentences))
+    if 'remove_churn' in operations:
+        churned = random.Random(seed + 2).sample(keywords, min(churn, len(keywords)))
+
+        def remove_and_add():
+            processor.remove_keywords_from_list(churned)
+            processor.add_keywords_from_list(churned)
+        seconds, _ = time_runs(remove_and_add, repeat)
+        results['remove_churn'] = summarize(seconds, items=len(churned))
+    if 'regex' in operations and scenario['size'] <= regex_limit:
+        # alternation of the escaped keywords, longest first, as a baseline
+        alternation = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+        if scenario['script'] == 'latin':
+            alternation = r'\b(?:{})\b'.format(alternation)
+        pattern = re.compile(alternation, 0 if scenario['case'] == 'sensitive' else re.IGNORECASE)
+        seconds, found = time_runs(lambda: pattern.findall(corpus), repeat)
+        results['regex'] = summarize(seconds, len(corpus), len(found))
+    return results
+
+
+def run(scenarios, progress=None, **options):
+    """
+    Time every scenario.
+
+    Args:
+        scenarios (iterable): scenarios, see `iter_scenarios`
+        progress (callable): called with the name and results of each finished scenario
+        **options: passed on to `run_scenario`
+
+    Returns:
+        dict: 'meta' (environment and options) and 'results' (scenario name -> scenario and operations)
+    """
+    results = {}
+    for scenario in scenarios:
+        name = scenario_name(scenario)
+        operations = run_scenario(scenario, **options)
+        results[name] = {'scenario': scenario, 'operations': operations}
+        if progress is not None:
+            progress(name, operations)
+    return {'meta': _environment(options), 'results': results}
+
+
+def generate_shape(shape, size, seed=0):
+    """
+    Keywords and clean names of a dictionary shape of the memory benchmark.
+
+    Args:
+        shape (str): key of `MEMORY_SHAPES`
+        size (int): number of keywords
+        seed (int): seed of the generator
+
+    Returns:
+        entries, case_sensitive (tuple): list of (keyword, clean_name) pairs, clean_name
+            None or a list of labels, and the case sensitivity of the processor
+    """
+    script, (fewest, most), case_sensitive, labels = MEMORY_SHAPES[shape]
+    rng = random.Random(seed)
+    separator = '' if script == 'cjk' else ' '
+    entries = []
+    seen = set()
+    while len(entries) < size:
+        keyword = separator.join(random_word(rng, script) for _ in range(rng.randint(fewest, most)))
+        if keyword in seen:
+            continue
+        seen.add(keyword)
+        if case_sensitive:
+            keyword = keyword.capitalize()
+        clean_name = None
+        if labels:
+            # labels drawn from a small vocabulary, as categories or entity types would be
+            clean_name = ['label{}'.format(rng.randrange(100)) for _ in range(labels)]
+        entries.append((keyword, clean_name))
+    return entries, case_sensitive
+
+
+def current_rss():
+    """Resident set size of this process in bytes, None where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+
+
+def measure_memory(shape, size, seed=0, rss=True):
+    """
+    Memory taken by building a processor of a dictionary shape.
+
+    The build is traced with tracemalloc, which counts the bytes of every
+    Python object the processor keeps. With `rss`, an untraced build is done
+    first and the growth of the resident set size is reported as well; it
+    includes allocator overhead but is noisy, as freed memory is not always
+    returned to the system.
+
+    Args:
+        shape (str): key of `MEMORY_SHAPES`
+        size (int): number of keywords
+        seed (int): seed of the generator
+        rss (bool): also measure the resident set size growth
+
+    Returns:
+        dict: keywords, nodes, bytes (kept after the build), peak_bytes, bytes_per_keyword,
+            bytes_per_node and rss_bytes (None when not measured)
+    """
+    entries, case_sensitive = generate_shape(shape, size, seed)
+
+    def build():
+        processor = KeywordProcessor(case_sensitive=case_sensitive)
+        for keyword, clean_name in entries:
+            processor.add_keyword(keyword, clean_name)
+        return processor
+
+    rss_bytes = None
+    if rss:
+        gc.collect()
+        before = current_rss()
+        processor = build()
+        after = current_rss()
+        if before is not None and after is not None:
+            rss_bytes = after - before
+        del processor
+    gc.collect()
+    tracemalloc.start()
+    try:
+        processor = build()
+        gc.collect()
+        kept, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    nodes = processor.trie_stats()['nodes']
+    return {
+        'shape': shape,
+        'size': size,
+        'keywords': len(processor),
+        'nodes': nodes,
+        'bytes': kept,
+        'peak_bytes': peak,
+        'bytes_per_keyword': kept / len(processor) if len(processor) else None,
+        'bytes_per_node': kept / nodes,
+        'rss_bytes': rss_bytes,
+    }
+
+
+def run_memory(shapes, sizes, seed=0, rss=True, progress=None):
+    """
+    Measure every shape and size.
+
+    Args:
+        shapes (iterable): keys of `MEMORY_SHAPES`
+        sizes (iterable): numbers of keywords
+        seed (int): seed of the generators
+        rss (bool): also measure the resident set size growth
+        progress (callable): called with the name and report of each measurement
+
+    Returns:
+        dict: 'meta' (environment and options) and 'memory' ('<shape>-<size>' -> report,
+            see `measure_memory`)
+    """
+    reports = {}
+    for size, shape in itertools.product(sizes, shapes):
+        name = '{}-{}'.format(shape, size)
+        reports[name] = measure_memory(shape, size, seed, rss)
+        if progress is not None:
+            progress(name, reports[name])
+    return {'meta': _environment({'shapes': list(shapes), 'sizes': list(sizes), 'seed': seed}), 'memory': reports}
+
+
+def check_budget(results, max_bytes_per_keyword=None, max_bytes_per_node=None):
+    """
+    Memory reports over budget.
+
+    Args:
+        results (dict): output of `run_memory`
+        max_bytes_per_keyword (float): budget per keyword, None for no limit
+        max_bytes_per_node (float): budget per trie node, None for no limit
+
+    Returns:
+        list: one message per report and budget exceeded, empty when all fit
+    """
+    violations = []
+    for name, report in results['memory'].items():
+        for field, budget in (('bytes_per_keyword', max_bytes_per_keyword), ('bytes_per_node', max_bytes_per_node)):
+            if budget is not None and report[field] is not None and report[field] > budget:
+                violations.append('{}: {} {:.1f} over budget {:g}'.format(name, field, report[field], budget))
+    return violations
+
+
+def _environment(options):
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'options': {key: list(value) if isinstance(value, tuple) else value for key, value in options.items()},
+    }
+
+
+def compare(old, new, statistic='median'):
+    """
+    Ratios of the timings, or memory, of two result files.
+
+    Args:
+        old (dict): results of the reference revision, as returned by `run` or `run_memory`
+        new (dict): results of the revision under test
+        statistic (str): statistic of the timings compared, 'median', 'min' or 'mean'
+
+    Returns:
+        list: (scenario, operation, old value, new value, new / old) tuples for the
+            operations present in both, in scenario order. Timings are in seconds;
+            memory reports give a 'bytes' row.
+    """
+    rows = []
+    for name, report in new.get('memory', {}).items():
+        reference = old.get('memory', {}).get(name)
+        if reference is not None:
+            ratio = report['bytes'] / reference['bytes'] if reference['bytes'] else None
+            rows.append((name, 'bytes', reference['bytes'], report['bytes'], ratio))
+    for name, entry in new.get('results', {}).items():
+        reference = old.get('results', {}).get(name)
+        if reference is None:
+            continue
+        for operation, stats in entry['operations'].items():
+            before = reference['operations'].get(operation)
+            if before is None:
+                continue
+            ratio = stats[statistic] / before[statistic] if before[statistic] else None
+            rows.append((name, operation, before[statistic], stats[statistic], ratio))
+    return rows
+
+
+def _split(value, cast=str):
+    return tuple(cast(item) for item in value.split(',') if item)
+
+
+def main(argv=None):
+    """Command line entry point, see `python -m flashtext.bench --help`."""
+    parser = argparse.ArgumentParser(prog='python -m flashtext.bench', description=(
+        'Time flashtext over a matrix of dictionary sizes, scripts, hit densities and case modes, '
+        'measure the memory of dictionary builds, or compare two result files.'))
+    commands = parser.add_subparsers(dest='command')
+    run_parser = commands.add_parser('run', help='run the scenario matrix')
+    run_parser.add_argument('--preset', choices=sorted(PRESETS), default='quick')
+    run_parser.add_argument('--sizes', type=lambda value: _split(value, int), help='e.g. 1000,100000')
+    run_parser.add_argument('--scripts', type=_split, default=SCRIPTS, help='among latin,cjk,mixed')
+    run_parser.add_argument('--densities', type=lambda value: _split(value, float), help='e.g. 0.01,0.1')
+    run_parser.add_argument('--cases', type=_split, default=('insensitive', 'mixed'),
+                            help='among insensitive,sensitive,mixed')
+    run_parser.add_argument('--operations', type=_split, default=OPERATIONS, help=','.join(OPERATIONS))
+    run_parser.add_argument('--words', type=int, help='words in the corpus')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--output', help='JSON file to write the results to')
+    memory_parser = commands.add_parser('memory', help='measure the memory of dictionary builds')
+    memory_parser.add_argument('--shapes', type=_split, default=tuple(MEMORY_SHAPES), help=','.join(MEMORY_SHAPES))
+    memory_parser.add_argument('--sizes', type=lambda value: _split(value, int), default=(1000, 100000))
+    memory_parser.add_argument('--seed', type=int, default=0)
+    memory_parser.add_argument('--no-rss', dest='rss', action='store_false', help='skip the untraced RSS build')
+    memory_parser.add_argument('--max-bytes-per-keyword', type=float, help='fail above this budget')
+    memory_parser.add_argument('--max-bytes-per-node', type=float, help='fail above this budget')
+    memory_parser.add_argument('--output', help='JSON file to write the results to')
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--statistic', choices=('median', 'min', 'mean'), default='median')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='flag changes larger than this share (default 0.1)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        for name, operation, before, after, ratio in compare(old, new, args.statistic):
+            flag = ''
+            if ratio is not None and abs(ratio - 1) > args.threshold:
+                flag = 'slower' if ratio > 1 else 'faster'
+            print('{:<40} {:<18} {:>12.6g} {:>12.6g} {:>7} {}'.format(
+                name, operation, before, after, '{:.2f}x'.format(ratio) if ratio is not None else '-', flag))
+        return 0
+    if args.command == 'memory':
+        def report_memory(name, report):
+            print('{:<28} {:>9} keywords {:>10} nodes {:>8.1f} MiB  {:>7.1f} B/keyword  {:>6.1f} B/node{}'.format(
+                name, report['keywords'], report['nodes'], report['bytes'] / 2.0 ** 20, report['bytes_per_keyword'],
+                report['bytes_per_node'],
+                '  RSS +{:.1f} MiB'.format(report['rss_bytes'] / 2.0 ** 20) if report['rss_bytes'] is not None else ''))
+            sys.stdout.flush()
+
+        results = run_memory(args.shapes, args.sizes, args.seed, args.rss, report_memory)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        violations = check_budget(results, args.max_bytes_per_keyword, args.max_bytes_per_node)
+        for violation in violations:
+            print(violation)
+        return 1 if violations else 0
+    if args.command != 'run':
+        parser.print_help()
+        return 2
+
+    preset = PRESETS[args.preset]
+    scenarios = list(iter_scenarios(args.sizes or preset['sizes'], args.scripts,
+                                    args.densities or preset['densities'], args.cases))
+
+    def progress(name, operations):
+        print(name)
+        for operation, stats in operations.items():
+            throughput = stats.get('chars_per_sec')
+            print('    {:<18} median {:.4f}s  stdev {:.4f}s{}'.format(
+                operation, stats['median'], stats['stdev'],
+                '  {:.2f} M chars/s'.format(throughput / 1e6) if throughput else ''))
+        sys.stdout.flush()
+
+    results = run(scenarios, progress, operations=args.operations, num_words=args.words or preset['num_words'],
+                  repeat=args.repeat, seed=args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import re
+import string
+import unicodedata
+from functools import lru_cache
+
+# Scripts written without spaces between words. Their characters are never part
+# of a longer word, so keywords can match anywhere inside a run of them.
+_SCRIPTIO_CONTINUA_RANGES = (
+    (0x0E00, 0x0EFF),    # Thai, Lao
+    (0x1000, 0x109F),    # Myanmar
+    (0x1100, 0x11FF),    # Hangul Jamo
+    (0x1780, 0x17FF),    # Khmer
+    (0x2E80, 0x2FDF),    # CJK Radicals
+    (0x3005, 0x3007),    # Ideographic iteration mark, closing mark, number zero
+    (0x3040, 0x31FF),    # Hiragana, Katakana, Bopomofo, Hangul Compatibility Jamo, ...
+    (0x3400, 0x4DBF),    # CJK Ext A
+    (0x4E00, 0x9FFF),    # CJK Unified
+    (0xA960, 0xA97F),    # Hangul Jamo Extended-A
+    (0xAC00, 0xD7FF),    # Hangul Syllables, Jamo Extended-B
+    (0xF900, 0xFAFF),    # CJK Compatibility Ideographs
+    (0xFF66, 0xFFDC),    # Halfwidth Katakana and Hangul
+)
+
+DEFAULT_WORD_CHARS = string.digits + string.ascii_letters + '_'
+
+
+def is_unicode_word_char(char):
+    """
+    Unicode word classification of a non-ASCII character: letters, digits and
+    combining marks (e.g. the vowel signs of Devanagari) are part of a word,
+    except in scripts written without spaces (CJK, Kana, Hangul, Thai, ...).
+    Characters past the Supplementary Multilingual Plane (CJK Ext B and later,
+    private use) are never word characters.
+
+    Args:
+        char (str): a single character
+
+    Returns:
+        bool: True if the character continues a word
+    """
+    code = ord(char)
+    if code > 0x1FFFF:
+        return False
+    for low, high in _SCRIPTIO_CONTINUA_RANGES:
+        if low <= code <= high:
+            return False
+    category = unicodedata.category(char)
+    return category[0] in 'LNM' or category == 'Pc'
+
+
+@lru_cache(maxsize=1)
+def _unicode_word_class():
+    """Regex character class body covering the non-ASCII word characters of the BMP and SMP."""
+    ranges = []
+    start = None
+    for code in range(0x80, 0x20000):
+        if 0xD800 <= code <= 0xDFFF:
+            is_word = False
+        else:
+            is_word = is_unicode_word_char(chr(code))
+        if is_word and start is None:
+            start = code
+        elif not is_word and start is not None:
+            ranges.append((start, code - 1))
+            start = None
+    if start is not None:
+        ranges.append((start, 0x1FFFF))
+    return ''.join(
+        re.escape(chr(low)) if low == high else re.escape(chr(low)) + '-' + re.escape(chr(high))
+        for low, high in ranges
+    )
+
+
+class WordCharSet(set):
+    """A set of word characters that counts its in-place modifications.
+
+    `KeywordProcessor.non_word_boundaries` is one of these, so cached
+    classification tables notice `discard`, `add`, `update`, ... calls.
+    """
+
+    def __init__(self, *args):
+        set.__init__(self, *args)
+        self.version = 0
+
+    def _modified(self):
+        self.version += 1
+
+
+def _counting(method_name):
+    method = getattr(set, method_name)
+
+    def wrapper(self, *args):
+        result = method(self, *args)
+        self._modified()
+        return result
+    wrapper.__name__ = method_name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _method_name in ('add', 'discard', 'remove', 'pop', 'clear', 'update', 'difference_update',
+                     'intersection_update', 'symmetric_difference_update',
+                     '__ior__', '__iand__', '__isub__', '__ixor__'):
+    setattr(WordCharSet, _method_name, _counting(_method_name))
+
+
+class CharClassTable(object):
+    """Character classification used by the scanning loops.
+
+    `classes` is a plain dict mapping a character to True (part of a word) or
+    False (word boundary). `classify` fills it for every character of a text in
+    one pass, so the hot loops only do exact dict lookups. ASCII characters are
+    decided by the word character set alone; other characters are word characters
+    if they are in the set or, in Unicode mode, if `is_unicode_word_char` says so.
+
+    Attributes:
+        word_chars (WordCharSet): the explicit word characters
+        unicode (bool): whether non-ASCII characters are classified by Unicode category
+        version (int): `word_chars.version` when the table was built
+        classes (dict): char -> bool, filled lazily
+    """
+
+    def __init__(self, word_chars, unicode):
+        self.word_chars = word_chars
+        self.unicode = unicode
+        self.version = getattr(word_chars, 'version', None)
+        self.classes = {}
+        self._word_class = None
+
+    def is_current(self, word_chars, unicode):
+        """True if the table still describes `word_chars` in the given mode."""
+        return (word_chars is self.word_chars and unicode == self.unicode
+                and getattr(word_chars, 'version', None) == self.version)
+
+    def classify(self, text):
+        """Make sure every character of `text` is in `classes`, and return `classes`."""
+        classes = self.classes
+        missing = set(text).difference(classes)
+        if missing:
+            word_chars = self.word_chars
+            unicode = self.unicode
+            for char in missing:
+                classes[char] = char in word_chars or (
+                    unicode and char > '\x7f' and is_unicode_word_char(char))
+        return classes
+
+    @property
+    def word_class(self):
+        """Body of a regex character class matching exactly the word characters."""
+        if self._word_class is None:
+            word_class = ''.join(re.escape(char) for char in sorted(self.word_chars))
+            if self.unicode:
+                word_class += _unicode_word_class()
+            self._word_class = word_class
+        return self._word_class
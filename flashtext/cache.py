@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+# bumped whenever the layout of the compiled state changes, so old artifacts are never read
+CACHE_FORMAT = 3
+
+
+def artifact_path(cache_dir, keyword_file, digest, encoding, settings):
+    """
+    Path of the compiled artifact of a keyword file.
+
+    The name is the name of the source file, a hash of its absolute path and
+    a hash of everything the compiled trie depends on: the cache format, the
+    path and content hash of the source file, its encoding and the processor
+    settings. Any change gives another artifact, so a stale one is never read,
+    and the artifacts of one source file share a prefix, see
+    `remove_older_artifacts`.
+
+    Args:
+        cache_dir (str): directory holding the artifacts
+        keyword_file (str): path of the source keyword file
+        digest (str): hex SHA-256 of the content of the source file
+        encoding (str): encoding used to read the source file
+        settings (dict): JSON serializable processor settings
+
+    Returns:
+        str: path of the artifact, which may not exist yet
+    """
+    source = os.path.abspath(keyword_file)
+    key = json.dumps([CACHE_FORMAT, source, digest, encoding, settings], sort_keys=True)
+    name = '{}.{}.{}.pkl'.format(os.path.basename(keyword_file),
+                                 hashlib.sha256(source.encode('utf-8')).hexdigest()[:16],
+                                 hashlib.sha256(key.encode('utf-8')).hexdigest()[:32])
+    return os.path.join(cache_dir, name)
+
+
+def load_artifact(path):
+    """
+    Compiled state stored at `path`.
+
+    Returns:
+        dict: the state, or None if there is no artifact or it cannot be read
+            (truncated, written by another version)
+    """
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except Exception:
+        # missing, truncated or unreadable: the artifact is rebuilt, never trusted
+        return None
+    if not isinstance(state, dict) or state.get('format') != CACHE_FORMAT:
+        return None
+    return state
+
+
+def write_artifact(path, state):
+    """
+    Store a compiled state at `path` atomically.
+
+    The state is written to a temporary file in the same directory and
+    renamed over `path`, so readers see either no artifact or a complete one,
+    and workers writing the same artifact at once cannot corrupt it.
+
+    Args:
+        path (str): path of the artifact
+        state (dict): compiled state, pickled
+
+    Returns:
+        bool: True if the artifact was written, False if it could not be (directory not
+            writable, disk full, payloads that cannot be pickled)
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(dict(state, format=CACHE_FORMAT), f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        # disk full, or payloads that cannot be pickled: the keywords are loaded anyway
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def remove_older_artifacts(path):
+    """
+    Delete the other artifacts of the source file of the artifact at `path`.
+
+    Called once a new artifact is written: the previous ones were built from an
+    older content of the file or with other settings, and would otherwise stay
+    in the cache directory forever. Files that cannot be deleted are left.
+
+    Args:
+        path (str): path of the artifact just written
+
+    Returns:
+        int: number of artifacts deleted
+    """
+    directory, name = os.path.split(path)
+    # '<file name>.<path hash>.' is shared by the artifacts of one source file
+    prefix = name[:name.rindex('.', 0, name.rindex('.')) + 1]
+    removed = 0
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return removed
+    for other in names:
+        if other == name or not other.startswith(prefix) or not other.endswith('.pkl'):
+            continue
+        # the rest of the name must be a single hash, not another file named like the prefix
+        if '.' in other[len(prefix):-len('.pkl')]:
+            continue
+        try:
+            os.unlink(os.path.join(directory, other))
+        except OSError:
+            continue
+        removed += 1
+    return removed
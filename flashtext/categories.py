@@ -0,0 +1,107 @@
+class CategoryPayloads(list):
+    """Clean names of a keyword added with different clean names for different categories.
+
+    The list holds the clean names of every alternative, so scans without a
+    category filter emit them all, like a multi-label payload. `alternatives`
+    keeps the (payload, category mask) pairs for filtered scans, see `select`.
+
+    Attributes:
+        alternatives (tuple): (clean name or metadata, category mask) pairs, with
+            disjoint masks, in the order they were added
+        ids (tuple): payload id of every alternative in the payload table, for
+            filtered scans returning ids, see `select_ids`
+
+    Examples:
+        >>> keyword_processor.add_keyword('jordan', 'Jordan', categories='location')
+        >>> keyword_processor.add_keyword('jordan', 'Air Jordan', categories='brand')
+        >>> keyword_processor.get_keyword('jordan')
+        >>> # ['Jordan', 'Air Jordan']
+    """
+
+    def __init__(self, alternatives, ids):
+        list.__init__(self)
+        self.alternatives = tuple(alternatives)
+        self.ids = tuple(ids)
+        for payload, _ in self.alternatives:
+            if isinstance(payload, list):
+                self.extend(payload)
+            else:
+                self.append(payload)
+
+    def select(self, category_mask):
+        """
+        Payload of the alternatives enabled by `category_mask`.
+
+        Returns:
+            payload (object): the payload of the only enabled alternative, or a list
+                of the clean names of the enabled ones
+        """
+        enabled = [payload for payload, mask in self.alternatives if mask & category_mask]
+        if len(enabled) == 1:
+            return enabled[0]
+        names = []
+        for payload in enabled:
+            if isinstance(payload, list):
+                names.extend(payload)
+            else:
+                names.append(payload)
+        return names
+
+    def select_ids(self, category_mask):
+        """
+        Payload ids of the alternatives enabled by `category_mask`.
+
+        Returns:
+            list(int): one id per enabled alternative
+        """
+        return [payload_id for payload_id, (_, mask) in zip(self.ids, self.alternatives) if mask & category_mask]
+
+
+class CategoryView(object):
+    """Payload table as seen by a scan filtered on `category_mask`.
+
+    Ids of `CategoryPayloads` resolve to the alternatives of the enabled
+    categories, other ids to their payload.
+    """
+
+    def __init__(self, payloads, category_mask):
+        self.payloads = payloads
+        self.category_mask = category_mask
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def __getitem__(self, payload_id):
+        payload = self.payloads[payload_id]
+        if isinstance(payload, CategoryPayloads):
+            return payload.select(self.category_mask)
+        return payload
+
+
+def merge_categories(alternatives, clean_name, mask):
+    """
+    Alternatives of a keyword after it is added again with `clean_name` for the categories of `mask`.
+
+    The categories of `mask` are added to the alternative with the same clean name,
+    or to a new one, and removed from the others; alternatives left without a
+    category are dropped.
+
+    Args:
+        alternatives (iterable): (payload, category mask) pairs of the keyword
+        clean_name (object): clean name (or metadata) of the new addition
+        mask (int): category mask of the new addition, not 0
+
+    Returns:
+        list: the (payload, category mask) pairs
+    """
+    merged = []
+    found = False
+    for payload, payload_mask in alternatives:
+        if type(payload) is type(clean_name) and payload == clean_name:
+            merged.append((payload, payload_mask | mask))
+            found = True
+        elif payload_mask & ~mask:
+            merged.append((payload, payload_mask & ~mask))
+    if not found:
+        merged.append((clean_name, mask))
+    return merged
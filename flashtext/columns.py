@@ -0,0 +1,158 @@
+from array import array
+from itertools import repeat
+
+from .matches import MatchArray
+
+
+# rows of an Arrow array converted to Python strings at a time
+ARROW_SLICE_ROWS = 65536
+
+
+def iter_column_values(column, slice_rows=ARROW_SLICE_ROWS):
+    """
+    Values of a string column, one slice at a time for Arrow input.
+
+    Accepts a `pyarrow.Array`/`ChunkedArray`, a `pandas.Series` or any iterable
+    of strings. Arrow arrays (and every chunk of a chunked array) are converted
+    to Python strings `slice_rows` rows at a time through zero-copy slices, so an
+    Arrow column is never materialized whole.
+
+    Args:
+        column: the string column
+        slice_rows (int): number of Arrow rows converted at a time
+
+    Yields:
+        value (str or None): the value of every row, in order
+    """
+    chunks = getattr(column, 'chunks', None)
+    if chunks is not None:
+        # pyarrow.ChunkedArray
+        for chunk in chunks:
+            yield from _iter_arrow_values(chunk, slice_rows)
+    elif hasattr(column, 'to_pylist'):
+        # pyarrow.Array
+        yield from _iter_arrow_values(column, slice_rows)
+    else:
+        # pandas.Series (values, not labels) or a plain iterable
+        yield from column
+
+
+def _iter_arrow_values(array, slice_rows):
+    """Values of a `pyarrow.Array`, converted `slice_rows` at a time."""
+    for offset in range(0, len(array), slice_rows):
+        yield from array.slice(offset, slice_rows).to_pylist()
+
+
+class ColumnMatches(MatchArray):
+    """Matches of a whole string column, exploded to one row per match.
+
+    On top of the MatchArray columns (`ids` into `names`, `starts`, `ends`),
+    `rows` holds the position of the input row of every match. Ids are payload
+    ids and `names` is the payload table of the KeywordProcessor.
+
+    Attributes:
+        rows (array): position in the input column of every match
+
+    Examples:
+        >>> matches = keyword_processor.extract_keywords_column(df['text'])
+        >>> matches.to_pandas()
+        >>>    row  keyword_id  start  end
+        >>> 0    0           0      7   16
+    """
+
+    def __init__(self):
+        MatchArray.__init__(self)
+        self.rows = array('l')
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        return self.rows[index], self.names[self.ids[index]], self.starts[index], self.ends[index]
+
+    def __iter__(self):
+        names = self.names
+        for row, name_id, start, end in zip(self.rows, self.ids, self.starts, self.ends):
+            yield row, names[name_id], start, end
+
+    def __eq__(self, other):
+        if isinstance(other, ColumnMatches):
+            return self.rows == other.rows and MatchArray.__eq__(self, other)
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return 'ColumnMatches({!r})'.format(self.to_list())
+
+    def _columns(self):
+        return (('row', self.rows), ('keyword_id', self.ids), ('start', self.starts), ('end', self.ends))
+
+    def to_arrow(self):
+        """
+        Matches as a `pyarrow.Table` with int columns row, keyword_id, start and end.
+        The columns wrap the existing buffers, nothing is converted element by element.
+
+        Returns:
+            pyarrow.Table: the matches
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("ColumnMatches.to_arrow requires pyarrow")
+        arrow_type = pyarrow.int64() if self.rows.itemsize == 8 else pyarrow.int32()
+        return pyarrow.table({
+            name: pyarrow.Array.from_buffers(arrow_type, len(column), [None, pyarrow.py_buffer(column)])
+            for name, column in self._columns()
+        })
+
+    def to_pandas(self):
+        """
+        Matches as a `pandas.DataFrame` with int columns row, keyword_id, start and end.
+
+        Returns:
+            pandas.DataFrame: the matches
+
+        Raises:
+            ImportError: If pandas is not installed
+        """
+        try:
+            import numpy
+            import pandas
+        except ImportError:
+            raise ImportError("ColumnMatches.to_pandas requires pandas")
+        return pandas.DataFrame({
+            name: numpy.frombuffer(column, dtype=column.typecode) if len(column) else
+            numpy.zeros(0, dtype=column.typecode)
+            for name, column in self._columns()
+        })
+
+
+def extract_column(column, extract_func, payloads):
+    """
+    Extract the keywords of every row of a string column into one ColumnMatches.
+
+    Args:
+        column: a `pyarrow.Array`/`ChunkedArray`, a `pandas.Series` or any iterable of strings
+        extract_func (callable): `extract(text)` returning a MatchArray of payload ids
+        payloads (list): payload table the ids refer to
+
+    Returns:
+        ColumnMatches: the matches of all rows; null and non-string rows have none
+    """
+    matches = ColumnMatches()
+    matches.names = payloads
+    rows, ids, starts, ends = matches.rows, matches.ids, matches.starts, matches.ends
+    for row, value in enumerate(iter_column_values(column)):
+        if not isinstance(value, str) or not value:
+            continue
+        found = extract_func(value)
+        count = len(found)
+        if count:
+            rows.extend(repeat(row, count))
+            ids.extend(found.ids)
+            starts.extend(found.starts)
+            ends.extend(found.ends)
+    return matches
@@ -0,0 +1,85 @@
+import io
+import os
+
+DELTA_ADD = '+'
+DELTA_REMOVE = '-'
+DELTA_RENAME = '~'
+DELTA_OPERATIONS = (DELTA_ADD, DELTA_REMOVE, DELTA_RENAME)
+
+
+def parse_delta_line(line):
+    """
+    Parse one line of a dictionary changelog.
+
+    Args:
+        line (str): `+ keyword[=>clean_name]`, `- keyword` or `~ keyword=>clean_name`
+
+    Returns:
+        operation, keyword, clean_name (tuple): clean_name is None when not given,
+            or None for an empty or comment ('#') line
+
+    Raises:
+        ValueError: If the operation is unknown or a rename has no clean name
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    operation, entry = line[0], line[1:].strip()
+    if operation not in DELTA_OPERATIONS:
+        raise ValueError("Unknown delta operation {!r}".format(operation))
+    clean_name = None
+    if '=>' in entry:
+        entry, clean_name = entry.split('=>', 1)
+        entry, clean_name = entry.strip(), clean_name.strip()
+    if operation == DELTA_RENAME and not clean_name:
+        raise ValueError("Rename of {!r} has no clean name".format(entry))
+    return operation, entry, clean_name
+
+
+def read_delta(delta, encoding="utf-8"):
+    """
+    Operations of a dictionary changelog, from a file or an iterable.
+
+    Args:
+        delta (str or iterable): path of a changelog file, or an iterable of lines
+            or of `(operation, keyword, clean_name)` tuples
+        encoding (str): encoding of the file
+
+    Yields:
+        operation, keyword, clean_name (tuple): in changelog order
+
+    Examples:
+        >>> # delta.txt content
+        >>> # + java_2e=>java
+        >>> # - product management
+        >>> # ~ PM=>product manager
+        >>> list(read_delta('delta.txt'))
+        >>> [('+', 'java_2e', 'java'), ('-', 'product management', None), ('~', 'PM', 'product manager')]
+
+    Raises:
+        IOError: If `delta` is a path that is not valid
+        ValueError: If a line cannot be parsed
+    """
+    if isinstance(delta, str):
+        if not os.path.isfile(delta):
+            raise IOError("Invalid file path {}".format(delta))
+        with io.open(delta, encoding=encoding) as f:
+            yield from _read_items(f)
+    else:
+        yield from _read_items(delta)
+
+
+def _read_items(items):
+    for line_number, item in enumerate(items, 1):
+        try:
+            if isinstance(item, str):
+                parsed = parse_delta_line(item)
+                if parsed is None:
+                    continue
+            else:
+                parsed = (item[0], item[1], item[2] if len(item) > 2 else None)
+                if parsed[0] not in DELTA_OPERATIONS:
+                    raise ValueError("Unknown delta operation {!r}".format(parsed[0]))
+        except ValueError as error:
+            raise ValueError("Line {}: {}".format(line_number, error))
+        yield parsed
@@ -0,0 +1,470 @@
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from .keyword import KeywordProcessor
+from .boundaries import WordCharSet
+from .trie_dict import trie_statistics
+from .utils import LRUCache, deep_getsizeof
+
+# bumped whenever the layout of the store changes, stores of another format are refused
+STORE_FORMAT = 1
+
+
+class DiskNode(dict):
+    """Trie node faulted in from a `TrieStore`.
+
+    The dict holds the keys of the node in their original order: edge keys
+    mapped to the ids of the child nodes, and the keyword key mapped to a
+    payload id. Lookups and iteration return child nodes, faulted in through
+    the cache of the store, so scans and fuzzy searches walk it like a node
+    of an in-memory trie. Membership tests (`char in node`) are plain dict
+    lookups.
+    """
+
+    __slots__ = ('_store',)
+
+    def __init__(self, store, entries):
+        dict.__init__(self, entries)
+        self._store = store
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        store = self._store
+        if key == store.keyword_key:
+            return value
+        return store.node(value)
+
+    def get(self, key, default=None):
+        value = dict.get(self, key)
+        if value is None:
+            return default
+        store = self._store
+        if key == store.keyword_key:
+            return value
+        return store.node(value)
+
+    def items(self):
+        store = self._store
+        keyword_key = store.keyword_key
+        for key, value in dict.items(self):
+            yield key, value if key == keyword_key else store.node(value)
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+
+class DiskTable(object):
+    """Read-only view of one column of the payload table of a `TrieStore`:
+    0 for the payloads (clean names), 1 for their category masks.
+    """
+
+    def __init__(self, store, column):
+        self.store = store
+        self.column = column
+
+    def __len__(self):
+        return self.store.payload_count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        return self.store.payload(index)[self.column]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class TrieStore(object):
+    """SQLite file holding a keyword trie node by node, read on demand.
+
+    Every node is a row keyed by its id (0 is the root) and decoded into a
+    `DiskNode` when a scan reaches it. The most recently used nodes and
+    payloads are kept in LRU caches, so the memory used is bounded by the
+    cache sizes, whatever the size of the dictionary. The root stays in memory.
+
+    Attributes:
+        path (str): path of the store
+        keyword_key (str): key of the payload id in trie nodes
+        meta (dict): processor settings and counts saved by `write_trie_store`
+        root (DiskNode): root node
+        payload_count (int): number of payloads
+    """
+
+    def __init__(self, path, cache_size=100000, payload_cache_size=10000, mmap_size=0):
+        """
+        Args:
+            path (str): path of a store written by `write_trie_store`
+            cache_size (int): number of trie nodes kept in memory
+            payload_cache_size (int): number of payloads kept in memory
+            mmap_size (int): bytes of the file SQLite may read through a memory
+                mapping instead of read calls, 0 to disable it
+
+        Raises:
+            IOError: If `path` is not a file
+            ValueError: If the file is not a store of this format
+        """
+        if not os.path.isfile(path):
+            raise IOError("Invalid file path {}".format(path))
+        self.path = path
+        self._connection = sqlite3.connect(Path(path).absolute().as_uri() + '?mode=ro', uri=True,
+                                           check_same_thread=False)
+        # one connection is shared by the threads scanning with the processor
+        self._db_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        try:
+            if mmap_size:
+                self._connection.execute('PRAGMA mmap_size = {:d}'.format(mmap_size))
+            meta = dict(self._connection.execute('SELECT key, value FROM meta'))
+        except sqlite3.DatabaseError:
+            self._connection.close()
+            raise ValueError("{} is not a keyword trie store".format(path))
+        self.meta = {key: json.loads(value) for key, value in meta.items()}
+        if self.meta.get('format') != STORE_FORMAT:
+            self._connection.close()
+            raise ValueError("{} has store format {}, expected {}".format(
+                path, self.meta.get('format'), STORE_FORMAT))
+        self.keyword_key = self.meta['settings']['keyword_key']
+        self.payload_count = self.meta['payloads']
+        self._nodes = LRUCache(cache_size)
+        self._payloads = LRUCache(payload_cache_size)
+        self.root = self._load_node(0)
+
+    def _load_node(self, node_id):
+        with self._db_lock:
+            row = self._connection.execute('SELECT entries FROM nodes WHERE id = ?', (node_id,)).fetchone()
+        return DiskNode(self, json.loads(row[0]))
+
+    def node(self, node_id):
+        """Trie node `node_id`, from the cache or read from the file."""
+        with self._cache_lock:
+            node = self._nodes.get(node_id)
+        if node is None:
+            node = self._load_node(node_id)
+            with self._cache_lock:
+                self._nodes.put(node_id, node)
+        return node
+
+    def payload(self, payload_id):
+        """(payload, category mask) of `payload_id`, from the cache or read from the file.
+
+        Raises:
+            IndexError: If there is no such payload
+        """
+        with self._cache_lock:
+            row = self._payloads.get(payload_id)
+        if row is None:
+            with self._db_lock:
+                row = self._connection.execute('SELECT value, mask FROM payloads WHERE id = ?',
+                                               (payload_id,)).fetchone()
+            if row is None:
+                raise IndexError("payload id {} out of range".format(payload_id))
+            row = (pickle.loads(row[0]), row[1])
+            with self._cache_lock:
+                self._payloads.put(payload_id, row)
+        return row
+
+    def cached_nodes(self):
+        """Trie nodes in memory: the root and the cached nodes."""
+        with self._cache_lock:
+            return [self.root] + list(self._nodes._data.values())
+
+    def cached_payloads(self):
+        """(payload, category mask) rows in memory."""
+        with self._cache_lock:
+            return list(self._payloads._data.values())
+
+    def cache_stats(self, reset=False):
+        """Hits, misses, hit rates and sizes of the node and payload caches, see
+        `DiskKeywordProcessor.cache_stats`.
+        """
+        stats = {}
+        with self._cache_lock:
+            for name, cache in (('node', self._nodes), ('payload', self._payloads)):
+                lookups = cache.hits + cache.misses
+                stats[name + '_hits'] = cache.hits
+                stats[name + '_misses'] = cache.misses
+                stats[name + '_hit_rate'] = cache.hits / lookups if lookups else 0.0
+                stats[name + '_cache_size'] = len(cache)
+                stats[name + '_cache_maxsize'] = cache.maxsize
+                if reset:
+                    cache.hits = cache.misses = 0
+        return stats
+
+    def close(self):
+        """Close the SQLite connection; nodes not cached can no longer be read."""
+        with self._db_lock:
+            self._connection.close()
+
+
+def write_trie_store(path, keyword_processor, batch_size=10000):
+    """
+    Write the keywords of a processor to a SQLite store for `DiskKeywordProcessor`.
+
+    Nodes are numbered breadth first, so that the children of a node are
+    stored next to each other, and nodes shared by the lower and upper case
+    edges are written once. The payload table, the settings of the processor
+    and its trie statistics are saved with them. The store is written to a
+    temporary file renamed over `path`, so a reader never opens a partial store.
+
+    Payloads are pickled: only open stores written by trusted users.
+
+    Args:
+        path (str): path of the store, replaced if it exists
+        keyword_processor (KeywordProcessor): processor holding the keywords
+        batch_size (int): number of rows inserted at once
+
+    Returns:
+        dict: nodes and payloads written
+
+    Examples:
+        >>> keyword_processor = KeywordProcessor()
+        >>> keyword_processor.add_keyword_from_file('aliases.txt')
+        >>> write_trie_store('aliases.sqlite', keyword_processor)
+        >>> {'nodes': 182045, 'payloads': 20311}
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(temp_path)
+        try:
+            written = _write_store(connection, keyword_processor, batch_size)
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+def _write_store(connection, keyword_processor, batch_size):
+    # the file is only renamed into place once complete: no journal needed
+    connection.execute('PRAGMA journal_mode = OFF')
+    connection.execute('PRAGMA synchronous = OFF')
+    connection.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+    connection.execute('CREATE TABLE nodes (id INTEGER PRIMARY KEY, entries TEXT NOT NULL)')
+    connection.execute('CREATE TABLE payloads (id INTEGER PRIMARY KEY, value BLOB NOT NULL, mask INTEGER NOT NULL)')
+
+    trie_dict = keyword_processor.keyword_trie_dict
+    keyword_key = keyword_processor._keyword
+    node_ids = {id(trie_dict): 0}
+    level = [trie_dict]
+    rows = []
+    while level:
+        next_level = []
+        for node in level:
+            entries = {}
+            for key, child in node.items():
+                if key == keyword_key:
+                    entries[key] = child
+                    continue
+                child_id = node_ids.get(id(child))
+                if child_id is None:
+                    child_id = node_ids[id(child)] = len(node_ids)
+                    next_level.append(child)
+                entries[key] = child_id
+            rows.append((node_ids[id(node)], json.dumps(entries, ensure_ascii=False, separators=(',', ':'))))
+            if len(rows) >= batch_size:
+                connection.executemany('INSERT INTO nodes VALUES (?, ?)', rows)
+                rows = []
+        level = next_level
+    connection.executemany('INSERT INTO nodes VALUES (?, ?)', rows)
+
+    payloads = keyword_processor._payloads
+    masks = keyword_processor._payload_masks
+    rows = []
+    for payload_id in range(len(payloads)):
+        rows.append((payload_id, pickle.dumps(payloads[payload_id], protocol=pickle.HIGHEST_PROTOCOL),
+                     masks[payload_id]))
+        if len(rows) >= batch_size:
+            connection.executemany('INSERT INTO payloads VALUES (?, ?, ?)', rows)
+            rows = []
+    connection.executemany('INSERT INTO payloads VALUES (?, ?, ?)', rows)
+
+    settings = keyword_processor._cache_settings()
+    # the fuzzy index is not stored, fuzzy lookups search the trie
+    del settings['fuzzy_index']
+    meta = {
+        'format': STORE_FORMAT,
+        'settings': settings,
+        'category_bits': keyword_processor._category_bits,
+        'terms': len(keyword_processor),
+        'keyword_chars': ''.join(sorted(keyword_processor._keyword_chars)),
+        'multi_label': keyword_processor._multi_label,
+        'payloads': len(payloads),
+        'trie_stats': trie_statistics(trie_dict, keyword_key),
+    }
+    connection.executemany('INSERT INTO meta VALUES (?, ?)',
+                           [(key, json.dumps(value, ensure_ascii=False)) for key, value in meta.items()])
+    return {'nodes': len(node_ids), 'payloads': len(payloads)}
+
+
+class DiskKeywordProcessor(KeywordProcessor):
+    """Read-only KeywordProcessor whose trie is read from a SQLite store on demand.
+
+    For dictionaries too large to be held in memory as nested dicts. The store
+    is written once by `write_trie_store` from an ordinary processor; a
+    `DiskKeywordProcessor` then reads trie nodes and payloads as scans reach
+    them and keeps the most recently used ones in LRU caches, so its memory is
+    bounded by `cache_size` and `payload_cache_size`. Settings (case sensitivity,
+    boundaries, normalization, categories) are those of the processor the store
+    was written from, and every extraction returns what that processor would
+    return. `cache_stats()` reports the hit rates of the caches.
+
+    A cached step costs a Python call and a lock instead of a dict lookup, so scans
+    are several times slower than on an in-memory trie, and much slower on a cold
+    cache. Keywords cannot be added or removed. Fuzzy lookups (`max_cost`) search
+    the trie without length pruning: the pruning windows would need the whole trie
+    in memory. The processor can be pickled: it is reopened from its path.
+
+    Attributes:
+        store (TrieStore): the open store
+
+    Examples:
+        >>> from flashtext.disk import DiskKeywordProcessor, write_trie_store
+        >>> write_trie_store('aliases.sqlite', keyword_processor)
+        >>> disk_processor = DiskKeywordProcessor('aliases.sqlite', cache_size=200000)
+        >>> disk_processor.extract_keywords('I love Big Apple and Bay Area.')
+        >>> ['New York', 'California']
+        >>> disk_processor.cache_stats()['node_hit_rate']
+        >>> 0.93
+    """
+
+    def __init__(self, path, cache_size=100000, payload_cache_size=10000, mmap_size=0, fuzzy_cache_size=4096,
+                 fuzzy_budget=None, stats=False, latency=False):
+        """
+        Args:
+            path (str): path of a store written by `write_trie_store`
+            cache_size (int): number of trie nodes kept in memory.
+                Defaults to 100000
+            payload_cache_size (int): number of payloads (clean names) kept in memory.
+                Defaults to 10000
+            mmap_size (int): bytes of the store SQLite may read through a memory
+                mapping instead of read calls.
+                Defaults to 0 (disabled)
+            fuzzy_cache_size, fuzzy_budget, stats, latency: see `KeywordProcessor`
+
+        Raises:
+            IOError: If `path` is not a file
+            ValueError: If the file is not a store of this format
+        """
+        self._options = {'path': path, 'cache_size': cache_size, 'payload_cache_size': payload_cache_size,
+                         'mmap_size': mmap_size, 'fuzzy_cache_size': fuzzy_cache_size,
+                         'fuzzy_budget': fuzzy_budget, 'stats': stats, 'latency': latency}
+        store = TrieStore(path, cache_size, payload_cache_size, mmap_size)
+        meta = store.meta
+        settings = meta['settings']
+        char_variants = dict(settings['char_variants']) if settings['char_variants'] else None
+        KeywordProcessor.__init__(self, case_sensitive=settings['case_sensitive'],
+                                  fuzzy_cache_size=fuzzy_cache_size, fuzzy_budget=fuzzy_budget,
+                                  unicode_boundaries=settings['unicode_boundaries'],
+                                  normalization=settings['normalization'], char_variants=char_variants,
+                                  stats=stats, latency=latency)
+        self.store = store
+        self._keyword = store.keyword_key
+        self._white_space_chars = set(settings['white_space_chars'])
+        self._non_word_boundaries = WordCharSet(settings['non_word_boundaries'])
+        self.keyword_trie_dict = store.root
+        self._payloads = DiskTable(store, 0)
+        self._payload_masks = DiskTable(store, 1)
+        self._category_bits = meta['category_bits']
+        self._terms_in_trie = meta['terms']
+        self._keyword_chars = set(meta['keyword_chars'])
+        self._multi_label = meta['multi_label']
+        # never built: fuzzy lookups run without length pruning
+        self._node_meta = {}
+
+    def __getstate__(self):
+        return {'options': self._options, 'unicode_boundaries': self.unicode_boundaries,
+                'non_word_boundaries': self._non_word_boundaries, 'white_space_chars': self._white_space_chars}
+
+    def __setstate__(self, state):
+        self.__init__(**state['options'])
+        self.unicode_boundaries = state['unicode_boundaries']
+        self._non_word_boundaries = WordCharSet(state['non_word_boundaries'])
+        self._white_space_chars = set(state['white_space_chars'])
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("DiskKeywordProcessor is read-only, write a new store with write_trie_store()")
+
+    _add_keyword_to_trie = _read_only
+    _remove_keyword_from_trie = _read_only
+    apply_delta = _read_only
+
+    def cache_stats(self, reset=False):
+        """Counters of the node and payload caches, to tune their sizes.
+
+        Args:
+            reset (bool): Set the hit and miss counters back to zero after reading them.
+                Defaults to False
+
+        Returns:
+            stats : dict
+                node_hits, node_misses, node_hit_rate, node_cache_size and node_cache_maxsize
+                for trie nodes, and the same payload_* counters for payloads. Misses are
+                reads from the store.
+
+        Examples:
+            >>> disk_processor.extract_keywords('I love Big Apple and Bay Area.')
+            >>> disk_processor.cache_stats()
+            >>> {'node_hits': 14, 'node_misses': 9, 'node_hit_rate': 0.61, 'node_cache_size': 9, ...}
+        """
+        return self.store.cache_stats(reset)
+
+    def trie_stats(self):
+        """Shape of the keyword trie, see `KeywordProcessor.trie_stats`.
+
+        Computed by `write_trie_store`, so `node_bytes` and `key_bytes` are those of
+        the in-memory trie the store was written from.
+        """
+        stats = dict(self.store.meta['trie_stats'])
+        stats['fanout'] = {int(fanout): count for fanout, count in stats['fanout'].items()}
+        return stats
+
+    def memory_usage(self, deep=False):
+        """Estimate, in bytes, of the memory held by the processor: the nodes and
+        payloads in the caches, see `KeywordProcessor.memory_usage`.
+        """
+        seen = set()
+        nodes = self.store.cached_nodes()
+        if deep:
+            # the raw entries (edge keys and child ids): `deep_getsizeof` would fault the children in
+            usage = {'trie': sum(sys.getsizeof(node) + sum(deep_getsizeof(key, seen) + deep_getsizeof(value, seen)
+                                                             for key, value in dict.items(node))
+                                 for node in nodes)}
+        else:
+            usage = {'trie': sum(map(sys.getsizeof, nodes))}
+        rows = self.store.cached_payloads()
+        if deep:
+            usage['payloads'] = sum(deep_getsizeof(row, seen) for row in rows)
+        else:
+            usage['payloads'] = sum(map(sys.getsizeof, rows))
+        usage['fuzzy_index'] = 0
+        usage['fuzzy_meta'] = 0
+        fuzzy_cache = self._fuzzy_cache
+        cache = 0
+        if fuzzy_cache is not None:
+            cache = sys.getsizeof(fuzzy_cache._data)
+            if deep:
+                cache += sum(deep_getsizeof(key, seen) + sys.getsizeof(value)
+                             for key, value in fuzzy_cache._data.items())
+        usage['fuzzy_cache'] = cache
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def close(self):
+        """Close the store. Scans reaching nodes that are not cached fail afterwards."""
+        self.store.close()
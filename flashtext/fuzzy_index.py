@@ -0,0 +1,201 @@
+import sys
+
+from .utils import bounded_levenshtein
+
+# keywords are indexed under the deletion variants of their first characters only
+PREFIX_LENGTH = 12
+
+
+def deletion_variants(word, max_cost):
+    """
+    Build every string reachable from `word` by deleting up to `max_cost` characters.
+
+    Args:
+        word (str): word to derive variants from
+        max_cost (int): maximum number of deletions
+
+    Returns:
+        set(str): the variants, `word` itself included
+    """
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_cost):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        next_frontier -= variants
+        if not next_frontier:
+            break
+        variants |= next_frontier
+        frontier = next_frontier
+    return variants
+
+
+class DeletionIndex(object):
+    """Symmetric-delete (SymSpell style) index over the keywords of a processor.
+
+    Every keyword is stored under each deletion variant of its first
+    `prefix_length` characters, so a fuzzy lookup only has to generate the
+    deletion variants of the prefix of the query and probe the index with them.
+    Candidates are then verified with a bounded Levenshtein distance on the
+    whole strings. No match is lost by indexing prefixes: if two strings are
+    within `k` edits, their prefixes reduce to a common string with at most `k`
+    deletions each. The number of variants is bounded by the prefix length
+    instead of growing as `len(keyword) ** max_cost` for long keywords.
+
+    Case-insensitive keywords are indexed lowercased and matched against the
+    lowercased query; case-sensitive keywords are indexed as they are.
+
+    Attributes:
+        max_cost (int): largest edit distance the index can answer.
+    """
+
+    def __init__(self, max_cost, prefix_length=PREFIX_LENGTH):
+        """
+        Args:
+            max_cost (int): largest edit distance the index can answer.
+            prefix_length (int): number of leading characters of a keyword indexed.
+        """
+        self.max_cost = max_cost
+        self.prefix_length = prefix_length
+        # variant -> set((folded_keyword, case_sensitive))
+        self._deletes = {}
+        # (folded_keyword, case_sensitive) -> keyword as it was added
+        self._entries = {}
+        # keyword length -> number of entries with that length
+        self._lengths = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def min_length(self):
+        """Length of the shortest indexed keyword (0 if empty)."""
+        return min(self._lengths) if self._lengths else 0
+
+    def lengths(self):
+        """Set of the lengths of the indexed keywords."""
+        return set(self._lengths)
+
+    @property
+    def max_length(self):
+        """Length of the longest indexed keyword (0 if empty)."""
+        return max(self._lengths) if self._lengths else 0
+
+    def add(self, keyword, case_sensitive):
+        """Index a keyword.
+
+        Args:
+            keyword (str): keyword as it was added to the trie
+            case_sensitive (bool): whether the keyword was added case sensitive
+        """
+        entry = (keyword if case_sensitive else keyword.lower(), case_sensitive)
+        if entry in self._entries:
+            return
+        self._entries[entry] = keyword
+        length = len(entry[0])
+        self._lengths[length] = self._lengths.get(length, 0) + 1
+        for variant in deletion_variants(entry[0][:self.prefix_length], self.max_cost):
+            self._deletes.setdefault(variant, set()).add(entry)
+
+    def remove(self, keyword):
+        """Drop a keyword, in both its case-sensitive and case-insensitive forms.
+
+        Args:
+            keyword (str): keyword to remove
+
+        Returns:
+            bool: True if an entry was removed
+        """
+        removed = False
+        for entry in ((keyword, True), (keyword.lower(), False)):
+            if entry not in self._entries:
+                continue
+            del self._entries[entry]
+            length = len(entry[0])
+            self._lengths[length] -= 1
+            if not self._lengths[length]:
+                del self._lengths[length]
+            for variant in deletion_variants(entry[0][:self.prefix_length], self.max_cost):
+                bucket = self._deletes.get(variant)
+                if bucket is not None:
+                    bucket.discard(entry)
+                    if not bucket:
+                        del self._deletes[variant]
+            removed = True
+        return removed
+
+    def candidates(self, prefix, max_cost):
+        """Entries whose indexed prefix is within `max_cost` deletions of `prefix`
+        (after deleting up to `max_cost` characters of its own).
+
+        Args:
+            prefix (str): first `prefix_length` characters of a query (or of its
+                lower case form)
+            max_cost (int): maximum Levenshtein distance, at most `self.max_cost`
+
+        Returns:
+            set: entries to verify with `verify`
+        """
+        deletes = self._deletes
+        candidates = set()
+        for variant in deletion_variants(prefix, max_cost):
+            bucket = deletes.get(variant)
+            if bucket:
+                candidates |= bucket
+        return candidates
+
+    def lookup(self, text, max_cost, cache=None):
+        """Find indexed keywords within `max_cost` edits of `text`.
+
+        Args:
+            text (str): query string
+            max_cost (int): maximum Levenshtein distance, at most `self.max_cost`
+            cache (dict): optional prefix -> candidates memo, shared by lookups of
+                queries with the same first characters (windows of one sentence
+                position)
+
+        Returns:
+            list((str, int)): (keyword, cost) pairs, cheapest first, then by keyword
+        """
+        lowered = text.lower()
+        candidates = set()
+        for query in {text, lowered}:
+            prefix = query[:self.prefix_length]
+            if cache is None:
+                candidates |= self.candidates(prefix, max_cost)
+                continue
+            found = cache.get(prefix)
+            if found is None:
+                found = cache[prefix] = self.candidates(prefix, max_cost)
+            candidates |= found
+        found = []
+        entries = self._entries
+        for entry in candidates:
+            keyword = entries.get(entry)
+            if keyword is None:
+                # removed by a concurrent update
+                continue
+            folded, case_sensitive = entry
+            if abs(len(folded) - len(text)) > max_cost:
+                continue
+            cost = bounded_levenshtein(text if case_sensitive else lowered, folded, max_cost)
+            if cost <= max_cost:
+                found.append((keyword, cost))
+        # candidates come from sets: ties are ordered by keyword so results do not depend on hashing
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found
+
+    def memory_usage(self):
+        """Shallow estimate, in bytes, of the memory held by the index.
+
+        Returns:
+            int: bytes used by the index containers, their keys and buckets
+        """
+        total = sys.getsizeof(self._deletes) + sys.getsizeof(self._entries)
+        for variant, bucket in self._deletes.items():
+            total += sys.getsizeof(variant) + sys.getsizeof(bucket)
+        for entry in self._entries:
+            total += sys.getsizeof(entry)
+        return total
@@ -0,0 +1,152 @@
+def scan_exact(sentence, trie_dict, keyword_key, is_word_char, payloads=None, span_info=False,
+               multi_label=False):
+    """
+    Exact (`max_cost=0`) scan without category filter, same matches as the
+    generic loop of `KeywordProcessor._extract_keywords`.
+
+    The per-character loop has no fuzzy, category or output format branch:
+    those are only looked at when a match is emitted.
+
+    Args:
+        sentence (str): non-empty text to scan
+        trie_dict (dict): root of the keyword trie
+        keyword_key (str): key of the payload id in trie nodes
+        is_word_char (dict): char -> True if it continues a word, covering every char of `sentence`
+        payloads (list): payload table to resolve ids with, None to return the ids
+        span_info (bool): emit (value, start, end) tuples instead of values
+        multi_label (bool): payloads may be lists of clean names, emitted one by one
+
+    Returns:
+        list: matched values, or (value, start, end) tuples with `span_info`
+    """
+    found = []
+    append = found.append
+    current_dict = trie_dict
+    sequence_start_pos = 0
+    sentence_len = len(sentence)
+    idx = 0
+    while idx < sentence_len:
+        char = sentence[idx]
+        if not is_word_char[char]:
+            # a word ends here: longest keyword ending here or continuing past the boundary
+            longest = None
+            if keyword_key in current_dict:
+                longest = current_dict[keyword_key]
+                end = idx
+            continued = current_dict.get(char)
+            if continued is not None:
+                idy = idx + 1
+                while idy < sentence_len:
+                    inner_char = sentence[idy]
+                    if keyword_key in continued and (
+                            not is_word_char[inner_char] or not is_word_char[sentence[idy - 1]]):
+                        longest = continued[keyword_key]
+                        end = idy
+                    continued = continued.get(inner_char)
+                    if continued is None:
+                        break
+                    idy += 1
+                else:
+                    if keyword_key in continued:
+                        longest = continued[keyword_key]
+                        end = idy
+            current_dict = trie_dict
+            if longest is not None:
+                idx = end
+                if payloads is not None:
+                    longest = payloads[longest]
+                if multi_label and isinstance(longest, list):
+                    for value in longest:
+                        append((value, sequence_start_pos, idx) if span_info else value)
+                elif span_info:
+                    append((longest, sequence_start_pos, idx))
+                else:
+                    append(longest)
+                # the character after the match is scanned again, it may start an adjacent keyword
+                sequence_start_pos = idx
+                continue
+            idx += 1
+            sequence_start_pos = idx
+        elif char in current_dict:
+            current_dict = current_dict[char]
+            idx += 1
+        else:
+            # not a keyword prefix: skip the rest of the word
+            current_dict = trie_dict
+            idx += 1
+            while idx < sentence_len and is_word_char[sentence[idx]]:
+                idx += 1
+            sequence_start_pos = idx
+    if current_dict is not trie_dict and keyword_key in current_dict:
+        # the sentence ends inside a word that completes a keyword
+        value = current_dict[keyword_key]
+        if payloads is not None:
+            value = payloads[value]
+        if multi_label and isinstance(value, list):
+            for item in value:
+                append((item, sequence_start_pos, sentence_len) if span_info else item)
+        elif span_info:
+            append((value, sequence_start_pos, sentence_len))
+        else:
+            append(value)
+    return found
+
+
+def scan_boundary_free(sentence, trie_dict, keyword_key, payloads=None, span_info=False, multi_label=False):
+    """
+    Exact scan for dictionaries whose characters are all word boundaries
+    (CJK, Kana, Thai... keywords), same matches as `scan_exact`.
+
+    Every keyword character ends a word, so a match never needs a boundary
+    check and a keyword can only start at a trie root edge: the scan is a
+    longest-match walk from each position, without classifying the sentence.
+
+    Args:
+        sentence (str): non-empty text to scan
+        trie_dict (dict): root of the keyword trie, without word character edges
+        keyword_key (str): key of the payload id in trie nodes
+        payloads (list): payload table to resolve ids with, None to return the ids
+        span_info (bool): emit (value, start, end) tuples instead of values
+        multi_label (bool): payloads may be lists of clean names, emitted one by one
+
+    Returns:
+        list: matched values, or (value, start, end) tuples with `span_info`
+    """
+    found = []
+    append = found.append
+    get_root_child = trie_dict.get
+    sentence_len = len(sentence)
+    idx = 0
+    while idx < sentence_len:
+        node = get_root_child(sentence[idx])
+        if node is None:
+            idx += 1
+            continue
+        longest = None
+        idy = idx + 1
+        while idy < sentence_len:
+            if keyword_key in node:
+                longest = node[keyword_key]
+                end = idy
+            node = node.get(sentence[idy])
+            if node is None:
+                break
+            idy += 1
+        else:
+            if keyword_key in node:
+                longest = node[keyword_key]
+                end = idy
+        if longest is None:
+            idx += 1
+            continue
+        if payloads is not None:
+            longest = payloads[longest]
+        if multi_label and isinstance(longest, list):
+            for value in longest:
+                append((value, idx, end) if span_info else value)
+        elif span_info:
+            append((longest, idx, end))
+        else:
+            append(longest)
+        idx = end
+    return found
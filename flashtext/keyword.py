@@ -1,15 +1,48 @@
 import os
-import string
 import io
+import hashlib
 import json
 import re
-
-
-
-
-
-from .trie_dict import add_keyword_to_trie, remove_keyword_from_trie, get_all_keywords
-from .utils import levensthein, extract_sentences_util
+import sys
+import threading
+import time
+from array import array
+
+
+
+
+
+from .trie_dict import (
+    add_keyword_to_trie, remove_keyword_from_trie, get_all_keywords,
+    build_node_meta, update_node_meta, keyword_path, copy_trie_path, apply_trie_operations,
+    trie_statistics, leaf_values,
+)
+from .utils import (
+    levensthein, extract_sentences_util, iter_sentences_util, compile_token_pattern, compile_word_pattern,
+    scan_word_end, LRUCache, deep_getsizeof,
+)
+from .fuzzy_index import DeletionIndex
+from .boundaries import WordCharSet, CharClassTable, DEFAULT_WORD_CHARS
+from .matches import MatchArray
+from .columns import extract_column
+from .normalize import Normalizer, map_span, load_variant_table
+from .batch import KeywordBatch
+from .delta import read_delta, DELTA_ADD, DELTA_REMOVE
+from .latency import LatencyRecorder, DEFAULT_PERCENTILES
+from .kernels import scan_exact, scan_boundary_free
+from .cache import artifact_path, load_artifact, write_artifact, remove_older_artifacts
+from .categories import CategoryPayloads, CategoryView, merge_categories
+
+
+# timed methods with `latency=True`, and the position of their max_cost argument after the text
+TIMED_METHODS = (('extract_keywords', 1), ('replace_keywords', 0), ('extract_sentences', None))
+# counters of `KeywordProcessor.scan_stats`, in export order
+SCAN_COUNTERS = (
+    'sentences', 'chars_scanned', 'positions', 'trie_steps', 'lookahead_runs', 'lookahead_chars',
+    'lookahead_backtracks', 'skipped_chars', 'cjk_rechecks', 'fuzzy_calls', 'fuzzy_nodes_expanded', 'matches',
+)
+# payload ids in use beyond twice the keyword count that trigger a reclaim (see `_reclaim_payloads`)
+PAYLOAD_RECLAIM_SLACK = 1024
 
 
 class KeywordProcessor(object):
@@ -20,10 +53,21 @@ class KeywordProcessor(object):
             Defaults to '_keyword_'
         non_word_boundaries (set(str)): Characters that will determine if the word is continuing.
             Defaults to set([A-Za-z0-9_])
-        keyword_trie_dict (dict): Trie dict built character by character, that is used for lookup
+        unicode_boundaries (boolean): if non-ASCII letters, digits and marks also continue a word
+            (except in scripts written without spaces, such as CJK and Thai).
+            Defaults to True
+        keyword_trie_dict (dict): Trie dict built character by character, that is used for lookup.
+            Leaves hold an integer id into the payload table (see `get_payload`).
             Defaults to empty dictionary
         case_sensitive (boolean): if the search algorithm should be case sensitive or not.
             Defaults to False
+        fuzzy_index (DeletionIndex): optional symmetric-delete index used for fuzzy lookups.
+            Defaults to None
+        normalizer (Normalizer): optional normalization and character folding applied
+            to keywords and sentences.
+            Defaults to None
+        version (int): number of update batches published (see `batch_update`).
+            Defaults to 0
 
     Examples:
         >>> # import module
@@ -44,23 +88,122 @@ class KeywordProcessor(object):
         * Idea came from this `Stack Overflow Question <https://stackoverflow.com/questions/44178449/regex-replace-is-taking-time-for-millions-of-documents-how-to-make-it-faster>`_.
     """
 
-    def __init__(self, case_sensitive=False):
+    def __init__(self, case_sensitive=False, fuzzy_index=0, fuzzy_cache_size=4096, fuzzy_budget=None,
+                 unicode_boundaries=True, normalization=None, char_variants=None, stats=False, latency=False):
         """
         Args:
             case_sensitive (boolean): Keyword search should be case sensitive set or not.
                 Defaults to False
+            fuzzy_index (int): Maximum edit distance covered by a symmetric-delete index
+                kept alongside the trie. Scans called with `indexed=True` answer `max_cost`
+                lookups up to this distance with hash probes instead of a trie-wide search.
+                The index matches whole token windows of the sentence against whole
+                keywords (see `_extract_keywords_indexed`), so its results can differ from
+                the trie search, which other scans keep using.
+                Defaults to 0 (disabled)
+            fuzzy_cache_size (int): Number of fuzzy resolutions (trie node, word, cost)
+                remembered between lookups. The cache is cleared whenever the trie changes.
+                One cache, guarded by a lock, is shared by all threads and trie versions:
+                an entry keeps its start node, so it never answers for a node of another
+                version.
+                Defaults to 4096, 0 disables it
+            fuzzy_budget (int): Maximum number of trie nodes a single fuzzy lookup may
+                evaluate. Lookups hitting the budget give up (no match) and are counted
+                in `fuzzy_stats()['budget_exhausted']`.
+                Defaults to None (unbounded)
+            unicode_boundaries (boolean): Treat non-ASCII letters, digits and combining marks
+                as part of a word (café, नमस्ते), on top of `non_word_boundaries`. CJK, Kana,
+                Hangul and Thai characters stay word boundaries so keywords still match inside
+                unspaced text. Replacing `non_word_boundaries` turns this off.
+                Defaults to True
+            normalization (str): Unicode normalization form ('NFKC', 'NFC', ...) applied to
+                keywords when they are added and to sentences before they are scanned, so that
+                full-width ＡＢＣ１２３, half-width ｶﾀｶﾅ and compatibility characters match the
+                keyword stored once in canonical form. Returned spans always refer to the
+                original sentence.
+                Defaults to None (disabled)
+            char_variants (dict or str): Character equivalences folded at scan time, as a
+                dict (variant char -> canonical char) or the path of a variant table file
+                (see `flashtext.normalize.load_variant_table`). With a Traditional/Simplified
+                table, one keyword matches 雅詩蘭黛, 雅诗兰黛 and any mix of the two.
+                Defaults to None (disabled)
+            stats (boolean): Count the work done by scans (characters, trie steps, look-ahead,
+                fuzzy calls, matches), see `scan_stats`. Scans then run an instrumented copy
+                of the scan loop; when disabled the regular loop has no counting at all.
+                Defaults to False
+            latency (boolean): Record the latency of every `extract_keywords`, `replace_keywords`
+                and `extract_sentences` call in histograms per mode and input length, see
+                `latency_report`. When disabled the methods are not wrapped at all.
+                Defaults to False
         """
         self._keyword = '_keyword_'
         self._white_space_chars = set(['.', '\t', '\n', '\a', ' ', ','])
-        try:
-            # python 2.x
-            self.non_word_boundaries = set(string.digits + string.letters + '_')
-        except AttributeError:
-            # python 3.x
-            self.non_word_boundaries = set(string.digits + string.ascii_letters + '_')
+        self._non_word_boundaries = WordCharSet(DEFAULT_WORD_CHARS)
+        self.unicode_boundaries = unicode_boundaries
+        self._char_classes = None
         self.keyword_trie_dict = dict()
+        # ids of the trie nodes that may be changed in place, None when all of them may
+        self._owned = None
+        self.version = 0
+        self._update_lock = threading.Lock()
+        # trie leaves hold ids into this table of distinct clean names/payloads
+        self._payloads = []
+        self._payload_ids = {}
+        # category bit mask of every payload id, and category name -> bit
+        self._payload_masks = []
+        self._category_bits = {}
+        # ids no leaf refers to any more: free for reuse, or retired until the next reclaim
+        self._free_payload_ids = []
+        self._retired_payload_ids = []
+        # ids below this one belong to a shared base table and are never reclaimed
+        self._payload_floor = 0
+        # collected while keywords are added, to pick a scan kernel (see `_select_kernel`):
+        # every character (and case variant) of a keyword ever added, and whether any
+        # payload is a list of clean names
+        self._keyword_chars = set()
+        self._multi_label = False
+        # (char classes, kernel) kept up to date by `_add_keyword_chars`, None until the first scan
+        self._kernel_choice = None
+        # False runs the generic scan loop for every call (tests, benchmarks)
+        self._use_kernels = True
         self.case_sensitive = case_sensitive
         self._terms_in_trie = 0
+        self.fuzzy_index = DeletionIndex(fuzzy_index) if fuzzy_index else None
+        self._fuzzy_cache = LRUCache(fuzzy_cache_size) if fuzzy_cache_size else None
+        # id(node) -> (min_stop, max_stop), built on the first fuzzy lookup
+        self._node_meta = None
+        self._fuzzy_counters = {'nodes_expanded': 0, 'nodes_pruned': 0, 'budget_exhausted': 0}
+        self.fuzzy_budget = fuzzy_budget
+        self._scan_counters = dict.fromkeys(SCAN_COUNTERS, 0) if stats else None
+        self.latency_recorder = LatencyRecorder() if latency else None
+        self._wrap_timed_methods()
+        if isinstance(char_variants, str):
+            char_variants = load_variant_table(char_variants)
+        if normalization or char_variants:
+            self.normalizer = Normalizer(normalization, fold=char_variants)
+        else:
+            self.normalizer = None
+
+    def _wrap_timed_methods(self):
+        """With a latency recorder, shadow the timed methods by timing wrappers (instance attributes)."""
+        if self.latency_recorder is None:
+            return
+        for name, max_cost_arg in TIMED_METHODS:
+            method = getattr(type(self), name).__get__(self)
+            setattr(self, name, self.latency_recorder.timed(name, method, max_cost_arg))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # locks and timing wrappers are rebuilt by __setstate__
+        del state['_update_lock']
+        for name, _ in TIMED_METHODS:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._update_lock = threading.Lock()
+        self._wrap_timed_methods()
 
     def __len__(self):
         """Number of terms present in the keyword_trie_dict
@@ -89,17 +232,9 @@ class KeywordProcessor(object):
             >>> # True
 
         """
-        # if not self.case_sensitive:
-        #     word = word.lower()
-        current_dict = self.keyword_trie_dict
-        len_covered = 0
-        for char in word:
-            if char in current_dict:
-                current_dict = current_dict[char]
-                len_covered += 1
-            else:
-                break
-        return self._keyword in current_dict and len_covered == len(word)
+        if self.normalizer is not None:
+            word = self.normalizer.normalize_keyword(word)
+        return self._find_leaf(word) is not None
 
     def __getitem__(self, word):
         """if word is present in keyword_trie_dict return the clean name for it.
@@ -117,18 +252,217 @@ class KeywordProcessor(object):
             >>> keyword_processor['Big Apple']
             >>> # New York
         """
-        # if not self.case_sensitive:
-        #     word = word.lower()
-        current_dict = self.keyword_trie_dict
-        len_covered = 0
+        if self.normalizer is not None:
+            word = self.normalizer.normalize_keyword(word)
+        payload_id = self._find_leaf(word)
+        if payload_id is not None:
+            return self._payloads[payload_id]
+
+    def _find_leaf(self, word, trie_dict=None):
+        """Payload id stored for `word` (already normalized), or None."""
+        current_dict = self.keyword_trie_dict if trie_dict is None else trie_dict
         for char in word:
-            if char in current_dict:
-                current_dict = current_dict[char]
-                len_covered += 1
+            current_dict = current_dict.get(char)
+            if current_dict is None:
+                return None
+        return current_dict.get(self._keyword)
+
+    def _intern_payload(self, payload, mask=0):
+        """
+        Id of `payload` with category `mask` in the payload table, adding it if needed.
+        Equal hashable payloads (and lists of the same clean names) with the same
+        categories share one id.
+        """
+        if isinstance(payload, list) and not isinstance(payload, CategoryPayloads):
+            payload = list(payload)
+        key = self._payload_key(payload, mask)
+        payload_id = self._payload_ids.get(key) if key is not None else None
+        if payload_id is None:
+            if isinstance(payload, list):
+                self._multi_label = True
+            if self._free_payload_ids:
+                payload_id = self._free_payload_ids.pop()
+                self._payloads[payload_id] = payload
+                self._payload_masks[payload_id] = mask
             else:
-                break
-        if self._keyword in current_dict and len_covered == len(word):
-            return current_dict[self._keyword]
+                payload_id = len(self._payloads)
+                self._payloads.append(payload)
+                self._payload_masks.append(mask)
+            if key is not None:
+                self._payload_ids[key] = payload_id
+        return payload_id
+
+    @staticmethod
+    def _payload_key(payload, mask):
+        """Key of a payload in `_payload_ids`, None for unhashable metadata (stored without sharing)."""
+        if isinstance(payload, CategoryPayloads):
+            key = (CategoryPayloads, tuple((type(item), tuple(item) if isinstance(item, list) else item, item_mask)
+                                           for item, item_mask in payload.alternatives), mask)
+        elif isinstance(payload, list):
+            key = (list, tuple(payload), mask)
+        else:
+            key = (type(payload), payload, mask)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _maybe_reclaim_payloads(self, trie_dict):
+        """Reclaim payload ids once those in use outnumber twice the keywords, see `_reclaim_payloads`."""
+        in_use = len(self._payloads) - len(self._free_payload_ids) - len(self._retired_payload_ids)
+        if in_use > 2 * self._terms_in_trie + PAYLOAD_RECLAIM_SLACK:
+            self._reclaim_payloads(trie_dict)
+
+    def _reclaim_payloads(self, trie_dict=None):
+        """
+        Retire the payload ids no leaf of `trie_dict` refers to (left by removed,
+        renamed or overwritten keywords), and free those retired by the previous call.
+
+        A retired id keeps its payload and can no longer be shared by new keywords;
+        it is cleared and reused only after the next reclaim, so a scan still running
+        on a trie replaced by a batch update reads the payloads it found. A reclaim
+        walks the trie once and runs after at least `PAYLOAD_RECLAIM_SLACK` new ids,
+        so its cost is spread over the changes that made it necessary.
+        """
+        if trie_dict is None:
+            trie_dict = self.keyword_trie_dict
+        payloads = self._payloads
+        masks = self._payload_masks
+        for payload_id in self._retired_payload_ids:
+            payloads[payload_id] = None
+            masks[payload_id] = 0
+        self._free_payload_ids.extend(self._retired_payload_ids)
+        unavailable = leaf_values(trie_dict, self._keyword)
+        for payload_id in list(unavailable):
+            payload = payloads[payload_id]
+            if isinstance(payload, CategoryPayloads):
+                # the ids of its alternatives are in use too
+                unavailable.update(payload.ids)
+        unavailable.update(self._free_payload_ids)
+        retired = self._retired_payload_ids = []
+        payload_ids = self._payload_ids
+        for payload_id in range(self._payload_floor, len(payloads)):
+            if payload_id in unavailable:
+                continue
+            retired.append(payload_id)
+            key = self._payload_key(payloads[payload_id], masks[payload_id])
+            if key is not None and payload_ids.get(key) == payload_id:
+                del payload_ids[key]
+
+    def _add_keyword_chars(self, keyword, case_sensitive):
+        """
+        Record the characters of a keyword (and their case variants) for `_select_kernel`,
+        and switch the kernel choice to `scan_exact` when one of the new ones is a word
+        character. Characters are never removed, so only new ones are classified.
+        """
+        keyword_chars = self._keyword_chars
+        new_chars = set(keyword)
+        if not case_sensitive:
+            new_chars.update(map(str.lower, keyword))
+            new_chars.update(map(str.upper, keyword))
+        new_chars.difference_update(keyword_chars)
+        if not new_chars:
+            return
+        keyword_chars.update(new_chars)
+        # read after the set is updated, see `_select_kernel`
+        choice = self._kernel_choice
+        if choice is not None and choice[1] is not scan_exact:
+            # case variants can be several characters long ('İ'.lower())
+            new_chars = ''.join(new_chars)
+            is_word_char = choice[0].classify(new_chars)
+            if any(is_word_char[char] for char in new_chars):
+                self._kernel_choice = (choice[0], scan_exact)
+
+    def get_payload(self, payload_id):
+        """Clean name (or metadata) of a payload id returned with `return_ids=True`.
+
+        Args:
+            payload_id : int
+                id found in the results of `extract_keywords(..., return_ids=True)`
+
+        Returns:
+            payload : object
+                The clean name, list of clean names or metadata given to `add_keyword`.
+                Ids of removed or renamed keywords are eventually reused for other payloads.
+
+        Examples:
+            >>> keyword_processor.add_keyword('Big Apple', 'New York')
+            >>> payload_id = keyword_processor.extract_keywords('I love Big Apple', return_ids=True)[0]
+            >>> keyword_processor.get_payload(payload_id)
+            >>> # New York
+        """
+        return self._payloads[payload_id]
+
+    def _category_mask(self, categories, create=False):
+        """Bit mask of a category name or collection of names; unknown names get a bit if `create`."""
+        if isinstance(categories, str):
+            categories = (categories,)
+        category_bits = self._category_bits
+        mask = 0
+        for category in categories:
+            bit = category_bits.get(category)
+            if bit is None:
+                if not create:
+                    continue
+                bit = category_bits[category] = 1 << len(category_bits)
+            mask |= bit
+        return mask
+
+    def _merge_payload_categories(self, payload_id, clean_name, mask):
+        """
+        Payload and category mask of a tagged keyword added again with `clean_name`
+        for the categories of `mask` (see `merge_categories`): the categories are
+        merged when the clean name is the same, and kept apart in a
+        `CategoryPayloads` when it differs.
+        """
+        previous = self._payloads[payload_id]
+        if isinstance(previous, CategoryPayloads):
+            alternatives = previous.alternatives
+        else:
+            alternatives = ((previous, self._payload_masks[payload_id]),)
+        if isinstance(clean_name, list):
+            clean_name = list(clean_name)
+        merged = merge_categories(alternatives, clean_name, mask)
+        mask = 0
+        for _, alternative_mask in merged:
+            mask |= alternative_mask
+        if len(merged) == 1:
+            return merged[0][0], mask
+        # every alternative gets its own id, returned by filtered scans with `return_ids`
+        ids = [self._intern_payload(payload, alternative_mask) for payload, alternative_mask in merged]
+        return CategoryPayloads(merged, ids), mask
+
+    def _payload_view(self, category_mask):
+        """Payload table of a scan: with a category filter, keywords with several alternatives resolve
+        to those of the enabled categories (see `CategoryView`)."""
+        if category_mask is None:
+            return self._payloads
+        return CategoryView(self._payloads, category_mask)
+
+    def get_categories(self, word):
+        """Categories the keyword `word` was added with.
+
+        Args:
+            word : string
+                word that you want to check
+
+        Returns:
+            categories : set
+                Category names, empty if the keyword has none or is not present
+
+        Examples:
+            >>> keyword_processor.add_keyword('Apple', categories=['brand'])
+            >>> keyword_processor.get_categories('Apple')
+            >>> # {'brand'}
+        """
+        if self.normalizer is not None:
+            word = self.normalizer.normalize_keyword(word)
+        payload_id = self._find_leaf(word)
+        if payload_id is None:
+            return set()
+        mask = self._payload_masks[payload_id]
+        return {category for category, bit in self._category_bits.items() if mask & bit}
 
     def __setitem__(self, keyword, clean_name=None):
         """To add keyword to the dictionary
@@ -147,18 +481,59 @@ class KeywordProcessor(object):
         """
         return self._add_keyword_to_trie(keyword, clean_name=clean_name)
 
-    def _add_keyword_to_trie(self, keyword, clean_name=None, case_sensitive=None):
+    def _add_keyword_to_trie(self, keyword, clean_name=None, case_sensitive=None, categories=None,
+                             trie_dict=None, owned=None):
         """
         Internal method to add keyword to trie.
         If case_sensitive is None, uses self.case_sensitive.
         If case_sensitive is False, adds edges for both lower and upper case chars.
+        With `owned` (ids of private nodes), shared nodes on the path are copied
+        instead of being changed in place.
         """
+        if trie_dict is None:
+            # single changes are serialized with batches: a change applied to the root a
+            # batch is replacing would be lost when the batch publishes its own
+            with self._update_lock:
+                return self._add_keyword_to_trie(keyword, clean_name, case_sensitive, categories,
+                                                 self.keyword_trie_dict, owned)
         if case_sensitive is None:
             case_sensitive = self.case_sensitive
-            
-        status = add_keyword_to_trie(self.keyword_trie_dict, keyword, clean_name, case_sensitive, self._keyword)
+        if not keyword:
+            return False
+        if not clean_name:
+            clean_name = keyword
+        if self.normalizer is not None:
+            # the keyword is stored normalized, but stays the default clean name
+            keyword = self.normalizer.normalize_keyword(keyword)
+
+        if owned is None:
+            owned = self._owned
+
+        mask = self._category_mask(categories, create=True) if categories else 0
+        payload = clean_name
+        if mask:
+            previous_id = self._find_leaf(keyword, trie_dict)
+            if previous_id is not None and self._payload_masks[previous_id]:
+                payload, mask = self._merge_payload_categories(previous_id, clean_name, mask)
+        payload_id = self._intern_payload(payload, mask)
+        self._add_keyword_chars(keyword, case_sensitive)
+        if owned is not None:
+            copy_trie_path(trie_dict, keyword, owned, case_sensitive, self._node_meta)
+        status = add_keyword_to_trie(trie_dict, keyword, payload_id, case_sensitive, self._keyword)
+        if owned is not None:
+            # nodes created by the insertion are private too
+            owned.update(id(node) for node in keyword_path(trie_dict, keyword))
+        if self._fuzzy_cache is not None:
+            self._fuzzy_cache.clear()
+        if self._node_meta is not None:
+            update_node_meta(self._node_meta, trie_dict, keyword, self._white_space_chars, self._keyword)
         if status:
             self._terms_in_trie += 1
+        else:
+            # the keyword was present, its previous payload id may be unused now
+            self._maybe_reclaim_payloads(trie_dict)
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.add(keyword, case_sensitive)
         return status
 
     def __delitem__(self, keyword):
@@ -173,18 +548,155 @@ class KeywordProcessor(object):
             >>> keyword_processor.add_keyword('Big Apple')
             >>> del keyword_processor['Big Apple']
         """
-        status = remove_keyword_from_trie(self.keyword_trie_dict, keyword, self._keyword)
+        return self._remove_keyword_from_trie(keyword)
+
+    def _remove_keyword_from_trie(self, keyword, trie_dict=None, owned=None):
+        """
+        Internal method to remove keyword from trie, see `_add_keyword_to_trie` for `owned`.
+        """
+        if trie_dict is None:
+            # serialized with batches, see `_add_keyword_to_trie`
+            with self._update_lock:
+                return self._remove_keyword_from_trie(keyword, self.keyword_trie_dict, owned)
+        if self.normalizer is not None and keyword:
+            keyword = self.normalizer.normalize_keyword(keyword)
+        if owned is None:
+            owned = self._owned
+        if owned is not None and keyword:
+            copy_trie_path(trie_dict, keyword, owned, True, self._node_meta)
+        old_path = keyword_path(trie_dict, keyword) if self._node_meta is not None and keyword else None
+        status = remove_keyword_from_trie(trie_dict, keyword, self._keyword)
         if status:
             self._terms_in_trie -= 1
+            if self._fuzzy_cache is not None:
+                self._fuzzy_cache.clear()
+            if old_path is not None:
+                update_node_meta(self._node_meta, trie_dict, keyword, self._white_space_chars,
+                                 self._keyword, old_path=old_path)
+            if self.fuzzy_index is not None:
+                self.fuzzy_index.remove(keyword)
+            self._maybe_reclaim_payloads(trie_dict)
         return status
 
+    def apply_delta(self, delta, encoding="utf-8"):
+        """Apply a dictionary changelog: additions, removals and clean name renames.
+
+        Operations are sorted by keyword and applied in a single traversal of the
+        trie, each keyword walking only past the prefix it shares with the previous
+        one. Nodes left without keywords are removed. Several operations on one
+        keyword are applied in changelog order.
+
+        Like a batch (see `batch_update`), the changes are applied to copies of the
+        nodes on their paths under a new root, published at once with a new
+        `version`: concurrent scans see the whole delta or none of it.
+
+        Args:
+            delta (str or iterable): path of a changelog file, or an iterable of lines
+                or of `(operation, keyword, clean_name)` tuples. Lines are
+                `+ keyword=>clean_name` (or `+ keyword`) to add, `- keyword` to remove
+                and `~ keyword=>clean_name` to give a present keyword a new clean name.
+                Empty lines and lines starting with '#' are skipped.
+            encoding (str): encoding of the file
+
+        Returns:
+            report : dict
+                added (new keywords), updated (keywords added again), removed, renamed,
+                missing (removals and renames of absent keywords) and seconds
+
+        Examples:
+            >>> # delta.txt content
+            >>> # + java_2e=>java
+            >>> # - python
+            >>> # ~ PM=>product manager
+            >>> keyword_processor.apply_delta('delta.txt')
+            >>> {'added': 1, 'updated': 0, 'removed': 1, 'renamed': 1, 'missing': 0, 'seconds': 0.0001}
+
+        Raises:
+            IOError: If `delta` is a path that is not valid
+            ValueError: If a line cannot be parsed
+        """
+        start_time = time.perf_counter()
+        normalizer = self.normalizer
+        changes = [(operation, keyword, clean_name) for operation, keyword, clean_name in read_delta(delta, encoding)
+                   if keyword]
+        with self._update_lock:
+            masks = self._payload_masks
+            operations = []
+            for operation, keyword, clean_name in changes:
+                trie_keyword = normalizer.normalize_keyword(keyword) if normalizer is not None else keyword
+                if operation == DELTA_ADD:
+                    value = self._intern_payload(clean_name or keyword)
+                    self._add_keyword_chars(trie_keyword, self.case_sensitive)
+                elif operation == DELTA_REMOVE:
+                    value = None
+                else:
+                    def value(payload_id, clean_name=clean_name):
+                        return self._intern_payload(clean_name, masks[payload_id])
+                operations.append((trie_keyword, value, self.case_sensitive))
+            # a stable sort on the folded keyword keeps the changelog order of operations on one entry
+            if self.case_sensitive:
+                operations.sort(key=lambda operation: operation[0])
+            else:
+                operations.sort(key=lambda operation: operation[0].lower())
+            # applied to a copy-on-write root published at the end, like a batch (see `batch_update`)
+            trie_dict = dict(self.keyword_trie_dict)
+            owned = {id(trie_dict)}
+            statuses = apply_trie_operations(trie_dict, operations, self._keyword, owned, self._node_meta)
+
+            report = {'added': 0, 'updated': 0, 'removed': 0, 'renamed': 0, 'missing': 0}
+            fuzzy_index = self.fuzzy_index
+            for (keyword, value, case_sensitive), status in zip(operations, statuses):
+                if value is None:
+                    report['removed' if status else 'missing'] += 1
+                    if status and fuzzy_index is not None:
+                        fuzzy_index.remove(keyword)
+                elif callable(value):
+                    report['renamed' if status else 'missing'] += 1
+                else:
+                    report['added' if status else 'updated'] += 1
+                    if fuzzy_index is not None:
+                        fuzzy_index.add(keyword, case_sensitive)
+            if self._node_meta is not None:
+                for keyword in {operation[0] for operation in operations}:
+                    update_node_meta(self._node_meta, trie_dict, keyword, self._white_space_chars, self._keyword)
+            # readers pick the new version up on their next scan
+            self.keyword_trie_dict = trie_dict
+            if self._owned is not None:
+                self._owned.update(owned)
+            self._terms_in_trie += report['added'] - report['removed']
+            self.version += 1
+            if self._fuzzy_cache is not None:
+                self._fuzzy_cache.clear()
+            self._maybe_reclaim_payloads(trie_dict)
+        report['seconds'] = time.perf_counter() - start_time
+        return report
+
     def __iter__(self):
         """Disabled iteration as get_all_keywords() is the right way to iterate
         """
         raise NotImplementedError("Please use get_all_keywords() instead")
 
+    @property
+    def non_word_boundaries(self):
+        """Set of characters that will be considered as part of word."""
+        return self._non_word_boundaries
+
+    @non_word_boundaries.setter
+    def non_word_boundaries(self, non_word_boundaries):
+        # an explicit set is the whole definition of a word
+        self._non_word_boundaries = WordCharSet(non_word_boundaries)
+        self.unicode_boundaries = False
+
+    def _get_char_classes(self):
+        """Character classification table for the current boundaries, rebuilt when they change."""
+        char_classes = self._char_classes
+        if char_classes is None or not char_classes.is_current(self._non_word_boundaries, self.unicode_boundaries):
+            char_classes = self._char_classes = CharClassTable(self._non_word_boundaries, self.unicode_boundaries)
+        return char_classes
+
     def set_non_word_boundaries(self, non_word_boundaries):
         """set of characters that will be considered as part of word.
+        This replaces the default word characters, including the Unicode ones.
 
         Args:
             non_word_boundaries (set(str)):
@@ -203,7 +715,7 @@ class KeywordProcessor(object):
         """
         self.non_word_boundaries.add(character)
 
-    def add_keyword(self, keyword, clean_name=None, case_sensitive=None):
+    def add_keyword(self, keyword, clean_name=None, case_sensitive=None, categories=None):
         """To add one or more keywords to the dictionary
         pass the keyword and the clean name it maps to.
 
@@ -214,12 +726,22 @@ class KeywordProcessor(object):
             clean_name : string
                 clean term for that keyword that you would want to get back in return or replace
                 if not provided, keyword will be used as the clean name also.
+                Any object can be given as metadata; equal clean names are stored once.
             
             case_sensitive : boolean
                 If None, uses the global case_sensitive setting.
                 If True, adds the keyword as case-sensitive.
                 If False, adds the keyword as case-insensitive.
 
+            categories : string or iterable of strings
+                Category tags of the keyword (e.g. 'brand'), stored as a bit mask with
+                its clean name. `extract_keywords(..., categories=...)` only matches
+                keywords tagged with one of the requested categories. Adding a tagged
+                keyword again with other categories adds them: with the same clean
+                name the categories are merged, with another one each category keeps
+                its own clean name (see `flashtext.categories.CategoryPayloads`) and
+                scans without a filter return both.
+
         Returns:
             status : bool
                 The return value. True for success, False otherwise.
@@ -231,7 +753,8 @@ class KeywordProcessor(object):
             >>> keyword_processor.add_keyword('Big Apple')
             >>> # This case 'Big Apple' will return 'Big Apple'
         """
-        return self._add_keyword_to_trie(keyword, clean_name=clean_name, case_sensitive=case_sensitive)
+        return self._add_keyword_to_trie(keyword, clean_name=clean_name, case_sensitive=case_sensitive,
+                                         categories=categories)
 
     def remove_keyword(self, keyword):
         """To remove one or more keywords from the dictionary
@@ -274,12 +797,23 @@ class KeywordProcessor(object):
         """
         return self.__getitem__(word)
 
-    def add_keyword_from_file(self, keyword_file, encoding="utf-8"):
+    def add_keyword_from_file(self, keyword_file, encoding="utf-8", cache_dir=None):
         """To add keywords from a file
 
         Args:
             keyword_file : path to keywords file
             encoding : specify the encoding of the file
+            cache_dir : directory of compiled dictionaries. When the processor has no
+                keywords yet, the trie built from the file is saved there, and later
+                loads of the same file with the same settings restore it instead of
+                parsing the file and adding its keywords one by one. Artifacts are keyed
+                by the path and content hash of the file, the encoding and the processor
+                settings, and written atomically. Writing the artifact of a file deletes
+                its previous ones, so the directory holds one artifact per file: processors
+                loading one file with different settings should use different directories.
+                Artifacts are pickles: only use a directory that untrusted users cannot
+                write to.
+                Defaults to None (no cache)
 
         Examples:
             keywords file format can be like:
@@ -299,6 +833,7 @@ class KeywordProcessor(object):
             >>> # {"java": ["java_2e", "java programing"], "product management": ["PM"]}
 
             >>> keyword_processor.add_keyword_from_file('keywords.txt')
+            >>> keyword_processor.add_keyword_from_file('keywords.txt', cache_dir='/var/cache/flashtext')
 
         Raises:
             IOError: If `keyword_file` path is not valid
@@ -306,30 +841,100 @@ class KeywordProcessor(object):
         if not os.path.isfile(keyword_file):
             raise IOError("Invalid file path {}".format(keyword_file))
 
-        if keyword_file.endswith(".json"):
+        if cache_dir is None or not self._is_empty():
             with io.open(keyword_file, encoding=encoding) as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    for key, value in data.items():
-                        if isinstance(value, list):
-                            # {clean_name: [keywords]}
-                            for keyword in value:
-                                self.add_keyword(keyword, key)
-                        else:
-                            # {keyword: clean_name}
-                            self.add_keyword(key, value)
-                else:
-                    raise ValueError("JSON must be a dictionary")
-        else:
-            with io.open(keyword_file, encoding=encoding) as f:
-                for line in f:
-                    if '=>' in line:
-                        keyword, clean_name = line.split('=>')
-                        self.add_keyword(keyword, clean_name.strip())
+                self._add_keywords_from_stream(f, keyword_file.endswith(".json"))
+            return
+        # the artifact is keyed by the bytes that are parsed, even if the file changes meanwhile
+        with io.open(keyword_file, 'rb') as f:
+            data = f.read()
+        path = artifact_path(cache_dir, keyword_file, hashlib.sha256(data).hexdigest(), encoding,
+                             self._cache_settings())
+        state = load_artifact(path)
+        if state is not None:
+            self._restore_compiled_state(state)
+            return
+        self._add_keywords_from_stream(io.TextIOWrapper(io.BytesIO(data), encoding=encoding),
+                                       keyword_file.endswith(".json"))
+        if write_artifact(path, self._compiled_state()):
+            remove_older_artifacts(path)
+
+    def _add_keywords_from_stream(self, f, is_json):
+        """Add the keywords of an open keyword file, see `add_keyword_from_file`."""
+        if is_json:
+            data = json.load(f)
+            if isinstance(data, dict):
+                for key, value in data.items():
+                    if isinstance(value, list):
+                        # {clean_name: [keywords]}
+                        for keyword in value:
+                            self.add_keyword(keyword, key)
                     else:
-                        keyword = line.strip()
-                        if keyword:
-                            self.add_keyword(keyword)
+                        # {keyword: clean_name}
+                        self.add_keyword(key, value)
+            else:
+                raise ValueError("JSON must be a dictionary")
+        else:
+            for line in f:
+                if '=>' in line:
+                    keyword, clean_name = line.split('=>')
+                    self.add_keyword(keyword, clean_name.strip())
+                else:
+                    keyword = line.strip()
+                    if keyword:
+                        self.add_keyword(keyword)
+
+    def _is_empty(self):
+        """True if no keyword or payload was ever added (a fresh, non overlay processor)."""
+        return not self.keyword_trie_dict and not len(self._payloads) and self._owned is None
+
+    def _cache_settings(self):
+        """Settings a compiled trie depends on, part of the key of cached artifacts."""
+        normalizer = self.normalizer
+        return {
+            'case_sensitive': self.case_sensitive,
+            'keyword_key': self._keyword,
+            'unicode_boundaries': self.unicode_boundaries,
+            'non_word_boundaries': sorted(self._non_word_boundaries),
+            'white_space_chars': sorted(self._white_space_chars),
+            'normalization': normalizer.form if normalizer is not None else None,
+            'char_variants': sorted(normalizer.fold.items()) if normalizer is not None and normalizer.fold else None,
+            'fuzzy_index': self.fuzzy_index.max_cost if self.fuzzy_index is not None else None,
+        }
+
+    def _compiled_state(self):
+        """Keyword state of the processor, as saved in cached artifacts."""
+        return {
+            'keyword_trie_dict': self.keyword_trie_dict,
+            'payloads': self._payloads,
+            'payload_ids': self._payload_ids,
+            'payload_masks': self._payload_masks,
+            'free_payload_ids': self._free_payload_ids + self._retired_payload_ids,
+            'category_bits': self._category_bits,
+            'terms_in_trie': self._terms_in_trie,
+            'keyword_chars': self._keyword_chars,
+            'multi_label': self._multi_label,
+            'fuzzy_index': self.fuzzy_index,
+        }
+
+    def _restore_compiled_state(self, state):
+        """Adopt the keyword state of a cached artifact, see `_compiled_state`."""
+        self.keyword_trie_dict = state['keyword_trie_dict']
+        self._payloads = state['payloads']
+        self._payload_ids = state['payload_ids']
+        self._payload_masks = state['payload_masks']
+        self._free_payload_ids = state['free_payload_ids']
+        self._retired_payload_ids = []
+        self._category_bits = state['category_bits']
+        self._terms_in_trie = state['terms_in_trie']
+        self._keyword_chars = state['keyword_chars']
+        self._multi_label = state['multi_label']
+        self.fuzzy_index = state['fuzzy_index']
+        self._kernel_choice = None
+        # built again on the first fuzzy lookup
+        self._node_meta = None
+        if self._fuzzy_cache is not None:
+            self._fuzzy_cache.clear()
 
     def add_keywords_from_dict(self, keyword_dict):
         """To add keywords from a dictionary
@@ -417,6 +1022,52 @@ class KeywordProcessor(object):
         for keyword in keyword_list:
             self.remove_keyword(keyword)
 
+    def batch_update(self):
+        """Start a batch of keyword changes published atomically, for processors read by other threads.
+
+        `add_keyword` and `remove_keyword` change the trie in place, so a concurrent
+        `extract_keywords` may see a keyword half inserted. The changes of a batch are
+        instead applied to copies of the nodes on their paths, under a new root that
+        shares everything else with the current trie, and the new root replaces the
+        old one in a single assignment. Scans keep the version they started with;
+        replaced nodes are freed when the last of them finishes. An update costs the
+        size of the change, not of the dictionary.
+
+        Batches are serialized with each other and with `add_keyword`/`remove_keyword`,
+        which wait for a batch being published and then change its trie, so no change
+        is lost. The fuzzy index, if any, is shared by all versions.
+
+        Returns:
+            batch : KeywordBatch
+                Collects changes; they are published by `commit()` or at the end of a
+                `with` block that exits without an exception.
+
+        Examples:
+            >>> with keyword_processor.batch_update() as batch:
+            >>>     batch.add_keyword('Big Apple', 'New York')
+            >>>     batch.remove_keyword('Bay Area')
+            >>> keyword_processor.version
+            >>> # 1
+        """
+        return KeywordBatch(self)
+
+    def _publish_batch(self, operations):
+        """Apply `(method name, args)` operations to a copy-on-write trie and swap it in."""
+        with self._update_lock:
+            old_trie_dict = self.keyword_trie_dict
+            trie_dict = dict(old_trie_dict)
+            owned = {id(trie_dict)}
+            for name, args in operations:
+                getattr(self, name)(*args, trie_dict=trie_dict, owned=owned)
+            # readers pick the new version up on their next scan
+            self.keyword_trie_dict = trie_dict
+            if self._owned is not None:
+                self._owned.update(owned)
+            self.version += 1
+            if self._fuzzy_cache is not None:
+                self._fuzzy_cache.clear()
+        return self.version
+
     def get_all_keywords(self, term_so_far='', current_dict=None):
         """Recursively builds a dictionary of keywords present in the dictionary
         And the clean name mapped to those keywords.
@@ -440,9 +1091,12 @@ class KeywordProcessor(object):
             >>> {'j2ee': 'Java', 'python': 'Python'}
             >>> # NOTE: for case_insensitive all keys will be lowercased.
         """
-        return get_all_keywords(self.keyword_trie_dict, term_so_far, current_dict, self._keyword)
+        payloads = self._payloads
+        terms = get_all_keywords(self.keyword_trie_dict, term_so_far, current_dict, self._keyword)
+        return {term: payloads[payload_id] for term, payload_id in terms.items()}
 
-    def extract_keywords(self, sentence, span_info=False, max_cost=0):
+    def extract_keywords(self, sentence, span_info=False, max_cost=0, as_array=False, return_ids=False,
+                         categories=None, indexed=False):
         """Searches in the string for all keywords present in corpus.
         Keywords present are added to a list `keywords_extracted` and returned.
 
@@ -450,9 +1104,23 @@ class KeywordProcessor(object):
             sentence (str): Line of text where we will search for keywords
             span_info (bool): True if you need to span the boundaries where the extraction has been performed
             max_cost (int): maximum levensthein distance to accept when extracting keywords
+            as_array (bool): Return a columnar `MatchArray` (clean name ids and offsets in
+                `array('l')`) instead of a list, for workloads with millions of hits
+            return_ids (bool): Return the integer payload id of every match instead of its
+                clean name (see `get_payload`). A keyword with a list of clean names gives
+                one id for the whole list. With `categories`, a keyword with a clean name
+                per category gives one id per enabled clean name.
+            categories (str or iterable of str): Only match keywords tagged with one of these
+                categories; longest match is decided among those keywords only.
+                Defaults to None (all keywords)
+            indexed (bool): Answer `max_cost` lookups with the fuzzy index of the processor
+                (see `fuzzy_index`) instead of the trie search. Faster on large dictionaries,
+                but windows are matched against whole keywords, so results can differ.
+                Defaults to False
 
         Returns:
             keywords_extracted (list(str)): List of terms/keywords found in sentence that match our corpus
+                or a MatchArray with `as_array`
 
         Examples:
             >>> from flashtext import KeywordProcessor
@@ -466,10 +1134,158 @@ class KeywordProcessor(object):
             >>> keywords_found
             >>> ['New York', 'Bay Area']
         """
-        keywords_extracted = []
         if not sentence:
             # if sentence is empty or none just return empty list
+            return MatchArray() if as_array else []
+        category_mask = self._category_mask(categories) if categories is not None else None
+        indexed = self._check_indexed(indexed, max_cost)
+        if self.normalizer is not None:
+            keywords_extracted = self._extract_keywords_normalized(sentence, span_info, max_cost, as_array,
+                                                                   return_ids, category_mask, indexed)
+        else:
+            keywords_extracted = self._extract_keywords(sentence, span_info, max_cost, as_array, return_ids,
+                                                        category_mask, indexed)
+        if return_ids and category_mask is not None:
+            return self._select_category_ids(keywords_extracted, category_mask, span_info, as_array)
+        return keywords_extracted
+
+    def _select_category_ids(self, keywords_extracted, category_mask, span_info, as_array):
+        """
+        Ids found by a filtered scan with `return_ids`, with the id of a keyword
+        holding a `CategoryPayloads` replaced by the ids of its enabled alternatives,
+        so `get_payload` gives the clean names of the enabled categories only.
+        """
+        payloads = self._payloads
+        if as_array:
+            rows = list(zip(keywords_extracted.ids, keywords_extracted.starts, keywords_extracted.ends))
+        elif span_info:
+            rows = keywords_extracted
+        else:
+            rows = [(payload_id,) for payload_id in keywords_extracted]
+        if not any(isinstance(payloads[row[0]], CategoryPayloads) for row in rows):
             return keywords_extracted
+        selected = []
+        for row in rows:
+            payload = payloads[row[0]]
+            if isinstance(payload, CategoryPayloads):
+                selected.extend((payload_id,) + row[1:] for payload_id in payload.select_ids(category_mask))
+            else:
+                selected.append(row)
+        if as_array:
+            return MatchArray.from_ids(*zip(*selected), keywords_extracted.names)
+        if span_info:
+            return selected
+        return [row[0] for row in selected]
+
+    def _check_indexed(self, indexed, max_cost):
+        """
+        Whether a scan with `max_cost` is answered by the fuzzy index, see `extract_keywords`.
+
+        Raises:
+            ValueError: `indexed` is set but the processor has no fuzzy index, or one
+                covering a smaller distance than `max_cost`
+        """
+        if not indexed:
+            return False
+        if self.fuzzy_index is None:
+            raise ValueError("The fuzzy index is disabled, create the processor with fuzzy_index=N")
+        if max_cost > self.fuzzy_index.max_cost:
+            raise ValueError("max_cost={} is above the distance covered by the fuzzy index ({})".format(
+                max_cost, self.fuzzy_index.max_cost))
+        return max_cost > 0
+
+    def extract_keywords_column(self, column, max_cost=0, categories=None, indexed=False):
+        """Extract keywords from every row of a string column, with columnar output.
+
+        Rows are scanned one by one, but results go straight into shared
+        `array('l')` columns: no list or tuple is built per row or per match.
+        pandas and pyarrow are optional; the output converts to either.
+
+        Args:
+            column: a `pyarrow.Array`/`ChunkedArray` of strings, a `pandas.Series`
+                or any iterable of strings. Null rows have no matches.
+            max_cost (int): maximum levensthein distance to accept when extracting keywords
+            categories (str or iterable of str): Only match keywords tagged with one of these categories
+            indexed (bool): Answer `max_cost` lookups with the fuzzy index, see `extract_keywords`
+
+        Returns:
+            matches (ColumnMatches): one entry per match with the row position, payload id
+                (see `get_payload`), start and end; `to_arrow()` and `to_pandas()` give a table
+
+        Examples:
+            >>> keyword_processor.add_keyword('Big Apple', 'New York')
+            >>> matches = keyword_processor.extract_keywords_column(df['text'])
+            >>> matches.to_pandas()
+            >>>    row  keyword_id  start  end
+            >>> 0    0           0      7   16
+            >>> matches.to_arrow()  # write with pyarrow.parquet.write_table
+        """
+        def extract(text):
+            return self.extract_keywords(text, max_cost=max_cost, as_array=True, return_ids=True,
+                                         categories=categories, indexed=indexed)
+        category_mask = self._category_mask(categories) if categories is not None else None
+        return extract_column(column, extract, self._payload_view(category_mask))
+
+    def _extract_keywords_normalized(self, sentence, span_info, max_cost, as_array=False, return_ids=False,
+                                     category_mask=None, indexed=False):
+        """
+        Extraction on the normalized sentence, with spans mapped back to `sentence`.
+        """
+        normalized, offsets = self.normalizer.normalize(sentence)
+        if offsets is None:
+            # every character kept its position
+            return self._extract_keywords(normalized, span_info, max_cost, as_array, return_ids, category_mask,
+                                          indexed)
+        if as_array:
+            matches = self._extract_keywords(normalized, True, max_cost, as_array, return_ids, category_mask,
+                                             indexed)
+            starts, ends = matches.starts, matches.ends
+            for position in range(len(matches)):
+                starts[position], ends[position] = map_span(offsets, starts[position], ends[position])
+            return matches
+        keywords_extracted = []
+        for keyword, start, end in self._extract_keywords(normalized, True, max_cost, False, return_ids,
+                                                          category_mask, indexed):
+            if span_info:
+                start, end = map_span(offsets, start, end)
+                keywords_extracted.append((keyword, start, end))
+            else:
+                keywords_extracted.append(keyword)
+        return keywords_extracted
+
+    def _extract_keywords(self, sentence, span_info, max_cost, as_array=False, return_ids=False, category_mask=None,
+                          indexed=False):
+        """
+        Scan of a non-empty sentence, see `extract_keywords`.
+        """
+        if self._scan_counters is not None:
+            return self._extract_keywords_instrumented(sentence, span_info, max_cost, as_array, return_ids,
+                                                       category_mask, indexed)
+        payloads = self._payload_view(category_mask)
+        if indexed:
+            if as_array:
+                matches = self._extract_keywords_indexed(sentence, True, max_cost, return_ids, category_mask)
+                if return_ids:
+                    return MatchArray.from_ids(*zip(*matches), payloads) if matches else MatchArray()
+                return MatchArray.from_tuples(matches)
+            return self._extract_keywords_indexed(sentence, span_info, max_cost, return_ids, category_mask)
+        if not max_cost and category_mask is None and not as_array and self._use_kernels:
+            # the root is read before the kernel is chosen: keywords of a batch are recorded
+            # before its root is published
+            keyword_trie_dict = self.keyword_trie_dict
+            char_classes = self._get_char_classes()
+            kernel = self._select_kernel(char_classes)
+            if kernel is scan_boundary_free:
+                return scan_boundary_free(sentence, keyword_trie_dict, self._keyword,
+                                          None if return_ids else payloads, span_info, self._multi_label)
+            return scan_exact(sentence, keyword_trie_dict, self._keyword, char_classes.classify(sentence),
+                              None if return_ids else payloads, span_info, self._multi_label)
+        keywords_extracted = []
+        # with as_array, offsets go to two arrays next to the list of clean names
+        starts = array('l')
+        ends = array('l')
+        starts_append = starts.append
+        ends_append = ends.append
         # Note: Do NOT convert entire sentence to lowercase here.
         # Unicode chars like Turkish İ change length when lowercased (İ -> i̇).
         # Instead, we lowercase each character individually to preserve span positions.
@@ -477,7 +1293,10 @@ class KeywordProcessor(object):
         # Performance: Localize member variables to avoid lookup overhead in loop
         keyword_trie_dict = self.keyword_trie_dict
         keyword_key = self._keyword
-        non_word_boundaries = self.non_word_boundaries
+        masks = self._payload_masks
+        char_classes = self._get_char_classes()
+        # char -> True if it continues a word, filled for every char of the sentence
+        is_word_char = char_classes.classify(sentence)
         
         current_dict = keyword_trie_dict
         sequence_start_pos = 0
@@ -486,6 +1305,8 @@ class KeywordProcessor(object):
         idx = 0
         sentence_len = len(sentence)
         curr_cost = max_cost
+        # fuzzy lookups scan words in place, see scan_word_end
+        word_pattern = compile_word_pattern(char_classes.word_class) if max_cost > 0 else None
         
         while idx < sentence_len:
             char = sentence[idx]
@@ -495,14 +1316,15 @@ class KeywordProcessor(object):
             #     char = char.lower()
             # when we reach a character that might denote word end
             longest_sequence_found = None
-            if char not in non_word_boundaries:
+            if not is_word_char[char]:
 
                 # if end is present in current_dict
                 if keyword_key in current_dict or char in current_dict:
                     # update longest sequence found
                     sequence_found = None
                     is_longer_seq_found = False
-                    if keyword_key in current_dict:
+                    if keyword_key in current_dict and (
+                            category_mask is None or masks[current_dict[keyword_key]] & category_mask):
                         sequence_found = current_dict[keyword_key]
                         longest_sequence_found = current_dict[keyword_key]
                         sequence_end_pos = idx
@@ -516,12 +1338,12 @@ class KeywordProcessor(object):
                             inner_char = sentence[idy]
                             # if not self.case_sensitive:
                             #     inner_char = inner_char.lower()
-                            if keyword_key in current_dict_continued:
+                            if keyword_key in current_dict_continued and (
+                                    category_mask is None or masks[current_dict_continued[keyword_key]] & category_mask):
                                 # Check if we should accept this match:
-                                # 1. If next char is a word boundary (not in non_word_boundaries), OR
-                                # 2. If last matched char is CJK (not in non_word_boundaries) - CJK doesn't need word boundaries
-                                last_matched_char = sentence[idy - 1] if idy > 0 else ''
-                                if inner_char not in non_word_boundaries or last_matched_char not in non_word_boundaries:
+                                # 1. If next char is a word boundary (not a word char), OR
+                                # 2. If last matched char is CJK (not a word char) - CJK doesn't need word boundaries
+                                if not is_word_char[inner_char] or not is_word_char[sentence[idy - 1]]:
                                     # update longest sequence found
                                     longest_sequence_found = current_dict_continued[keyword_key]
                                     sequence_end_pos = idy
@@ -529,13 +1351,13 @@ class KeywordProcessor(object):
                             if inner_char in current_dict_continued:
                                 current_dict_continued = current_dict_continued[inner_char]
                             elif curr_cost > 0:
-                                next_word = self.get_next_word(sentence[idy:])
-                                current_dict_continued, cost, _ = next(
-                                    self.levensthein(next_word, max_cost=curr_cost, start_node=current_dict_continued),
-                                    ({}, 0, 0),
+                                word_end = scan_word_end(sentence, idy, word_pattern)
+                                next_word = sentence[idy:word_end]
+                                current_dict_continued, cost, _ = self._fuzzy_resolve(
+                                    next_word, curr_cost, current_dict_continued, ({}, 0, 0),
                                 ) # current_dict_continued to empty dict by default, so next iteration goes to a `break`
                                 curr_cost -= cost
-                                idy += len(next_word) - 1
+                                idy = word_end - 1
                                 if not current_dict_continued:
                                     break
                             else:
@@ -543,7 +1365,8 @@ class KeywordProcessor(object):
                             idy += 1
                         else:
                             # end of sentence reached.
-                            if keyword_key in current_dict_continued:
+                            if keyword_key in current_dict_continued and (
+                                    category_mask is None or masks[current_dict_continued[keyword_key]] & category_mask):
                                 # update longest sequence found
                                 longest_sequence_found = current_dict_continued[keyword_key]
                                 sequence_end_pos = idy
@@ -551,9 +1374,21 @@ class KeywordProcessor(object):
                         if is_longer_seq_found:
                             idx = sequence_end_pos
                     current_dict = keyword_trie_dict
-                    if longest_sequence_found:
+                    if longest_sequence_found is not None:
+                        if not return_ids:
+                            longest_sequence_found = payloads[longest_sequence_found]
                         # Optimize: if not span_info, append only keyword
-                        if span_info:
+                        if as_array:
+                            if isinstance(longest_sequence_found, list):
+                                for key in longest_sequence_found:
+                                    keywords_extracted.append(key)
+                                    starts_append(sequence_start_pos)
+                                    ends_append(idx)
+                            else:
+                                keywords_extracted.append(longest_sequence_found)
+                                starts_append(sequence_start_pos)
+                                ends_append(idx)
+                        elif span_info:
                             if isinstance(longest_sequence_found, list):
                                 for key in longest_sequence_found:
                                     keywords_extracted.append((key, sequence_start_pos, idx))
@@ -576,13 +1411,13 @@ class KeywordProcessor(object):
                 # we can continue from this char (char is already lowercased if needed)
                 current_dict = current_dict[char]
             elif curr_cost > 0:
-                next_word = self.get_next_word(sentence[idx:])
-                current_dict, cost, _ = next(
-                    self.levensthein(next_word, max_cost=curr_cost, start_node=current_dict),
-                    (keyword_trie_dict, 0, 0)
+                word_end = scan_word_end(sentence, idx, word_pattern)
+                next_word = sentence[idx:word_end]
+                current_dict, cost, _ = self._fuzzy_resolve(
+                    next_word, curr_cost, current_dict, (keyword_trie_dict, 0, 0)
                 )
                 curr_cost -= cost
-                idx += len(next_word) - 1
+                idx = word_end - 1
             else:
                 # we reset current_dict
                 current_dict = keyword_trie_dict
@@ -593,7 +1428,7 @@ class KeywordProcessor(object):
                     skip_char = sentence[idy]
                     # if not self.case_sensitive:
                     #     skip_char = skip_char.lower()
-                    if skip_char not in non_word_boundaries:
+                    if not is_word_char[skip_char]:
                         break
                     idy += 1
                 # Note: idy points to the first non-boundary char (or end of sentence)
@@ -602,9 +1437,22 @@ class KeywordProcessor(object):
                 idx = idy - 1
             # if we are end of sentence and have a sequence discovered
             if idx + 1 >= sentence_len:
-                if keyword_key in current_dict:
+                if keyword_key in current_dict and (
+                        category_mask is None or masks[current_dict[keyword_key]] & category_mask):
                     sequence_found = current_dict[keyword_key]
-                    if span_info:
+                    if not return_ids:
+                        sequence_found = payloads[sequence_found]
+                    if as_array:
+                        if isinstance(sequence_found, list):
+                            for key in sequence_found:
+                                keywords_extracted.append(key)
+                                starts_append(sequence_start_pos)
+                                ends_append(sentence_len)
+                        else:
+                            keywords_extracted.append(sequence_found)
+                            starts_append(sequence_start_pos)
+                            ends_append(sentence_len)
+                    elif span_info:
                         if isinstance(sequence_found, list):
                             for key in sequence_found:
                                 keywords_extracted.append((key, sequence_start_pos, sentence_len))
@@ -621,12 +1469,558 @@ class KeywordProcessor(object):
                 reset_current_dict = False
                 # Fix for CJK languages: when a keyword is found, we need to
                 # recheck from the end position for adjacent keywords
-                if longest_sequence_found:
+                if longest_sequence_found is not None:
                     idx -= 1
                 sequence_start_pos = idx
+        if as_array:
+            if return_ids:
+                return MatchArray.from_ids(keywords_extracted, starts, ends, payloads)
+            return MatchArray.from_columns(keywords_extracted, starts, ends)
         return keywords_extracted
 
-    def replace_keywords(self, sentence, max_cost=0, span_info=False):
+    def _select_kernel(self, char_classes):
+        """
+        Scan kernel of exact scans without category filter (see `flashtext.kernels`),
+        chosen from the keyword characters recorded while keywords were added:
+        `scan_boundary_free` when all of them are word boundaries (CJK dictionaries),
+        `scan_exact` otherwise. `_add_keyword_chars` keeps the choice up to date as
+        keywords are added, so a call only checks that the word boundaries did not
+        change; all keyword characters are classified again when they did.
+        """
+        choice = self._kernel_choice
+        while choice is None or choice[0] is not char_classes:
+            # copied in one step, so a concurrent add cannot change the set while it is read
+            keyword_chars = tuple(self._keyword_chars)
+            joined = ''.join(keyword_chars)
+            is_word_char = char_classes.classify(joined)
+            kernel = scan_exact if any(is_word_char[char] for char in joined) else scan_boundary_free
+            choice = self._kernel_choice = (char_classes, kernel)
+            if len(self._keyword_chars) != len(keyword_chars):
+                # characters added meanwhile may have missed the new choice, classify again
+                choice = None
+        return choice[1]
+
+    def _extract_keywords_instrumented(self, sentence, span_info, max_cost, as_array=False, return_ids=False,
+                                       category_mask=None, indexed=False):
+        """
+        Copy of `_extract_keywords` that also counts its work into the scan counters,
+        see `scan_stats`. Keep both loops in sync.
+        """
+        counters = self._scan_counters
+        counters['sentences'] += 1
+        counters['chars_scanned'] += len(sentence)
+        payloads = self._payload_view(category_mask)
+        if indexed:
+            if as_array:
+                matches = self._extract_keywords_indexed(sentence, True, max_cost, return_ids, category_mask,
+                                                         counters)
+                counters['matches'] += len(matches)
+                if return_ids:
+                    return MatchArray.from_ids(*zip(*matches), payloads) if matches else MatchArray()
+                return MatchArray.from_tuples(matches)
+            keywords_extracted = self._extract_keywords_indexed(sentence, span_info, max_cost, return_ids,
+                                                                category_mask, counters)
+            counters['matches'] += len(keywords_extracted)
+            return keywords_extracted
+        keywords_extracted = []
+        # with as_array, offsets go to two arrays next to the list of clean names
+        starts = array('l')
+        ends = array('l')
+        starts_append = starts.append
+        ends_append = ends.append
+        # Note: Do NOT convert entire sentence to lowercase here.
+        # Unicode chars like Turkish İ change length when lowercased (İ -> i̇).
+        # Instead, we lowercase each character individually to preserve span positions.
+        
+        # Performance: Localize member variables to avoid lookup overhead in loop
+        keyword_trie_dict = self.keyword_trie_dict
+        keyword_key = self._keyword
+        masks = self._payload_masks
+        char_classes = self._get_char_classes()
+        # char -> True if it continues a word, filled for every char of the sentence
+        is_word_char = char_classes.classify(sentence)
+        
+        current_dict = keyword_trie_dict
+        sequence_start_pos = 0
+        sequence_end_pos = 0
+        reset_current_dict = False
+        idx = 0
+        sentence_len = len(sentence)
+        curr_cost = max_cost
+        # fuzzy lookups scan words in place, see scan_word_end
+        word_pattern = compile_word_pattern(char_classes.word_class) if max_cost > 0 else None
+        positions = trie_steps = lookahead_runs = lookahead_chars = lookahead_backtracks = 0
+        skipped_chars = cjk_rechecks = fuzzy_calls = 0
+        nodes_expanded = self._fuzzy_counters['nodes_expanded']
+        
+        while idx < sentence_len:
+            positions += 1
+            char = sentence[idx]
+            # Optimization: We do NOT call lower() here anymore.
+            # The Trie contains necessary edges for case-insensitive matching.
+            # if not self.case_sensitive:
+            #     char = char.lower()
+            # when we reach a character that might denote word end
+            longest_sequence_found = None
+            if not is_word_char[char]:
+
+                # if end is present in current_dict
+                if keyword_key in current_dict or char in current_dict:
+                    # update longest sequence found
+                    sequence_found = None
+                    is_longer_seq_found = False
+                    if keyword_key in current_dict and (
+                            category_mask is None or masks[current_dict[keyword_key]] & category_mask):
+                        sequence_found = current_dict[keyword_key]
+                        longest_sequence_found = current_dict[keyword_key]
+                        sequence_end_pos = idx
+
+                    # re look for longest_sequence from this position
+                    if char in current_dict:
+                        current_dict_continued = current_dict[char]
+                        lookahead_runs += 1
+                        trie_steps += 1
+
+                        idy = idx + 1
+                        while idy < sentence_len:
+                            lookahead_chars += 1
+                            inner_char = sentence[idy]
+                            # if not self.case_sensitive:
+                            #     inner_char = inner_char.lower()
+                            if keyword_key in current_dict_continued and (
+                                    category_mask is None or masks[current_dict_continued[keyword_key]] & category_mask):
+                                # Check if we should accept this match:
+                                # 1. If next char is a word boundary (not a word char), OR
+                                # 2. If last matched char is CJK (not a word char) - CJK doesn't need word boundaries
+                                if not is_word_char[inner_char] or not is_word_char[sentence[idy - 1]]:
+                                    # update longest sequence found
+                                    longest_sequence_found = current_dict_continued[keyword_key]
+                                    sequence_end_pos = idy
+                                    is_longer_seq_found = True
+                            if inner_char in current_dict_continued:
+                                current_dict_continued = current_dict_continued[inner_char]
+                                trie_steps += 1
+                            elif curr_cost > 0:
+                                fuzzy_calls += 1
+                                word_end = scan_word_end(sentence, idy, word_pattern)
+                                next_word = sentence[idy:word_end]
+                                current_dict_continued, cost, _ = self._fuzzy_resolve(
+                                    next_word, curr_cost, current_dict_continued, ({}, 0, 0),
+                                ) # current_dict_continued to empty dict by default, so next iteration goes to a `break`
+                                curr_cost -= cost
+                                idy = word_end - 1
+                                if not current_dict_continued:
+                                    break
+                            else:
+                                break
+                            idy += 1
+                        else:
+                            # end of sentence reached.
+                            if keyword_key in current_dict_continued and (
+                                    category_mask is None or masks[current_dict_continued[keyword_key]] & category_mask):
+                                # update longest sequence found
+                                longest_sequence_found = current_dict_continued[keyword_key]
+                                sequence_end_pos = idy
+                                is_longer_seq_found = True
+                        if is_longer_seq_found:
+                            idx = sequence_end_pos
+                        else:
+                            lookahead_backtracks += 1
+                    current_dict = keyword_trie_dict
+                    if longest_sequence_found is not None:
+                        if not return_ids:
+                            longest_sequence_found = payloads[longest_sequence_found]
+                        # Optimize: if not span_info, append only keyword
+                        if as_array:
+                            if isinstance(longest_sequence_found, list):
+                                for key in longest_sequence_found:
+                                    keywords_extracted.append(key)
+                                    starts_append(sequence_start_pos)
+                                    ends_append(idx)
+                            else:
+                                keywords_extracted.append(longest_sequence_found)
+                                starts_append(sequence_start_pos)
+                                ends_append(idx)
+                        elif span_info:
+                            if isinstance(longest_sequence_found, list):
+                                for key in longest_sequence_found:
+                                    keywords_extracted.append((key, sequence_start_pos, idx))
+                            else:
+                                keywords_extracted.append((longest_sequence_found, sequence_start_pos, idx))
+                        else:
+                            if isinstance(longest_sequence_found, list):
+                                for key in longest_sequence_found:
+                                    keywords_extracted.append(key)
+                            else:
+                                keywords_extracted.append(longest_sequence_found)
+                                
+                        curr_cost = max_cost
+                    reset_current_dict = True
+                else:
+                    # we reset current_dict
+                    current_dict = keyword_trie_dict
+                    reset_current_dict = True
+            elif char in current_dict:
+                # we can continue from this char (char is already lowercased if needed)
+                current_dict = current_dict[char]
+                trie_steps += 1
+            elif curr_cost > 0:
+                fuzzy_calls += 1
+                word_end = scan_word_end(sentence, idx, word_pattern)
+                next_word = sentence[idx:word_end]
+                current_dict, cost, _ = self._fuzzy_resolve(
+                    next_word, curr_cost, current_dict, (keyword_trie_dict, 0, 0)
+                )
+                curr_cost -= cost
+                idx = word_end - 1
+            else:
+                # we reset current_dict
+                current_dict = keyword_trie_dict
+                reset_current_dict = True
+                # skip to end of word
+                idy = idx + 1
+                while idy < sentence_len:
+                    skip_char = sentence[idy]
+                    # if not self.case_sensitive:
+                    #     skip_char = skip_char.lower()
+                    if not is_word_char[skip_char]:
+                        break
+                    idy += 1
+                # Note: idy points to the first non-boundary char (or end of sentence)
+                # After loop ends with idx += 1, we want idx to equal idy
+                # So set idx = idy - 1 here
+                skipped_chars += idy - idx - 1
+                idx = idy - 1
+            # if we are end of sentence and have a sequence discovered
+            if idx + 1 >= sentence_len:
+                if keyword_key in current_dict and (
+                        category_mask is None or masks[current_dict[keyword_key]] & category_mask):
+                    sequence_found = current_dict[keyword_key]
+                    if not return_ids:
+                        sequence_found = payloads[sequence_found]
+                    if as_array:
+                        if isinstance(sequence_found, list):
+                            for key in sequence_found:
+                                keywords_extracted.append(key)
+                                starts_append(sequence_start_pos)
+                                ends_append(sentence_len)
+                        else:
+                            keywords_extracted.append(sequence_found)
+                            starts_append(sequence_start_pos)
+                            ends_append(sentence_len)
+                    elif span_info:
+                        if isinstance(sequence_found, list):
+                            for key in sequence_found:
+                                keywords_extracted.append((key, sequence_start_pos, sentence_len))
+                        else:
+                            keywords_extracted.append((sequence_found, sequence_start_pos, sentence_len))
+                    else:
+                        if isinstance(sequence_found, list):
+                            for key in sequence_found:
+                                keywords_extracted.append(key)
+                        else:
+                            keywords_extracted.append(sequence_found)
+            idx += 1
+            if reset_current_dict:
+                reset_current_dict = False
+                # Fix for CJK languages: when a keyword is found, we need to
+                # recheck from the end position for adjacent keywords
+                if longest_sequence_found is not None:
+                    idx -= 1
+                    cjk_rechecks += 1
+                sequence_start_pos = idx
+        counters['positions'] += positions
+        counters['trie_steps'] += trie_steps
+        counters['lookahead_runs'] += lookahead_runs
+        counters['lookahead_chars'] += lookahead_chars
+        counters['lookahead_backtracks'] += lookahead_backtracks
+        counters['skipped_chars'] += skipped_chars
+        counters['cjk_rechecks'] += cjk_rechecks
+        counters['fuzzy_calls'] += fuzzy_calls
+        counters['fuzzy_nodes_expanded'] += self._fuzzy_counters['nodes_expanded'] - nodes_expanded
+        counters['matches'] += len(keywords_extracted)
+        if as_array:
+            if return_ids:
+                return MatchArray.from_ids(keywords_extracted, starts, ends, payloads)
+            return MatchArray.from_columns(keywords_extracted, starts, ends)
+        return keywords_extracted
+
+    def _fuzzy_resolve(self, word, max_cost, start_node, default):
+        """
+        First fuzzy match of `word` below `start_node`, memoized per
+        (node, word, cost) in the fuzzy cache.
+
+        Returns:
+            node, cost, depth (tuple): the match, or `default` if there is none
+        """
+        if self._node_meta is None:
+            self._node_meta = build_node_meta(self.keyword_trie_dict, self._white_space_chars, self._keyword)
+        fuzzy_cache = self._fuzzy_cache
+        if fuzzy_cache is None:
+            return next(self.levensthein(word, max_cost=max_cost, start_node=start_node), default)
+        key = (id(start_node), word, max_cost, self.fuzzy_budget)
+        cached = fuzzy_cache.get(key)
+        # the entry keeps its node alive, so its id cannot be reused by a node of a later version
+        if cached is not None and cached[0] is start_node:
+            found = cached[1]
+        else:
+            found = next(self.levensthein(word, max_cost=max_cost, start_node=start_node), None)
+            fuzzy_cache.put(key, (start_node, found))
+        return default if found is None else found
+
+    def fuzzy_stats(self):
+        """Counters describing the work done by fuzzy (`max_cost`) lookups.
+
+        Returns:
+            stats : dict
+                cache_hits, cache_misses, cache_size and cache_maxsize of the fuzzy cache,
+                nodes_expanded and nodes_pruned by the trie search, prune_rate
+                (share of expanded nodes whose subtree was cut by the length window), and
+                budget_exhausted (lookups stopped by `fuzzy_budget`).
+
+        Examples:
+            >>> keyword_processor.extract_keywords('I love Big Aple', max_cost=1)
+            >>> keyword_processor.fuzzy_stats()['cache_misses']
+            >>> 1
+        """
+        fuzzy_cache = self._fuzzy_cache
+        counters = self._fuzzy_counters
+        expanded = counters['nodes_expanded']
+        return {
+            'nodes_expanded': expanded,
+            'nodes_pruned': counters['nodes_pruned'],
+            'prune_rate': counters['nodes_pruned'] / expanded if expanded else 0.0,
+            'budget_exhausted': counters['budget_exhausted'],
+            'cache_hits': fuzzy_cache.hits if fuzzy_cache is not None else 0,
+            'cache_misses': fuzzy_cache.misses if fuzzy_cache is not None else 0,
+            'cache_size': len(fuzzy_cache) if fuzzy_cache is not None else 0,
+            'cache_maxsize': fuzzy_cache.maxsize if fuzzy_cache is not None else 0,
+        }
+
+    def scan_stats(self, reset=False):
+        """Counters of the work done by scans since the processor was created (or reset).
+
+        Only available with `KeywordProcessor(stats=True)`.
+
+        Args:
+            reset (bool): Set the counters back to zero after reading them
+
+        Returns:
+            stats : dict
+                sentences and chars_scanned (input size), positions (scan loop iterations),
+                trie_steps (edges followed), lookahead_runs and lookahead_chars (searches for a
+                longer keyword past a word end, and characters they read), lookahead_backtracks
+                (runs that found nothing longer), skipped_chars (characters skipped to the end
+                of an unknown word), cjk_rechecks (positions scanned again after a match for
+                adjacent keywords), fuzzy_calls and fuzzy_nodes_expanded (fuzzy lookups: words resolved
+                by the trie search or windows probed in the `fuzzy_index`, and trie nodes they
+                evaluated), matches (keywords emitted)
+
+        Raises:
+            ValueError: If the processor was created without `stats=True`
+
+        Examples:
+            >>> keyword_processor = KeywordProcessor(stats=True)
+            >>> keyword_processor.add_keyword('Big Apple')
+            >>> keyword_processor.extract_keywords('I love Big Apple')
+            >>> keyword_processor.scan_stats()['matches']
+            >>> 1
+        """
+        counters = self._scan_counters
+        if counters is None:
+            raise ValueError("Scan statistics are disabled, create the processor with stats=True")
+        stats = dict(counters)
+        if reset:
+            for name in counters:
+                counters[name] = 0
+        return stats
+
+    def latency_report(self, percentiles=DEFAULT_PERCENTILES):
+        """Latency percentiles of the API calls, overall, by mode and by input length.
+
+        Only available with `KeywordProcessor(latency=True)`. To combine worker
+        processes, send `latency_recorder.to_dict()` to one place and `merge` the
+        `LatencyRecorder.from_dict` of each.
+
+        Args:
+            percentiles (iterable of float): percentiles to report.
+                Defaults to (50, 90, 99, 99.9)
+
+        Returns:
+            report : dict
+                method name -> count, mean, max and 'p50', 'p99', ... in microseconds, with
+                'by_mode' ('exact', 'fuzzy') and 'by_length' ('<64' characters, ...) breakdowns
+
+        Raises:
+            ValueError: If the processor was created without `latency=True`
+
+        Examples:
+            >>> keyword_processor = KeywordProcessor(latency=True)
+            >>> keyword_processor.extract_keywords('I love Big Apple', max_cost=1)
+            >>> keyword_processor.latency_report()['extract_keywords']['by_mode']['fuzzy']['count']
+            >>> 1
+        """
+        if self.latency_recorder is None:
+            raise ValueError("Latency recording is disabled, create the processor with latency=True")
+        return self.latency_recorder.report(percentiles)
+
+    def trie_stats(self):
+        """Shape of the keyword trie: nodes, edges, case links, depth and fan-out.
+
+        The trie is walked iteratively and nodes shared by the lower/upper case
+        edges of case insensitive keywords are counted once.
+
+        Returns:
+            stats : dict
+                nodes, edges, shared_edges (extra edges added by the mixed case linking),
+                keywords (nodes holding a keyword), max_depth, depth (nodes per depth),
+                fanout (number of edges -> number of nodes), node_bytes and key_bytes
+
+        Examples:
+            >>> keyword_processor.add_keyword('Big Apple')
+            >>> keyword_processor.trie_stats()['shared_edges']
+            >>> 8
+        """
+        return trie_statistics(self.keyword_trie_dict, self._keyword)
+
+    def memory_usage(self, deep=False):
+        """Estimate, in bytes, of the memory held by the processor.
+
+        On an `OverlayKeywordProcessor` the trie and payloads shared with the base
+        are included; `owned_nodes` gives the overlay's own part.
+
+        Args:
+            deep (bool): Also count the objects held by the containers: edge key
+                strings, clean names and fuzzy pruning windows. Otherwise only the
+                containers themselves (trie node dicts, tables) are counted.
+                Defaults to False
+
+        Returns:
+            usage : dict
+                trie, payloads (clean name tables and categories), fuzzy_index,
+                fuzzy_meta (pruning windows), fuzzy_cache and total, in bytes
+
+        Examples:
+            >>> keyword_processor.memory_usage(deep=True)['total']
+            >>> 1936
+        """
+        stats = self.trie_stats()
+        usage = {'trie': stats['node_bytes'] + (stats['key_bytes'] if deep else 0)}
+        seen = set()
+        payloads = sys.getsizeof(self._payload_ids)
+        if deep:
+            payloads = deep_getsizeof(self._payload_ids, seen)
+        for table in (self._payloads, self._payload_masks):
+            payloads += sys.getsizeof(table)
+            if deep:
+                payloads += sum(deep_getsizeof(item, seen) for item in table)
+        usage['payloads'] = payloads
+        usage['fuzzy_index'] = self.fuzzy_index.memory_usage() if self.fuzzy_index is not None else 0
+        node_meta = self._node_meta
+        if node_meta is None:
+            usage['fuzzy_meta'] = 0
+        else:
+            usage['fuzzy_meta'] = deep_getsizeof(node_meta, seen) if deep else sys.getsizeof(node_meta)
+        fuzzy_cache = self._fuzzy_cache
+        cache = 0
+        if fuzzy_cache is not None:
+            cache = sys.getsizeof(fuzzy_cache._data)
+            if deep:
+                # values hold trie nodes, already counted with the trie
+                cache += sum(deep_getsizeof(key, seen) + sys.getsizeof(value)
+                             for key, value in fuzzy_cache.items())
+        usage['fuzzy_cache'] = cache
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def _extract_keywords_indexed(self, sentence, span_info, max_cost, return_ids=False, category_mask=None,
+                                  counters=None):
+        """
+        Fuzzy extraction answered by the symmetric-delete index, for scans called with `indexed=True`.
+
+        The sentence is split into tokens (runs of word characters, or single
+        non-space characters such as CJK ideographs and punctuation). From each
+        token start, every window ending on a token end whose length is within
+        `max_cost` of the length of an indexed keyword is probed. A keyword only
+        counts for a window with the same number of words and the same kind of
+        first and last character, so typos cannot swallow a neighbouring word or
+        punctuation. The longest window with a match wins, with the cheapest
+        keyword for that window (ties by keyword), and the scan resumes after it.
+
+        These are not the semantics of the trie search: a window can match with
+        an edit on its first character, or inside a token the trie walk would
+        skip, and the trie search can match a keyword prefix across a word the
+        index sees as a different window. For instance with the keyword 'aa',
+        'b a' gives ('aa', 2, 3) here (one deletion) and nothing on the trie.
+        `test_fuzzy_index.py` checks this method against a brute-force version of
+        these rules.
+
+        With scan `counters`, every window probed in the index counts as one
+        fuzzy call, as every word resolved by the trie search does.
+        """
+        keywords_extracted = []
+        fuzzy_index = self.fuzzy_index
+        # the whole sentence is resolved on the trie version published when the scan started
+        keyword_trie_dict = self.keyword_trie_dict
+        if not len(fuzzy_index):
+            return keywords_extracted
+        payloads = self._payload_view(category_mask)
+        char_classes = self._get_char_classes()
+        token_pattern = compile_token_pattern(char_classes.word_class)
+
+        def shape(text):
+            is_word_char = char_classes.classify(text)
+            words = sum(1 for token in token_pattern.findall(text) if is_word_char[token[0]])
+            return words, is_word_char[text[0]], is_word_char[text[-1]]
+
+        min_len = fuzzy_index.min_length - max_cost
+        max_len = fuzzy_index.max_length + max_cost
+        # only windows within max_cost of an indexed length are probed
+        probe_lengths = {length + offset for length in fuzzy_index.lengths()
+                         for offset in range(-max_cost, max_cost + 1)}
+        tokens = [match.span() for match in token_pattern.finditer(sentence)]
+        token_count = len(tokens)
+        idx = 0
+        while idx < token_count:
+            start = tokens[idx][0]
+            best = None
+            # windows from one start share their first characters, so their candidates
+            prefix_candidates = {}
+            idy = idx
+            while idy < token_count and tokens[idy][1] - start <= max_len:
+                end = tokens[idy][1]
+                if end - start >= min_len and end - start in probe_lengths:
+                    window = sentence[start:end]
+                    window_shape = None
+                    if counters is not None:
+                        counters['fuzzy_calls'] += 1
+                    for keyword, _ in fuzzy_index.lookup(window, max_cost, prefix_candidates):
+                        if window_shape is None:
+                            window_shape = shape(window)
+                        if shape(keyword) != window_shape:
+                            continue
+                        payload_id = self._find_leaf(keyword, keyword_trie_dict)
+                        if payload_id is not None and (
+                                category_mask is None or self._payload_masks[payload_id] & category_mask):
+                            best = (payload_id, end, idy)
+                            break
+                idy += 1
+            if best is None:
+                idx += 1
+                continue
+            payload_id, end, idx = best
+            idx += 1
+            if return_ids:
+                keywords_extracted.append((payload_id, start, end) if span_info else payload_id)
+                continue
+            clean_name = payloads[payload_id]
+            names = clean_name if isinstance(clean_name, list) else [clean_name]
+            for name in names:
+                keywords_extracted.append((name, start, end) if span_info else name)
+        return keywords_extracted
+
+    def replace_keywords(self, sentence, max_cost=0, span_info=False, matches=None, categories=None,
+                         indexed=False):
         """
         Search for keywords and replace them with the associated name in the
         KeywordProcessor.
@@ -635,11 +2029,21 @@ class KeywordProcessor(object):
             sentence (str): Line of text where we will search for keywords
             max_cost (int): Maximum levenshtein distance for fuzzy matching
             span_info (bool): If True, return tuple (new_sentence, list_of_replacements)
+            matches (MatchArray or list): Matches of `sentence` already extracted with
+                `as_array=True` or `span_info=True`, used instead of scanning it again.
+                Payload ids (`return_ids=True`) are resolved with the payload table, and a
+                list of clean names is replaced by its first one
+            categories (str or iterable of str): Only replace keywords tagged with one of these categories
+            indexed (bool): Answer `max_cost` lookups with the fuzzy index, see `extract_keywords`
 
         Returns:
             new_sentence (str): Line of text with replaced keywords
             (optional) replacements (list): List of dicts with replacement details
 
+        Raises:
+            ValueError: `matches` rows are not (clean name or payload id, start, end)
+                tuples, or a clean name is not a str
+
         Examples:
             >>> keyword_processor = KeywordProcessor()
             >>> keyword_processor.add_keyword('Big Apple', 'New York')
@@ -655,7 +2059,10 @@ class KeywordProcessor(object):
             return sentence
         
         # Use extract_keywords with span_info to get all matches and their positions
-        keywords_with_span = self.extract_keywords(sentence, span_info=True, max_cost=max_cost)
+        if matches is None:
+            matches = self.extract_keywords(sentence, span_info=True, max_cost=max_cost, categories=categories,
+                                            indexed=indexed)
+        keywords_with_span = matches
         
         if not keywords_with_span:
             if span_info:
@@ -667,7 +2074,22 @@ class KeywordProcessor(object):
         last_end = 0
         replacements = []
         
-        for keyword, start, end in keywords_with_span:
+        payloads = None
+        for match in keywords_with_span:
+            if not isinstance(match, tuple) or len(match) != 3:
+                raise ValueError("matches must hold (clean name, start, end) rows, "
+                                 "extract them with span_info=True or as_array=True")
+            keyword, start, end = match
+            if isinstance(keyword, int):
+                # payload id, extracted with return_ids=True
+                if payloads is None:
+                    payloads = self._payload_view(self._category_mask(categories) if categories is not None else None)
+                keyword = payloads[keyword]
+            if isinstance(keyword, list):
+                # multi-label payload: the first clean name wins, as in a scan
+                keyword = keyword[0]
+            if not isinstance(keyword, str):
+                raise ValueError("Keywords can only be replaced by str clean names, got {!r}".format(keyword))
             if start < last_end:
                  # Skip overlapping keywords (e.g. from multi-label matches)
                  continue
@@ -694,23 +2116,57 @@ class KeywordProcessor(object):
             return result_sentence, replacements
         return result_sentence
 
-    def extract_sentences(self, text, delimiters=None):
+    def extract_sentences(self, text, delimiters=None, span_info=False, matches=None):
         """
         Extract sentences that contain keywords.
-        
+        The text is scanned once; matches are then grouped by sentence.
+
         Args:
             text (str): Input text
-            delimiters (list of str): Punctuation to split sentences. 
-                                      Default: ['.', '?', '!', ';', '\\n']
+            delimiters (list of str): Punctuation to split sentences, an empty list
+                                      keeps the text as one sentence.
+                                      Default: ['.', '?', '!', ';', '\\n', '。', '！', '？']
+            span_info (bool): Return (start, end) offsets of the sentences instead of copies
+            matches (MatchArray or list): Matches of `text` already extracted with
+                `as_array=True` or `span_info=True`, used instead of scanning it again
         Returns:
             list of (str, list): [(sentence, [keywords]), ...]
+            or, with span_info, list of (int, int, list): [(start, end, [keywords]), ...]
+
+        Examples:
+            >>> keyword_processor.add_keyword('Python')
+            >>> keyword_processor.extract_sentences('Hello. I love Python!', span_info=True)
+            >>> [(6, 21, ['Python'])]
+        """
+        return extract_sentences_util(text, self.extract_keywords, delimiters, span_info, matches)
+
+    def iter_sentences(self, text_or_chunks, delimiters=None, skip_empty=True):
+        """
+        Stream the sentences of a text and their keywords.
+        The input can be a string or an iterable of chunks (e.g. a file read in blocks);
+        sentences cut by a chunk boundary are carried over to the next chunk.
+
+        Args:
+            text_or_chunks (str or iterable of str): Input text, or its successive chunks
+            delimiters (list of str): Punctuation to split sentences, an empty list
+                                      keeps the text as one sentence.
+                                      Default: ['.', '?', '!', ';', '\\n', '。', '！', '？']
+            skip_empty (bool): Skip sentences without keywords, without building them
+        Yields:
+            start, end, keywords (tuple): offsets of the sentence in the whole input and its keywords
+
+        Examples:
+            >>> keyword_processor.add_keyword('Python')
+            >>> with open('transcript.txt') as f:
+            >>>     for start, end, keywords in keyword_processor.iter_sentences(iter(lambda: f.read(1 << 20), '')):
+            >>>         print(start, end, keywords)
         """
-        return extract_sentences_util(text, self.extract_keywords, delimiters)
+        return iter_sentences_util(text_or_chunks, self.extract_keywords, delimiters, skip_empty)
 
     def get_next_word(self, sentence):
         """
         Retrieve the next word in the sequence
-        Iterate in the string until finding the first char not in non_word_boundaries
+        Iterate in the string until finding the first char that is not a word character
 
         Args:
             sentence (str): Line of text where we will look for the next word
@@ -723,22 +2179,26 @@ class KeywordProcessor(object):
             >>> keyword_processor.add_keyword('Big Apple')
             >>> 'Big'
         """
-        next_word = str()
-        for char in sentence:
-            if char not in self.non_word_boundaries:
-                # Check if it's CJK. If so, it's a single-char word/token.
-                code = ord(char)
-                if (0x4E00 <= code <= 0x9FFF or  # CJK Unified
-                    0x3400 <= code <= 0x4DBF or  # CJK Ext A
-                    0x3040 <= code <= 0x309F or  # Hiragana
-                    0x30A0 <= code <= 0x30FF or  # Katakana
-                    0xAC00 <= code <= 0xD7AF):   # Hangul Syllables
-                    if not next_word:
-                        return char
-                    break # If we have "abc", we stop at "機" -> return "abc"
-                break
-            next_word += char
-        return next_word
+        return sentence[:self.get_next_word_end(sentence)]
+
+    def get_next_word_end(self, text, start=0):
+        """
+        Offset just after the word starting at `start` in `text`.
+        Same rules as `get_next_word`, without copying the rest of the text.
+
+        Args:
+            text (str): Text to scan
+            start (int): Offset where the word starts
+
+        Returns:
+            end (int): Offset after the word, equal to `start` if there is no word there
+
+        Examples:
+            >>> keyword_processor.get_next_word_end('I love Big Apple', 7)
+            >>> 10
+        """
+        word_pattern = compile_word_pattern(self._get_char_classes().word_class)
+        return scan_word_end(text, start, word_pattern)
 
     def levensthein(self, word, max_cost=2, start_node=None):
         """
@@ -752,20 +2212,22 @@ class KeywordProcessor(object):
 
         Yields:
             node, cost, depth (tuple): A tuple containing the final node,
-                                      the cost (i.e the distance), and the depth in the trie
+                                      the cost (i.e the distance), and the depth in the trie.
+                                      Cheapest matches come first.
 
         Examples:
             >>> from flashtext import KeywordProcessor
             >>> keyword_processor = KeywordProcessor(case_sensitive=True)
             >>> keyword_processor.add_keyword('Marie', 'Mary')
             >>> next(keyword_processor.levensthein('Maria', max_cost=1))
-            >>> ({'_keyword_': 'Mary'}, 1, 5)
+            >>> ({'_keyword_': 0}, 1, 5)
             ...
             >>> keyword_processor = KeywordProcessor(case_sensitive=True
             >>> keyword_processor.add_keyword('Marie Blanc', 'Mary')
             >>> next(keyword_processor.levensthein('Mari', max_cost=1))
-            >>> ({' ': {'B': {'l': {'a': {'n': {'c': {'_keyword_': 'Mary'}}}}}}}, 1, 5)
+            >>> ({' ': {'B': {'l': {'a': {'n': {'c': {'_keyword_': 0}}}}}}}, 1, 5)
         """
         start_node = start_node or self.keyword_trie_dict
-        yield from levensthein(word, max_cost, start_node, self._white_space_chars, self._keyword)
+        yield from levensthein(word, max_cost, start_node, self._white_space_chars, self._keyword,
+                               self._node_meta, self._fuzzy_counters, self.fuzzy_budget)
 
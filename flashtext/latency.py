@@ -0,0 +1,295 @@
+import math
+import threading
+from time import perf_counter_ns
+
+# values below 2 ** SUB_BUCKET_BITS are counted exactly; above, every power of
+# two is split into 2 ** (SUB_BUCKET_BITS - 1) buckets, a relative error of at most 1/16
+SUB_BUCKET_BITS = 5
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+
+
+def bucket_index(value):
+    """Histogram bucket of a non-negative int, log-linear as in HDR histograms."""
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    if shift <= 0:
+        return value
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+
+def bucket_value(index):
+    """Value reported for a bucket: the middle of the range of values it counts."""
+    if index < 2 * _HALF:
+        return index
+    shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+    sub_bucket = index - (shift << (SUB_BUCKET_BITS - 1))
+    return (sub_bucket << shift) + (1 << (shift - 1))
+
+
+class LatencyHistogram(object):
+    """Log-bucketed histogram of durations in nanoseconds.
+
+    Recording is one list increment; percentiles are read from the bucket
+    counts, exact up to 32 ns and within about 6% above. Histograms of
+    different processes can be added with `merge`.
+
+    Attributes:
+        counts (list): number of values per bucket
+        count (int): number of values recorded
+        total (int): sum of the values
+        min (int): smallest value, None if empty
+        max (int): largest value, None if empty
+    """
+
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        """
+        Count one duration.
+
+        Args:
+            value (int): duration in nanoseconds
+        """
+        index = bucket_index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Add the values of another histogram to this one.
+
+        Args:
+            other (LatencyHistogram): histogram to add, unchanged
+        """
+        counts = self.counts
+        if len(other.counts) > len(counts):
+            counts.extend([0] * (len(other.counts) - len(counts)))
+        for index, count in enumerate(other.counts):
+            counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, percent):
+        """
+        Value below which `percent` % of the recorded durations fall.
+
+        Args:
+            percent (float): between 0 and 100
+
+        Returns:
+            int: duration in nanoseconds, None if the histogram is empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(percent / 100.0 * self.count)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                # never report more than the largest value actually seen
+                return min(bucket_value(index), self.max)
+        return self.max
+
+    def summary(self, percentiles=DEFAULT_PERCENTILES):
+        """
+        Count, mean, max and percentiles, in microseconds.
+
+        Args:
+            percentiles (iterable of float): percentiles to report
+
+        Returns:
+            dict: count, mean, max and one 'p<percent>' entry per percentile
+        """
+        summary = {'count': self.count}
+        if self.count:
+            summary['mean'] = self.total / self.count / 1000.0
+            summary['max'] = self.max / 1000.0
+        for percent in percentiles:
+            value = self.percentile(percent)
+            summary['p{:g}'.format(percent)] = value / 1000.0 if value is not None else None
+        return summary
+
+    def to_dict(self):
+        """Plain dict of the histogram, e.g. to send it to another process as JSON."""
+        return {'counts': list(self.counts), 'count': self.count, 'total': self.total,
+                'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Histogram from the output of `to_dict`."""
+        histogram = cls()
+        histogram.counts = list(data['counts'])
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
+
+
+class LatencyRecorder(object):
+    """Latency histograms of the API calls of a KeywordProcessor.
+
+    One histogram is kept per API, mode ('exact' or 'fuzzy', i.e. `max_cost`
+    given) and input length bucket (a power of two), so that tail latency can
+    be attributed to document size or fuzzy matching. Calls made by another
+    timed call (`replace_keywords` calling `extract_keywords`) are not counted
+    twice. Every operation holds a lock, so one recorder can be shared by the
+    threads using a processor.
+
+    Examples:
+        >>> keyword_processor = KeywordProcessor(latency=True)
+        >>> keyword_processor.extract_keywords('I love Big Apple')
+        >>> keyword_processor.latency_report()['extract_keywords']['p99']
+        >>> 12.5
+        >>> # in a parent process
+        >>> recorder = LatencyRecorder.from_dict(worker_recorder_dict)
+        >>> recorder.merge(LatencyRecorder.from_dict(other_worker_recorder_dict))
+    """
+
+    def __init__(self):
+        # (api, mode, length bucket) -> LatencyHistogram
+        self.histograms = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        with self._lock:
+            return {'histograms': self.histograms}
+
+    def __setstate__(self, state):
+        self.histograms = state['histograms']
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def record(self, api, length, max_cost, duration):
+        """
+        Count one call.
+
+        Args:
+            api (str): name of the method called
+            length (int): length of its input text
+            max_cost (int): fuzzy distance of the call, 0 for exact matching
+            duration (int): nanoseconds spent in the call
+        """
+        key = (api, 'fuzzy' if max_cost else 'exact', length.bit_length())
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(duration)
+
+    def timed(self, api, method, max_cost_arg=None):
+        """
+        Wrap a method so that its calls are recorded under `api`.
+
+        Args:
+            api (str): name recorded for the calls
+            method (callable): bound method taking the input text as first argument
+            max_cost_arg (int): position of `max_cost` among the positional arguments
+                following the text, None if the method has no fuzzy mode
+
+        Returns:
+            callable: the wrapped method
+        """
+        local = self._local
+        record = self.record
+
+        def timed_method(text, *args, **kwargs):
+            if getattr(local, 'busy', False):
+                return method(text, *args, **kwargs)
+            local.busy = True
+            start = perf_counter_ns()
+            try:
+                return method(text, *args, **kwargs)
+            finally:
+                duration = perf_counter_ns() - start
+                local.busy = False
+                max_cost = 0
+                if max_cost_arg is not None:
+                    max_cost = args[max_cost_arg] if len(args) > max_cost_arg else kwargs.get('max_cost', 0)
+                record(api, len(text) if isinstance(text, str) else 0, max_cost, duration)
+        timed_method.__name__ = api
+        timed_method.__doc__ = method.__doc__
+        return timed_method
+
+    def merge(self, other):
+        """
+        Add the histograms of another recorder, e.g. one per worker process.
+
+        Args:
+            other (LatencyRecorder): recorder to add, unchanged
+        """
+        # copied first: holding both locks could deadlock two recorders merging each other
+        with other._lock:
+            others = [(key, LatencyHistogram.from_dict(histogram.to_dict()))
+                      for key, histogram in other.histograms.items()]
+        with self._lock:
+            for key, histogram in others:
+                mine = self.histograms.get(key)
+                if mine is None:
+                    mine = self.histograms[key] = LatencyHistogram()
+                mine.merge(histogram)
+
+    def report(self, percentiles=DEFAULT_PERCENTILES):
+        """
+        Percentiles per API, overall, by mode and by input length.
+
+        Args:
+            percentiles (iterable of float): percentiles to report
+
+        Returns:
+            dict: api -> summary (see `LatencyHistogram.summary`, in microseconds) with
+                'by_mode' ('exact'/'fuzzy' -> summary) and 'by_length' ('<N' characters -> summary)
+        """
+        grouped = {}
+        with self._lock:
+            for (api, mode, length_bucket), histogram in self.histograms.items():
+                groups = grouped.setdefault(api, (LatencyHistogram(), {}, {}))
+                groups[0].merge(histogram)
+                groups[1].setdefault(mode, LatencyHistogram()).merge(histogram)
+                groups[2].setdefault(length_bucket, LatencyHistogram()).merge(histogram)
+        report = {}
+        for api, (overall, by_mode, by_length) in sorted(grouped.items()):
+            summary = overall.summary(percentiles)
+            summary['by_mode'] = {mode: histogram.summary(percentiles) for mode, histogram in sorted(by_mode.items())}
+            summary['by_length'] = {'<{}'.format(1 << length_bucket): histogram.summary(percentiles)
+                                    for length_bucket, histogram in sorted(by_length.items())}
+            report[api] = summary
+        return report
+
+    def to_dict(self):
+        """Plain dict of all histograms, JSON serializable, see `from_dict`."""
+        with self._lock:
+            return {'{}|{}|{}'.format(*key): histogram.to_dict() for key, histogram in self.histograms.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Recorder from the output of `to_dict`."""
+        recorder = cls()
+        for key, histogram in data.items():
+            api, mode, length_bucket = key.split('|')
+            recorder.histograms[(api, mode, int(length_bucket))] = LatencyHistogram.from_dict(histogram)
+        return recorder
+
+    def reset(self):
+        """Drop all recorded calls."""
+        with self._lock:
+            self.histograms = {}
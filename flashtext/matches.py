@@ -0,0 +1,174 @@
+from array import array
+
+
+class MatchArray(object):
+    """Compact, columnar result of `extract_keywords(..., as_array=True)`.
+
+    Matches are stored in three parallel `array('l')` columns (clean name id,
+    start, end) plus a table of the distinct clean names, instead of one tuple
+    and three objects per hit. Indexing and iteration build
+    `(clean_name, start, end)` tuples on demand, so a MatchArray can be used
+    wherever the list returned with `span_info=True` is.
+
+    Attributes:
+        ids (array): clean name id of every match, an index into `names`
+        starts (array): start offset of every match
+        ends (array): end offset of every match
+        names (list): distinct clean names
+
+    Examples:
+        >>> matches = keyword_processor.extract_keywords('I love Big Apple and Bay Area.', as_array=True)
+        >>> matches[0]
+        >>> ('New York', 7, 16)
+        >>> list(matches.ends)
+        >>> [16, 29]
+    """
+
+    def __init__(self):
+        self.ids = array('l')
+        self.starts = array('l')
+        self.ends = array('l')
+        self.names = []
+        # clean name -> id, for names added by `append`
+        self._name_ids = {}
+
+    def append(self, name, start, end):
+        """
+        Add a match, interning its clean name.
+
+        Args:
+            name (str): clean name of the keyword
+            start (int): start offset of the match
+            end (int): end offset of the match
+        """
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        self.ids.append(name_id)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    @classmethod
+    def from_tuples(cls, matches):
+        """
+        Build a MatchArray from `(clean_name, start, end)` tuples.
+
+        Args:
+            matches (iterable): `(clean_name, start, end)` tuples
+
+        Returns:
+            MatchArray: the same matches, in the same order
+        """
+        match_array = cls()
+        append = match_array.append
+        for name, start, end in matches:
+            append(name, start, end)
+        return match_array
+
+    @classmethod
+    def from_columns(cls, clean_names, starts, ends):
+        """
+        Build a MatchArray from the clean name of every match and two offset arrays.
+
+        Args:
+            clean_names (list): clean name of every match
+            starts (array): start offsets, used as is
+            ends (array): end offsets, used as is
+
+        Returns:
+            MatchArray: the matches, with clean names interned
+        """
+        match_array = cls()
+        name_ids = match_array._name_ids
+        match_array.ids = array('l', [name_ids.setdefault(name, len(name_ids)) for name in clean_names])
+        match_array.names = list(name_ids)
+        match_array.starts = starts
+        match_array.ends = ends
+        return match_array
+
+    @classmethod
+    def from_ids(cls, ids, starts, ends, names):
+        """
+        Build a MatchArray over an existing table, e.g. the payload table of a KeywordProcessor.
+
+        Args:
+            ids (iterable of int): index into `names` of every match
+            starts (iterable of int): start offsets
+            ends (iterable of int): end offsets
+            names (list): table the ids refer to, shared and not copied
+
+        Returns:
+            MatchArray: the matches
+        """
+        match_array = cls()
+        match_array.ids = ids if isinstance(ids, array) else array('l', ids)
+        match_array.starts = starts if isinstance(starts, array) else array('l', starts)
+        match_array.ends = ends if isinstance(ends, array) else array('l', ends)
+        match_array.names = names
+        return match_array
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        return self.names[self.ids[index]], self.starts[index], self.ends[index]
+
+    def __iter__(self):
+        names = self.names
+        for name_id, start, end in zip(self.ids, self.starts, self.ends):
+            yield names[name_id], start, end
+
+    def __eq__(self, other):
+        if isinstance(other, MatchArray):
+            return (self.starts == other.starts and self.ends == other.ends
+                    and [self.names[i] for i in self.ids] == [other.names[i] for i in other.ids])
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self):
+        return 'MatchArray({!r})'.format(self.to_list())
+
+    def to_list(self):
+        """
+        Matches as the list of `(clean_name, start, end)` tuples returned with `span_info=True`.
+
+        Returns:
+            list(tuple): the matches
+        """
+        return list(self)
+
+    def clean_names(self):
+        """
+        Clean name of every match, as returned without `span_info`.
+
+        Returns:
+            list: the clean names
+        """
+        names = self.names
+        return [names[name_id] for name_id in self.ids]
+
+    def to_numpy(self):
+        """
+        Columns as NumPy arrays, without copying the offsets element by element.
+
+        Returns:
+            ids, starts, ends (tuple): three int arrays
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("MatchArray.to_numpy requires numpy")
+        return tuple(numpy.frombuffer(column, dtype=column.typecode) if len(column) else
+                     numpy.zeros(0, dtype=column.typecode)
+                     for column in (self.ids, self.starts, self.ends))
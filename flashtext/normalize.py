@@ -0,0 +1,204 @@
+import io
+import os
+import unicodedata
+from array import array
+
+
+def load_variant_table(variant_file, encoding="utf-8"):
+    """
+    Load a character variant table, e.g. Traditional/Simplified Chinese pairs.
+
+    Each line lists equivalent characters separated by white space. The first
+    one is the canonical form, the others fold onto it. Empty lines and lines
+    starting with '#' are skipped. This reads OpenCC style tables such as
+    `STCharacters.txt` (simplified, then its traditional variants).
+
+    Args:
+        variant_file (str): path to the table
+        encoding (str): encoding of the file
+
+    Returns:
+        dict: variant char -> canonical char
+
+    Examples:
+        >>> # variants.txt content
+        >>> # 诗 詩
+        >>> # 发 發 髮
+        >>> load_variant_table('variants.txt')
+        >>> {'詩': '诗', '發': '发', '髮': '发'}
+
+    Raises:
+        IOError: If `variant_file` path is not valid
+        ValueError: If an entry is not a single character
+    """
+    if not os.path.isfile(variant_file):
+        raise IOError("Invalid file path {}".format(variant_file))
+    variants = {}
+    with io.open(variant_file, encoding=encoding) as f:
+        for line_number, line in enumerate(f, 1):
+            chars = line.split()
+            if not chars or chars[0].startswith('#'):
+                continue
+            for char in chars:
+                if len(char) != 1:
+                    raise ValueError("Line {}: {!r} is not a single character".format(line_number, char))
+            canonical = chars[0]
+            for char in chars[1:]:
+                if char != canonical:
+                    variants[char] = canonical
+    return variants
+
+
+class Normalizer(object):
+    """Offset-preserving Unicode normalization.
+
+    Text is normalized character by character through a table that is filled
+    lazily (one `unicodedata.normalize` call per distinct character). When every
+    character of a text maps to exactly one character, the text is normalized
+    with a single `str.translate` call and positions are unchanged. Otherwise
+    the text is rebuilt cluster by cluster (a character and the combining marks
+    that follow it), and an offset map records, for every normalized character,
+    the position of the original cluster it comes from.
+
+    A character fold (variant char -> canonical char, see `load_variant_table`)
+    is applied after the normalization form. It maps one character to one
+    character, so it never needs an offset map by itself.
+
+    Attributes:
+        form (str): Unicode normalization form ('NFKC', 'NFC', ...), or None.
+        fold (dict): variant char -> canonical char, or None.
+    """
+
+    # character kinds
+    _SAME = 0
+    _ONE_TO_ONE = 1
+    _COMPLEX = 2
+
+    def __init__(self, form='NFKC', fold=None):
+        """
+        Args:
+            form (str): Unicode normalization form, one of 'NFC', 'NFKC', 'NFD', 'NFKD'.
+                None keeps characters as they are.
+            fold (dict): variant char -> canonical char, applied after `form`.
+        """
+        if form is not None and form not in ('NFC', 'NFKC', 'NFD', 'NFKD'):
+            raise ValueError("Unknown normalization form {}".format(form))
+        if fold:
+            for variant, canonical in fold.items():
+                if len(variant) != 1 or len(canonical) != 1:
+                    raise ValueError("Variant {!r} -> {!r} is not one character to one character".format(
+                        variant, canonical))
+        self.form = form
+        self.fold = dict(fold) if fold else None
+        # char -> kind
+        self._kinds = {}
+        # ord(char) -> replacement, for chars that change
+        self._table = {}
+
+    def _map_char(self, char):
+        """Replacement string for a single character."""
+        return self._normalize_cluster(char)
+
+    def _classify(self, text):
+        """Fill the tables for the characters of `text`; return the highest kind met."""
+        kinds = self._kinds
+        missing = set(text).difference(kinds)
+        for char in missing:
+            mapped = self._map_char(char)
+            if mapped == char and not unicodedata.combining(char):
+                kind = self._SAME
+            elif len(mapped) == 1 and not unicodedata.combining(mapped):
+                kind = self._ONE_TO_ONE
+                self._table[ord(char)] = mapped
+            else:
+                kind = self._COMPLEX
+                self._table[ord(char)] = mapped
+            kinds[char] = kind
+        return max(map(kinds.__getitem__, set(text)))
+
+    def _normalize_cluster(self, cluster):
+        if self.form is not None:
+            cluster = unicodedata.normalize(self.form, cluster)
+        fold = self.fold
+        if fold is not None:
+            cluster = ''.join([fold.get(char, char) for char in cluster])
+        return cluster
+
+    def normalize(self, text):
+        """
+        Normalize a text, keeping track of where every normalized character came from.
+
+        Args:
+            text (str): text to normalize
+
+        Returns:
+            normalized, offsets (tuple): the normalized text, and None if every
+                position is unchanged, or else an array where `offsets[i]` is the
+                position in `text` of normalized character `i`, followed by
+                `len(text)`.
+        """
+        if not text:
+            return text, None
+        kind = self._classify(text)
+        if kind == self._SAME:
+            return text, None
+        if kind == self._ONE_TO_ONE:
+            return text.translate(self._table), None
+        kinds = self._kinds
+        pieces = []
+        offsets = array('l')
+        text_len = len(text)
+        idx = 0
+        while idx < text_len:
+            idy = idx + 1
+            while idy < text_len and kinds[text[idy]] == self._COMPLEX and self._starts_with_combining(text[idy]):
+                idy += 1
+            if idy - idx == 1:
+                char = text[idx]
+                piece = self._table.get(ord(char), char) if kinds[char] else char
+            else:
+                piece = self._normalize_cluster(text[idx:idy])
+            pieces.append(piece)
+            offsets.extend([idx] * len(piece))
+            idx = idy
+        offsets.append(text_len)
+        return ''.join(pieces), offsets
+
+    def _starts_with_combining(self, char):
+        mapped = self._table.get(ord(char), char)
+        return bool(mapped) and unicodedata.combining(mapped[0]) != 0
+
+    def normalize_keyword(self, keyword):
+        """
+        Normalize a keyword, dropping the offsets.
+
+        Args:
+            keyword (str): keyword to normalize
+
+        Returns:
+            str: the normalized keyword
+        """
+        return self.normalize(keyword)[0]
+
+
+def map_span(offsets, start, end):
+    """
+    Map a span of a normalized text back to the original text.
+
+    Args:
+        offsets (array): offset map returned by `Normalizer.normalize`
+        start (int): start of the span in the normalized text
+        end (int): end of the span in the normalized text (exclusive)
+
+    Returns:
+        start, end (tuple): the span in the original text, covering every
+            character the normalized span was produced from
+    """
+    original_start = offsets[start]
+    if end <= start:
+        return original_start, original_start
+    last = offsets[end - 1]
+    # a span ending inside the expansion of one character still covers all of it
+    while offsets[end] == last:
+        end += 1
+    return original_start, offsets[end]
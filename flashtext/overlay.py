@@ -0,0 +1,115 @@
+from .keyword import KeywordProcessor
+from .boundaries import WordCharSet
+
+
+class LayeredTable(object):
+    """Table whose first entries are those of a read-only base table.
+
+    Ids below the length of the base at creation refer to the base, later ids to
+    entries appended here, so an overlay keeps the payload ids of its base
+    without copying the base table. Only the entries appended here can be replaced.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self._base_len = len(base)
+        self._own = []
+
+    def __len__(self):
+        return self._base_len + len(self._own)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < self._base_len:
+            return self.base[index]
+        return self._own[index - self._base_len]
+
+    def __iter__(self):
+        for index in range(self._base_len):
+            yield self.base[index]
+        yield from self._own
+
+    def __setitem__(self, index, value):
+        if index < self._base_len:
+            raise IndexError("entries of the base table are read-only")
+        self._own[index - self._base_len] = value
+
+    def append(self, value):
+        self._own.append(value)
+
+
+class OverlayKeywordProcessor(KeywordProcessor):
+    """KeywordProcessor layered over a read-only base processor.
+
+    The overlay trie shares every subtree of the base trie that it does not
+    change. Adding or removing a keyword copies only the nodes on its path
+    (a removal of a base keyword acts as a tombstone), so the memory of an
+    overlay is its root plus the changed paths, and a scan walks one ordinary
+    trie: longest match, categories and spans behave exactly as on a merged
+    processor, with no per-character overhead.
+
+    The base processor must not be modified once overlays are built on it.
+    The fuzzy index of the base is not shared: fuzzy lookups on an overlay
+    search the trie.
+
+    Attributes:
+        base (KeywordProcessor): the shared processor
+
+    Examples:
+        >>> base = KeywordProcessor()
+        >>> base.add_keywords_from_list(['Python', 'Java'])
+        >>> tenant = OverlayKeywordProcessor(base)
+        >>> tenant.add_keyword('Rust')
+        >>> tenant.remove_keyword('Java')
+        >>> tenant.extract_keywords('Python, Java and Rust')
+        >>> ['Python', 'Rust']
+        >>> base.extract_keywords('Python, Java and Rust')
+        >>> ['Python', 'Java']
+    """
+
+    def __init__(self, base):
+        """
+        Args:
+            base (KeywordProcessor): processor holding the shared keywords. Its
+                settings (case sensitivity, boundaries, normalization) are used.
+        """
+        fuzzy_cache = base._fuzzy_cache
+        KeywordProcessor.__init__(self, case_sensitive=base.case_sensitive,
+                                  fuzzy_cache_size=fuzzy_cache.maxsize if fuzzy_cache is not None else 0,
+                                  fuzzy_budget=base.fuzzy_budget, unicode_boundaries=base.unicode_boundaries)
+        self.base = base
+        self._keyword = base._keyword
+        self._white_space_chars = set(base._white_space_chars)
+        self._non_word_boundaries = WordCharSet(base._non_word_boundaries)
+        self.normalizer = base.normalizer
+        self.keyword_trie_dict = dict(base.keyword_trie_dict)
+        # ids of the trie nodes private to this overlay, the others belong to the base
+        self._owned = {id(self.keyword_trie_dict)}
+        self._payloads = LayeredTable(base._payloads)
+        self._payload_masks = LayeredTable(base._payload_masks)
+        self._payload_floor = len(self._payloads)
+        self._category_bits = dict(base._category_bits)
+        self._keyword_chars = set(base._keyword_chars)
+        self._multi_label = base._multi_label
+        self._terms_in_trie = len(base)
+
+    def owned_nodes(self):
+        """Number of trie nodes private to this overlay, a measure of its memory on top of the base.
+
+        Returns:
+            count : int
+                Copied and added nodes still referenced by the overlay trie, root included
+        """
+        owned = self._owned
+        count = 0
+        stack = [self.keyword_trie_dict]
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if id(node) in seen or id(node) not in owned:
+                continue
+            seen.add(id(node))
+            count += 1
+            stack.extend(child for key, child in node.items() if key != self._keyword)
+        return count
@@ -1,4 +1,5 @@
 import collections
+import sys
 
 def add_keyword_to_trie(trie_dict, keyword, clean_name, case_sensitive, keyword_key='_keyword_'):
     """
@@ -7,7 +8,8 @@ def add_keyword_to_trie(trie_dict, keyword, clean_name, case_sensitive, keyword_
     Args:
         trie_dict (dict): The trie dictionary structure.
         keyword (str): key to add.
-        clean_name (str): clean name to map to.
+        clean_name (str or int): value stored at the leaf, e.g. a clean name or a payload id.
+            None or an empty string/list stores the keyword itself.
         case_sensitive (bool): if True, use exact case; otherwise, use mixed case support.
         keyword_key (str): key used to store the clean name at the leaf.
     
@@ -15,10 +17,10 @@ def add_keyword_to_trie(trie_dict, keyword, clean_name, case_sensitive, keyword_
         bool: True if a new term was added (didn't exist before), False otherwise.
     """
     status = False
-    if not clean_name and keyword:
+    if clean_name is None or (not clean_name and isinstance(clean_name, (str, list))):
         clean_name = keyword
 
-    if keyword and clean_name:
+    if keyword:
         current_dict = trie_dict
         for char in keyword:
             if case_sensitive:
@@ -60,52 +62,121 @@ def remove_keyword_from_trie(trie_dict, keyword, keyword_key='_keyword_'):
     Returns:
         bool: True if the keyword was removed, False if not found.
     """
-    status = False
-    if keyword:
-        # Note: We do NOT lower the keyword even if case_sensitive is False.
-        # Because the Trie now contains edges for both cases.
-        current_dict = trie_dict
-        character_trie_list = []
-        for letter in keyword:
-            if letter in current_dict:
-                character_trie_list.append((letter, current_dict))
-                current_dict = current_dict[letter] # This is safe
-            else:
-                # if character is not found, break out of the loop
-                current_dict = None
-                break
-        # remove the characters from trie dict if there are no other keywords with them
-        if current_dict and keyword_key in current_dict:
-            # we found a complete match for input keyword.
-            character_trie_list.append((keyword_key, current_dict))
-            character_trie_list.reverse()
-
-            for key_to_remove, dict_pointer in character_trie_list:
-                if len(dict_pointer.keys()) == 1:
-                    dict_pointer.pop(key_to_remove)
-                else:
-                    # more than one key means more than 1 path.
-                    # Delete not required path and keep the other
-                    
-                    # Check for multi-edge (mixed case) redundancy
-                    # If we are removing 'a', check if 'A' points to the same object
-                    if isinstance(key_to_remove, str): # Verify it's not _keyword_
-                        lower = key_to_remove.lower()
-                        upper = key_to_remove.upper()
-                        other_key = upper if key_to_remove == lower else lower
-                        
-                        if other_key != key_to_remove and other_key in dict_pointer and key_to_remove in dict_pointer:
-                            if dict_pointer[other_key] is dict_pointer[key_to_remove]:
-                                dict_pointer.pop(other_key)
-
-                    dict_pointer.pop(key_to_remove)
-                    # After popping, check if dict became empty? 
-                    if len(dict_pointer) == 0:
-                         continue # Continue bubbling up
-                    break
-            # successfully removed keyword
-            status = True
-    return status
+    if not keyword:
+        return False
+    # Note: We do NOT lower the keyword even if case_sensitive is False.
+    # Because the Trie now contains edges for both cases.
+    path = [trie_dict]
+    current_dict = trie_dict
+    for letter in keyword:
+        current_dict = current_dict.get(letter)
+        if current_dict is None:
+            return False
+        path.append(current_dict)
+    if keyword_key not in current_dict:
+        return False
+    del current_dict[keyword_key]
+    # remove the nodes left without keywords, bottom-up
+    for depth in range(len(path) - 1, 0, -1):
+        if path[depth]:
+            break
+        _detach_child(path[depth - 1], path[depth])
+    return True
+
+
+def _detach_child(parent, child):
+    """
+    Remove every edge of `parent` leading to `child`. In a mixed case trie one
+    node has several edges ('a'/'A', but also 'σ'/'ς'/'Σ'), so they are found
+    by identity rather than by recomputing the case variants of one character.
+    """
+    for key in [key for key, node in parent.items() if node is child]:
+        del parent[key]
+
+
+def trie_statistics(trie_dict, keyword_key='_keyword_'):
+    """
+    Shape of a trie: node and edge counts, depth and fan-out distributions and
+    a shallow size estimate.
+
+    The walk is iterative (breadth first) and visits nodes shared by the mixed
+    case edges only once, so it runs in linear time on tries of millions of nodes.
+
+    Args:
+        trie_dict (dict): The root trie dictionary.
+        keyword_key (str): key used to store the clean name at the leaf.
+
+    Returns:
+        dict: nodes (distinct nodes, root included), edges (character edges),
+            shared_edges (edges to a node already reached by another edge, i.e. the
+            upper/lower case links: edges - (nodes - 1)), keywords (nodes holding a
+            keyword), max_depth, depth (list, nodes per depth), fanout (dict, number of
+            edges -> nodes), node_bytes (`sys.getsizeof` of the node dicts) and
+            key_bytes (size of the distinct edge key strings)
+    """
+    seen = {id(trie_dict)}
+    keys = set()
+    edges = keywords = node_bytes = 0
+    depth_counts = []
+    fanouts = []
+    getsizeof = sys.getsizeof
+    level = [trie_dict]
+    while level:
+        depth_counts.append(len(level))
+        next_level = []
+        for node in level:
+            node_bytes += getsizeof(node)
+            fanout = len(node)
+            if keyword_key in node:
+                keywords += 1
+                fanout -= 1
+            fanouts.append(fanout)
+            edges += fanout
+            keys.update(node)
+            for key, child in node.items():
+                if key != keyword_key and id(child) not in seen:
+                    seen.add(id(child))
+                    next_level.append(child)
+        level = next_level
+    keys.discard(keyword_key)
+    return {
+        'nodes': len(seen),
+        'edges': edges,
+        'shared_edges': edges - (len(seen) - 1),
+        'keywords': keywords,
+        'max_depth': len(depth_counts) - 1,
+        'depth': depth_counts,
+        'fanout': dict(sorted(collections.Counter(fanouts).items())),
+        'node_bytes': node_bytes,
+        'key_bytes': sum(map(getsizeof, keys)),
+    }
+
+
+def leaf_values(trie_dict, keyword_key='_keyword_'):
+    """
+    Values stored at the leaves of a trie (e.g. the payload ids in use).
+
+    The walk is iterative and visits nodes shared by the mixed case edges only once.
+
+    Args:
+        trie_dict (dict): The root trie dictionary.
+        keyword_key (str): key used to store the clean name at the leaf.
+
+    Returns:
+        set: the distinct leaf values, which must be hashable
+    """
+    values = set()
+    seen = {id(trie_dict)}
+    stack = [trie_dict]
+    while stack:
+        for key, child in stack.pop().items():
+            if key == keyword_key:
+                values.add(child)
+            elif id(child) not in seen:
+                seen.add(id(child))
+                stack.append(child)
+    return values
+
 
 def get_all_keywords(trie_dict, term_so_far='', current_dict=None, keyword_key='_keyword_'):
     """
@@ -152,3 +223,269 @@ def get_all_keywords(trie_dict, term_so_far='', current_dict=None, keyword_key='
         for key in sub_values:
             terms_present[key] = sub_values[key]
     return terms_present
+
+
+def _is_stop_node(node, stop_keys):
+    return not stop_keys.isdisjoint(node.keys())
+
+
+def _compute_node_meta(node, node_meta, stop_keys, keyword_key):
+    """
+    Meta of one node from the meta of its children.
+    Returns None if a child has no meta (nothing can be assumed then).
+    """
+    is_stop = _is_stop_node(node, stop_keys)
+    min_stop = 0 if is_stop else None
+    max_stop = 0 if is_stop else None
+    seen = set()
+    for key, child in node.items():
+        if key == keyword_key or id(child) in seen:
+            continue
+        seen.add(id(child))
+        child_meta = node_meta.get(id(child))
+        if child_meta is None:
+            return None
+        child_min, child_max = child_meta
+        if min_stop is None or child_min + 1 < min_stop:
+            min_stop = child_min + 1
+        if max_stop is None or child_max + 1 > max_stop:
+            max_stop = child_max + 1
+    if min_stop is None:
+        # dangling node without any keyword below it
+        return None
+    return min_stop, max_stop
+
+
+def build_node_meta(trie_dict, white_space_chars, keyword_key='_keyword_'):
+    """
+    Compute, for every node of the trie, the window of remaining lengths to the
+    nodes where a fuzzy match may stop: nodes holding a keyword, or nodes with
+    an outgoing white space edge (a word boundary inside a keyword).
+
+    The walk is iterative (post-order) and visits nodes shared by the mixed case
+    edges only once.
+
+    Args:
+        trie_dict (dict): The root trie dictionary.
+        white_space_chars (set): characters treated as word boundaries by fuzzy search.
+        keyword_key (str): key used to store the clean name at the leaf.
+
+    Returns:
+        dict: id(node) -> (min_stop, max_stop)
+    """
+    node_meta = {}
+    stop_keys = set(white_space_chars) | {keyword_key}
+    stack = [(trie_dict, False)]
+    visited = set()
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            meta = _compute_node_meta(node, node_meta, stop_keys, keyword_key)
+            if meta is not None:
+                node_meta[id(node)] = meta
+            continue
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        stack.append((node, True))
+        for key, child in node.items():
+            if key != keyword_key and isinstance(child, dict) and id(child) not in visited:
+                stack.append((child, False))
+    return node_meta
+
+
+def update_node_meta(node_meta, trie_dict, keyword, white_space_chars, keyword_key='_keyword_', old_path=None):
+    """
+    Refresh the node meta along the path of `keyword` after it was added to or
+    removed from the trie. Nodes are recomputed bottom-up from their children and
+    the walk stops as soon as a node's meta is unchanged.
+
+    Args:
+        node_meta (dict): table built by `build_node_meta`, updated in place.
+        trie_dict (dict): The root trie dictionary.
+        keyword (str): keyword that was added or removed.
+        white_space_chars (set): characters treated as word boundaries by fuzzy search.
+        keyword_key (str): key used to store the clean name at the leaf.
+        old_path (list(dict)): for a removal, `keyword_path` taken before the keyword
+            was removed; nodes no longer on the path are dropped from the table.
+    """
+    path = keyword_path(trie_dict, keyword)
+    if old_path is not None:
+        still_attached = set(id(node) for node in path)
+        for node in old_path:
+            if id(node) not in still_attached:
+                node_meta.pop(id(node), None)
+    stop_keys = set(white_space_chars) | {keyword_key}
+    for node in reversed(path):
+        meta = _compute_node_meta(node, node_meta, stop_keys, keyword_key)
+        if meta == node_meta.get(id(node)):
+            break
+        if meta is None:
+            node_meta.pop(id(node), None)
+        else:
+            node_meta[id(node)] = meta
+
+
+def keyword_path(trie_dict, keyword):
+    """
+    Nodes visited when walking `keyword` from the root (root included).
+
+    Args:
+        trie_dict (dict): The root trie dictionary.
+        keyword (str): keyword to walk.
+
+    Returns:
+        list(dict): the nodes, stopping at the first missing edge.
+    """
+    path = [trie_dict]
+    current_dict = trie_dict
+    for char in keyword:
+        current_dict = current_dict.get(char)
+        if not isinstance(current_dict, dict):
+            break
+        path.append(current_dict)
+    return path
+
+
+def copy_trie_path(trie_dict, keyword, owned, case_sensitive=True, node_meta=None):
+    """
+    Replace the shared nodes on the path of `keyword` with private shallow copies.
+
+    Used by tries that share subtrees with another trie: after this call, adding
+    or removing `keyword` only modifies nodes listed in `owned`. Every edge of a
+    parent pointing to a copied node (both case edges of a mixed case trie) is
+    moved to the copy.
+
+    Args:
+        trie_dict (dict): The root trie dictionary, which must be owned.
+        keyword (str): keyword whose path is copied, up to the first missing edge.
+        owned (set): ids of the nodes private to this trie, updated in place.
+        case_sensitive (bool): follow the edges `add_keyword_to_trie` would use with
+            this setting; True follows the exact characters, as `remove_keyword_from_trie` does.
+        node_meta (dict): optional table from `build_node_meta`; the entry of every copied
+            node moves to its copy, so `update_node_meta` can be applied to the new path.
+
+    Returns:
+        int: number of nodes copied
+    """
+    copied = 0
+    current_dict = trie_dict
+    for char in keyword:
+        if case_sensitive:
+            next_node = current_dict.get(char)
+        else:
+            next_node = current_dict.get(char.lower()) or current_dict.get(char.upper())
+        if next_node is None:
+            break
+        if id(next_node) not in owned:
+            next_node = _copy_shared_child(current_dict, next_node, owned, node_meta)
+            copied += 1
+        current_dict = next_node
+    return copied
+
+
+def _copy_shared_child(parent, child, owned, node_meta=None):
+    """Replace `child` by a private shallow copy under every edge of `parent` leading to it."""
+    node_copy = dict(child)
+    for key, node in parent.items():
+        if node is child:
+            parent[key] = node_copy
+    owned.add(id(node_copy))
+    if node_meta is not None:
+        meta = node_meta.pop(id(child), None)
+        if meta is not None:
+            node_meta[id(node_copy)] = meta
+    return node_copy
+
+
+def apply_trie_operations(trie_dict, operations, keyword_key='_keyword_', owned=None, node_meta=None):
+    """
+    Apply many keyword changes in one traversal of the trie.
+
+    Operations must be sorted by keyword. The path of the previous keyword is
+    kept on a stack, so each keyword only walks the characters after the prefix
+    it shares with the previous one. Nodes left without keywords are detached
+    when the walk leaves them.
+
+    Args:
+        trie_dict (dict): The root trie dictionary.
+        operations (list): `(keyword, value, case_sensitive)` tuples sorted by keyword.
+            `value` is stored at the leaf (added like `add_keyword_to_trie` with
+            `case_sensitive`), None removes the keyword, and a callable maps the value
+            stored for a present keyword to its new value.
+        keyword_key (str): key used to store the clean name at the leaf.
+        owned (set): ids of the nodes that may be changed in place; other nodes are
+            copied first (see `copy_trie_path`). None changes every node in place.
+        node_meta (dict): optional table from `build_node_meta`; entries follow copied
+            nodes and are dropped for detached ones.
+
+    Returns:
+        list(bool): for every operation, True if a new keyword was stored, a keyword
+            was removed or a value was mapped; False if an existing keyword was
+            overwritten or the keyword to remove or map was not found.
+    """
+    statuses = []
+    nodes = [trie_dict]
+    path = ''
+    path_folded = None
+    for keyword, value, case_sensitive in operations:
+        storing = value is not None and not callable(value)
+        folded = storing and not case_sensitive
+        # keep the nodes of the prefix shared with the previous keyword, if walked the same way
+        common = 0
+        if folded == path_folded:
+            limit = min(len(path), len(keyword))
+            while common < limit and path[common] == keyword[common]:
+                common += 1
+        if len(nodes) > common + 1:
+            _unwind(nodes, common + 1, node_meta)
+        path_folded = folded
+        current_dict = nodes[-1]
+        for char in keyword[common:]:
+            if folded:
+                lower = char.lower()
+                upper = char.upper()
+                next_node = current_dict.get(lower) or current_dict.get(upper)
+            else:
+                next_node = current_dict.get(char)
+            if next_node is None:
+                if not storing:
+                    break
+                next_node = {}
+                if owned is not None:
+                    owned.add(id(next_node))
+            elif owned is not None and id(next_node) not in owned:
+                next_node = _copy_shared_child(current_dict, next_node, owned, node_meta)
+            if folded:
+                current_dict[lower] = next_node
+                current_dict[upper] = next_node
+            else:
+                current_dict[char] = next_node
+            nodes.append(next_node)
+            current_dict = next_node
+        path = keyword[:len(nodes) - 1]
+        if len(path) < len(keyword):
+            statuses.append(False)
+        elif storing:
+            statuses.append(keyword_key not in current_dict)
+            current_dict[keyword_key] = value
+        elif keyword_key not in current_dict:
+            statuses.append(False)
+        else:
+            if value is None:
+                del current_dict[keyword_key]
+            else:
+                current_dict[keyword_key] = value(current_dict[keyword_key])
+            statuses.append(True)
+    _unwind(nodes, 1, node_meta)
+    return statuses
+
+
+def _unwind(nodes, depth, node_meta=None):
+    """Pop `nodes` down to `depth` entries, detaching the popped nodes left empty."""
+    while len(nodes) > depth:
+        node = nodes.pop()
+        if not node:
+            _detach_child(nodes[-1], node)
+            if node_meta is not None:
+                node_meta.pop(id(node), None)
@@ -1,20 +1,46 @@
 import re
+import sys
+import threading
+from collections import OrderedDict
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from heapq import heappush, heappop
 
 _white_space_chars = set(['.', '\t', '\n', '\a', ' ', ','])
+# Scripts written without spaces: a character outside the word set is a word on its own.
+_cjk_char_pattern = re.compile(
+    '[\u4e00-\u9fff'   # CJK Unified
+    '\u3400-\u4dbf'    # CJK Ext A
+    '\u3040-\u309f'    # Hiragana
+    '\u30a0-\u30ff'    # Katakana
+    '\uac00-\ud7af]'   # Hangul Syllables
+)
 _keyword = '_keyword_' # Needed for stop criteria? 
 
 # We need to accept keyword_key as param for flexibility
-def levensthein(word, max_cost, start_node, white_space_chars=None, keyword_key='_keyword_'):
+def levensthein(word, max_cost, start_node, white_space_chars=None, keyword_key='_keyword_',
+                node_meta=None, counters=None, max_expansions=None):
     """
     Retrieve the nodes where there is a fuzzy match,
     via levenshtein distance, and with respect to max_cost
 
+    The trie is explored best-first: partial paths wait in a priority queue
+    ordered by the lowest cost they can still reach, so matches come out
+    cheapest first (ties in the order they were found).
+
     Args:
         word (str): word to find a fuzzy match for
         max_cost (int): maximum levenshtein distance when performing the fuzzy match
         start_node (dict): Trie node from which the search is performed
         white_space_chars (set): Characters considered whitespace/boundary for fuzzy stop criteria.
         keyword_key (str): Key used for leaf nodes.
+        node_meta (dict): Optional table from `trie_dict.build_node_meta`. Subtrees whose
+            stop nodes all lie outside the length window of `word` are not explored.
+        counters (dict): Optional counters; `nodes_expanded`, `nodes_pruned` and
+            `budget_exhausted` are incremented.
+        max_expansions (int): Optional cap on the number of trie nodes evaluated by
+            this lookup. Once reached the search yields the cheapest match already
+            found, if any, and gives up.
 
     Yields:
         node, cost, depth (tuple): A tuple containing the final node,
@@ -22,73 +48,424 @@ def levensthein(word, max_cost, start_node, white_space_chars=None, keyword_key=
     """
     if white_space_chars is None:
         white_space_chars = _white_space_chars
-        
-    rows = range(len(word) + 1)
+    stop_keys = white_space_chars | {keyword_key}
+    n_columns = len(word) + 1
+    expanded = 0
+    sequence = 0
+    # (priority, is_expansion, sequence, node, rows, depth)
+    queue = [(0, 1, 0, start_node, list(range(n_columns)), 0)]
 
-    for char, node in start_node.items():
-        yield from _levenshtein_rec(char, node, word, rows, max_cost, 1, white_space_chars, keyword_key)
+    while queue:
+        priority, is_expansion, _, node, rows, depth = heappop(queue)
+        if not is_expansion:
+            yield node, priority, depth
+            continue
+        if depth and node_meta is not None and _out_of_window(rows, node_meta.get(id(node)), max_cost):
+            if counters is not None:
+                counters['nodes_pruned'] += 1
+            continue
+        for char, child in node.items():
+            if not isinstance(child, dict):
+                continue
+            if max_expansions is not None and expanded >= max_expansions:
+                if counters is not None:
+                    counters['budget_exhausted'] += 1
+                # give up, but not on a match already found: the cheapest queued stop node
+                while queue:
+                    priority, is_expansion, _, node, _, depth = heappop(queue)
+                    if not is_expansion:
+                        yield node, priority, depth
+                        break
+                return
+            expanded += 1
+            if counters is not None:
+                counters['nodes_expanded'] += 1
+            new_rows = [rows[0] + 1]
+            for col in range(1, n_columns):
+                new_rows.append(min(
+                    new_rows[col - 1] + 1,
+                    rows[col] + 1,
+                    rows[col - 1] + (word[col - 1] != char),
+                ))
+            sequence += 1
+            if new_rows[-1] <= max_cost and not stop_keys.isdisjoint(child.keys()):
+                heappush(queue, (new_rows[-1], 0, sequence, child, None, depth + 1))
+            # keep looking below stop nodes too: a deeper match may be cheaper
+            lowest = min(new_rows)
+            if lowest <= max_cost:
+                heappush(queue, (lowest, 1, sequence, child, new_rows, depth + 1))
 
 
-def _levenshtein_rec(char, node, word, rows, max_cost, depth, white_space_chars, keyword_key):
-    n_columns = len(word) + 1
-    new_rows = [rows[0] + 1]
-    cost = 0
+def _out_of_window(rows, meta, max_cost):
+    """
+    True if no stop node below can end within max_cost: every column of the
+    current row, plus the length gap between the rest of the word and the
+    remaining depths (min_stop..max_stop), exceeds max_cost.
+    """
+    if meta is None:
+        return False
+    min_stop, max_stop = meta
+    n_columns = len(rows)
+    for col, cost in enumerate(rows):
+        remaining = n_columns - 1 - col
+        if remaining < min_stop:
+            cost += min_stop - remaining
+        elif remaining > max_stop:
+            cost += remaining - max_stop
+        if cost <= max_cost:
+            return False
+    return True
+
+
+def bounded_levenshtein(source, target, max_cost):
+    """
+    Levenshtein distance between two strings, with an early exit once
+    every alignment exceeds max_cost.
+
+    Args:
+        source (str): first string
+        target (str): second string
+        max_cost (int): largest distance we care about
+
+    Returns:
+        int: the distance, or max_cost + 1 if it is larger than max_cost
+    """
+    if abs(len(source) - len(target)) > max_cost:
+        return max_cost + 1
+    previous_row = list(range(len(target) + 1))
+    for row, source_char in enumerate(source, 1):
+        current_row = [row]
+        for col, target_char in enumerate(target, 1):
+            current_row.append(min(
+                current_row[col - 1] + 1,
+                previous_row[col] + 1,
+                previous_row[col - 1] + (source_char != target_char),
+            ))
+        if min(current_row) > max_cost:
+            return max_cost + 1
+        previous_row = current_row
+    return min(previous_row[-1], max_cost + 1)
+
+
+class LRUCache(object):
+    """
+    Bounded least-recently-used mapping with hit/miss counters.
+
+    Every operation holds a lock, so one cache can be shared by the threads
+    scanning with a processor and by a writer clearing it after an update
+    (see `KeywordProcessor.batch_update`).
+
+    Attributes:
+        maxsize (int): maximum number of entries kept
+        hits (int): number of successful lookups
+        misses (int): number of failed lookups
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Return the cached value for key (marking it recently used), or default."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self):
+        """Snapshot of the (key, value) entries, least recently used first."""
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        """Drop every entry. Counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+
+def deep_getsizeof(obj, seen=None):
+    """
+    Size in bytes of an object and of the objects it contains, each counted once.
+
+    Dicts, lists, tuples, sets and frozensets are followed; other objects count
+    for their own `sys.getsizeof`. The walk is iterative.
+
+    Args:
+        obj: object to measure
+        seen (set): ids of objects already counted, shared between calls so that
+            objects referenced from several places are counted once
+
+    Returns:
+        int: bytes
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+@lru_cache(maxsize=32)
+def compile_word_pattern(word_class):
+    """
+    Compile a regex matching a (possibly empty) run of word characters.
+
+    Args:
+        word_class (str): body of a regex character class matching word characters,
+            see `CharClassTable.word_class`
+
+    Returns:
+        re.Pattern: compiled word pattern
+    """
+    if not word_class:
+        return re.compile('')
+    return re.compile('[' + word_class + ']*')
+
+
+def scan_word_end(text, start, word_pattern):
+    """
+    End offset of the word starting at `start`, without copying the text.
+
+    The word is the run of word characters starting at `start`. If there is none
+    and `text[start]` is a CJK character, that character is a word by itself.
 
-    for col in range(1, n_columns):
-        insert_cost = new_rows[col - 1] + 1
-        delete_cost = rows[col] + 1
-        replace_cost = rows[col - 1] + int(word[col - 1] != char)
-        cost = min((insert_cost, delete_cost, replace_cost))
-        new_rows.append(cost)
+    Args:
+        text (str): text to scan
+        start (int): offset where the word starts
+        word_pattern (re.Pattern): pattern from `compile_word_pattern`
+
+    Returns:
+        int: offset just after the word (equal to `start` for an empty word)
+    """
+    end = word_pattern.match(text, start).end()
+    if end == start and _cjk_char_pattern.match(text, start):
+        return start + 1
+    return end
+
+
+@lru_cache(maxsize=32)
+def compile_token_pattern(word_class):
+    """
+    Compile a regex that splits text into tokens: runs of word characters,
+    or single non-space characters (CJK ideographs, punctuation, ...).
+
+    Args:
+        word_class (str): body of a regex character class matching word characters,
+            see `CharClassTable.word_class`
+
+    Returns:
+        re.Pattern: compiled token pattern
+    """
+    if not word_class:
+        return re.compile(r'\S')
+    return re.compile('[' + word_class + r']+|\S')
+
+
+DEFAULT_SENTENCE_DELIMITERS = ('.', '?', '!', ';', '\n', '。', '！', '？')
+
+
+@lru_cache(maxsize=32)
+def compile_delimiter_pattern(delimiters):
+    """
+    Regex matching a run of sentence delimiters, compiled once per delimiter tuple.
+
+    Args:
+        delimiters (tuple of str): Sentence delimiters
+
+    Returns:
+        pattern (re.Pattern): matches one or more consecutive delimiters, longest first.
+            Without (non-empty) delimiters it never matches: the text is one sentence.
+    """
+    ordered = sorted((d for d in delimiters if d), key=len, reverse=True)
+    if not ordered:
+        return re.compile('(?!)')
+    return re.compile('(?:' + '|'.join(re.escape(d) for d in ordered) + ')+')
+
+
+def sentence_ends(text, delimiters=None):
+    """
+    End offsets of the sentences of `text`. A sentence runs up to and including
+    the delimiters that close it; the last sentence ends with the text.
 
-    stop_crit = isinstance(node, dict) and node.keys() & (white_space_chars | {keyword_key})
-    if new_rows[-1] <= max_cost and stop_crit:
-        yield node, cost, depth
+    Args:
+        text (str): Input text
+        delimiters (list of str): Sentence delimiters. Default: DEFAULT_SENTENCE_DELIMITERS
 
-    elif isinstance(node, dict) and min(new_rows) <= max_cost:
-        for new_char, new_node in node.items():
-            yield from _levenshtein_rec(new_char, new_node, word, new_rows, max_cost, depth + 1, white_space_chars, keyword_key)
+    Returns:
+        list of int: sorted end offsets, the last one is `len(text)`
+    """
+    pattern = compile_delimiter_pattern(tuple(delimiters) if delimiters is not None else DEFAULT_SENTENCE_DELIMITERS)
+    ends = [match.end() for match in pattern.finditer(text)]
+    if not ends or ends[-1] != len(text):
+        ends.append(len(text))
+    return ends
 
 
-def extract_sentences_util(text, extract_keywords_func, delimiters=None):
+def extract_sentences_util(text, extract_keywords_func, delimiters=None, span_info=False, matches=None):
     """
     Extract sentences that contain keywords.
-    
+
+    Keywords are extracted in one pass over the whole text, and each match is
+    assigned to its sentence by bisecting the sentence end offsets. A delimiter
+    inside a match (e.g. keyword 'node.js') does not end a sentence: the
+    sentences it joins are returned as one.
+
     Args:
         text (str): Input text
-        extract_keywords_func (callable): Function to extract keywords from a sentence.
-        delimiters (list of str): Punctuation to split sentences. 
-                                  Default: ['.', '?', '!', ';', '\\n']
+        extract_keywords_func (callable): `extract_keywords(text, span_info=True)` of a KeywordProcessor.
+        delimiters (list of str): Punctuation to split sentences.
+                                  Default: ['.', '?', '!', ';', '\\n', '。', '！', '？']
+        span_info (bool): Return sentence offsets instead of sentence strings
+        matches (MatchArray or list): Matches of `text` already extracted with span info,
+            used instead of calling `extract_keywords_func`
     Returns:
         list of (str, list): [(sentence, [keywords]), ...]
+        or, with span_info, list of (int, int, list): [(start, end, [keywords]), ...]
+    """
+    if not text:
+        return []
+    if matches is None:
+        matches = extract_keywords_func(text, span_info=True)
+    groups = _iter_sentence_groups(text, sentence_ends(text, delimiters), matches)
+    if span_info:
+        return list(groups)
+    return [(text[start:end], keywords) for start, end, keywords in groups]
+
+
+def iter_sentences_util(text_or_chunks, extract_keywords_func, delimiters=None, skip_empty=True):
+    """
+    Stream the sentences of a text given whole or as an iterable of chunks.
+
+    Chunks are consumed one at a time. The complete sentences of the buffer are
+    scanned and yielded, and the unfinished tail (including a delimiter run that
+    may continue in the next chunk) is carried over, so memory is bounded by the
+    chunk size plus the longest sentence. A keyword containing a delimiter is
+    only matched if that delimiter is not the last one seen in a chunk.
+
+    Args:
+        text_or_chunks (str or iterable of str): Input text, or its successive chunks
+        extract_keywords_func (callable): `extract_keywords(text, span_info=True)` of a KeywordProcessor.
+        delimiters (list of str): Punctuation to split sentences. Default: DEFAULT_SENTENCE_DELIMITERS
+        skip_empty (bool): Skip sentences without keywords. Blank sentences are always skipped.
+
+    Yields:
+        start, end, keywords (tuple): offsets of the sentence in the whole input and its keywords
+    """
+    delimiters = tuple(delimiters) if delimiters is not None else DEFAULT_SENTENCE_DELIMITERS
+    if isinstance(text_or_chunks, str):
+        carry, chunks = text_or_chunks, ()
+    else:
+        carry, chunks = '', text_or_chunks
+    pattern = compile_delimiter_pattern(delimiters)
+    longest_delimiter = max(map(len, delimiters), default=1)
+    offset = 0
+    # delimiters can only be found from here on in the carried over text
+    search_from = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer = carry + chunk if carry else chunk
+        buffer_len = len(buffer)
+        ends = []
+        tail_start = None
+        for match in pattern.finditer(buffer, search_from):
+            if match.end() < buffer_len:
+                ends.append(match.end())
+            else:
+                # the run may go on in the next chunk
+                tail_start = match.start()
+        if not ends:
+            carry = buffer
+            search_from = tail_start if tail_start is not None else max(0, buffer_len - longest_delimiter + 1)
+            continue
+        cut = ends[-1]
+        segment = buffer[:cut]
+        for start, end, keywords in _iter_sentence_groups(segment, ends, extract_keywords_func(segment, span_info=True),
+                                                          skip_empty):
+            yield offset + start, offset + end, keywords
+        carry = buffer[cut:]
+        offset += cut
+        if tail_start is not None:
+            search_from = tail_start - cut
+        else:
+            search_from = max(0, len(carry) - longest_delimiter + 1)
+    if carry:
+        for start, end, keywords in _iter_sentence_groups(carry, sentence_ends(carry, delimiters),
+                                                          extract_keywords_func(carry, span_info=True), skip_empty):
+            yield offset + start, offset + end, keywords
+
+
+_non_space_pattern = re.compile(r'\S')
+
+
+def _iter_sentence_groups(text, ends, matches, skip_empty=True):
     """
-    if delimiters is None:
-        delimiters = ['.', '?', '!', ';', '\n']
-    
-    # Sort delimiters by length desc to ensure longest match first if they overlap
-    delimiters.sort(key=len, reverse=True)
-    
-    escaped_delimiters = [re.escape(d) for d in delimiters]
-    pattern = '|'.join(escaped_delimiters)
-    
-    # (pattern) captures the delimiter so we can attach it back
-    regex_pattern = '((?:' + pattern + ')+)'
-    
-    parts = re.split(regex_pattern, text)
-    
-    sentences_list = []
-    # parts structure: [content, delimiter, content, delimiter...]
-    for i in range(0, len(parts), 2):
-        sentence_content = parts[i]
-        delimiter = parts[i+1] if i + 1 < len(parts) else ""
-        full_sentence = sentence_content + delimiter
-        if full_sentence.strip(): 
-             sentences_list.append(full_sentence)
-             
-    results = []
-    for sent in sentences_list:
-        keywords = extract_keywords_func(sent)
-        if keywords:
-            results.append((sent, keywords))
-    
-    return results
+    Group the (keyword, start, end) `matches` of `text` and yield (start, end, keywords)
+    per sentence, sentences being delimited by the sorted `ends` offsets.
+    Sentences joined by a match are merged.
+    """
+    first = last = -1
+    keywords = None
+    for keyword, start, end in matches:
+        index = bisect_right(ends, start)
+        if index > last:
+            if keywords:
+                yield ends[first - 1] if first else 0, ends[last], keywords
+            if not skip_empty:
+                yield from _iter_blank_sentences(text, ends, last + 1, index)
+            first = last = index
+            keywords = []
+        if end > ends[last]:
+            last = bisect_left(ends, end)
+        keywords.append(keyword)
+    if keywords:
+        yield ends[first - 1] if first else 0, ends[last], keywords
+    if not skip_empty:
+        yield from _iter_blank_sentences(text, ends, last + 1, len(ends))
+
+
+def _iter_blank_sentences(text, ends, first, stop):
+    """Sentences `first` to `stop - 1` without keywords, skipping the ones made of white space."""
+    for index in range(first, stop):
+        start = ends[index - 1] if index else 0
+        if _non_space_pattern.search(text, start, ends[index]):
+            yield start, ends[index], []
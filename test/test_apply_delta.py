@@ -0,0 +1,155 @@
+from flashtext import KeywordProcessor, OverlayKeywordProcessor
+import logging
+import threading
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestApplyDelta(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.kp = KeywordProcessor()
+        self.kp.add_keyword('java')
+        self.kp.add_keyword('python')
+        self.kp.add_keyword('product management', categories=['skill'])
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_delta_file(self):
+        report = self.kp.apply_delta('test/keywords_delta.txt')
+        self.assertEqual({key: value for key, value in report.items() if key != 'seconds'},
+                         {'added': 3, 'updated': 0, 'removed': 1, 'renamed': 1, 'missing': 1})
+        self.assertGreaterEqual(report['seconds'], 0)
+        self.assertEqual(self.kp.get_all_keywords(), {
+            'java': 'java', 'java_2e': 'java', 'javascript': 'javascript',
+            'python 3': 'python', 'product management': 'product manager',
+        })
+        self.assertEqual(len(self.kp), 5)
+        self.assertEqual(self.kp.extract_keywords('Python 3 and python for Product Management'),
+                         ['python', 'product manager'])
+        # a rename keeps the categories of the keyword
+        self.assertEqual(self.kp.get_categories('product management'), {'skill'})
+
+    def test_same_trie_as_keyword_by_keyword(self):
+        delta = ['- java', '+ jav=>J', '+ JAVA=>Java', '+ Javelin', '- javelin', '- pyth', '+ pythonic']
+        expected = KeywordProcessor()
+        expected.add_keywords_from_list(['java', 'python', 'product management'])
+        expected.remove_keyword('java')
+        expected.add_keyword('jav', 'J')
+        expected.add_keyword('JAVA', 'Java')
+        expected.add_keyword('pythonic')
+        report = self.kp.apply_delta(delta)
+        self.assertEqual(report['missing'], 1)
+        self.assertEqual(self.kp.keyword_trie_dict.keys(), expected.keyword_trie_dict.keys())
+        self.assertEqual(self.kp.get_all_keywords(), expected.get_all_keywords())
+        self.assertEqual(len(self.kp), len(expected))
+
+    def test_operations_on_one_keyword_keep_their_order(self):
+        self.kp.apply_delta([('-', 'java'), ('+', 'java', 'JVM'), ('~', 'java', 'Java')])
+        self.assertEqual(self.kp['java'], 'Java')
+        self.kp.apply_delta([('+', 'java', 'JVM'), ('-', 'java')])
+        self.assertNotIn('java', self.kp)
+
+    def test_removals_compact_the_trie(self):
+        report = self.kp.apply_delta(['- java', '- python', '- product management'])
+        self.assertEqual(report['removed'], 3)
+        self.assertEqual(self.kp.keyword_trie_dict, {})
+        self.assertEqual(len(self.kp), 0)
+
+    def test_no_orphan_case_edges(self):
+        # σ, ς and Σ share one node: 'ς'.upper() is 'Σ', whose lower case is 'σ'
+        kp = KeywordProcessor()
+        kp.add_keyword('ςa')
+        kp.add_keyword('σb')
+        self.assertTrue(kp.remove_keyword('ςa'))
+        self.assertTrue(kp.remove_keyword('σb'))
+        self.assertEqual(kp.keyword_trie_dict, {})
+        kp.add_keywords_from_list(['ςa', 'σb'])
+        kp.apply_delta(['- ςa', '- σb'])
+        self.assertEqual(kp.keyword_trie_dict, {})
+
+    def test_fuzzy_index_and_meta_follow(self):
+        in_place = KeywordProcessor(fuzzy_index=1)
+        delta = KeywordProcessor(fuzzy_index=1)
+        for processor in (in_place, delta):
+            processor.add_keywords_from_list(['skype', 'skyline', 'java'])
+            processor.extract_keywords('skipe', max_cost=1)
+            processor.levensthein('skipe', max_cost=1)
+        in_place.remove_keyword('skyline')
+        in_place.add_keyword('skylight')
+        delta.apply_delta(['- skyline', '+ skylight'])
+        sentence = 'skylighd skypee skylinr jaba'
+        self.assertEqual(delta.extract_keywords(sentence, max_cost=1, indexed=True),
+                         in_place.extract_keywords(sentence, max_cost=1, indexed=True))
+        self.assertEqual(list(delta.levensthein('skylinr', max_cost=1)), [])
+        delta.fuzzy_index = in_place.fuzzy_index = None
+        self.assertEqual(delta.extract_keywords(sentence, max_cost=1), in_place.extract_keywords(sentence, max_cost=1))
+
+    def test_overlay(self):
+        tenant = OverlayKeywordProcessor(self.kp)
+        tenant.apply_delta(['- java', '+ rust'])
+        self.assertEqual(tenant.extract_keywords('java rust python'), ['rust', 'python'])
+        self.assertEqual(self.kp.extract_keywords('java rust python'), ['java', 'python'])
+
+    def test_normalized_keywords(self):
+        kp = KeywordProcessor(normalization='NFKC')
+        kp.apply_delta(['+ ＡＢＣ=>abc', '+ ｶﾞﾝﾀﾞﾑ'])
+        self.assertEqual(kp.extract_keywords('ABC ガンダム'), ['abc', 'ｶﾞﾝﾀﾞﾑ'])
+        kp.apply_delta(['- ABC'])
+        self.assertEqual(kp.extract_keywords('ABC ガンダム'), ['ｶﾞﾝﾀﾞﾑ'])
+
+    def test_published_as_new_version(self):
+        old_trie = self.kp.keyword_trie_dict
+        self.kp.apply_delta(['+ javascript', '- python', '~ java=>Java'])
+        self.assertEqual(self.kp.version, 1)
+        self.assertIsNot(self.kp.keyword_trie_dict, old_trie)
+        # the previous version is untouched
+        self.assertIn('p', old_trie)
+        self.assertNotIn('s', old_trie['j']['a']['v']['a'])
+        self.assertEqual(self.kp.extract_keywords('java javascript python'), ['Java', 'javascript'])
+        # later changes are made on the new version
+        self.kp.add_keyword('rust')
+        self.assertEqual(self.kp.extract_keywords('rust java'), ['rust', 'Java'])
+
+    def test_readers_see_whole_deltas(self):
+        sentence = ' '.join('alpha{0} beta{0}'.format(index) for index in range(30))
+        inconsistent = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                found = set(self.kp.extract_keywords(sentence))
+                for index in range(30):
+                    if ('alpha%d' % index in found) != ('beta%d' % index in found):
+                        inconsistent.append(found)
+                        return
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        try:
+            for index in range(30):
+                delta = ['+ alpha%d' % index, '+ beta%d' % index]
+                if index:
+                    delta += ['- alpha%d' % (index - 1), '- beta%d' % (index - 1)]
+                self.kp.apply_delta(delta)
+        finally:
+            done.set()
+            for reader in readers:
+                reader.join()
+        self.assertEqual(inconsistent, [])
+        self.assertEqual(self.kp.extract_keywords(sentence), ['alpha29', 'beta29'])
+
+    def test_errors(self):
+        with self.assertRaises(IOError):
+            self.kp.apply_delta('missing_delta.txt')
+        with self.assertRaisesRegex(ValueError, 'Line 2'):
+            self.kp.apply_delta(['+ rust', '* go'])
+        with self.assertRaises(ValueError):
+            self.kp.apply_delta(['~ java'])
+
+
+if __name__ == '__main__':
+    unittest.main()
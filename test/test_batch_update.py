@@ -0,0 +1,167 @@
+from flashtext import KeywordProcessor, OverlayKeywordProcessor
+import copy
+import logging
+import pickle
+import threading
+import time
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestBatchUpdate(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.kp = KeywordProcessor()
+        self.kp.add_keyword('Big Apple', 'New York')
+        self.kp.add_keyword('Bay Area')
+        self.kp.add_keyword('Java')
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_commit_publishes_new_version(self):
+        sentence = 'Java in the Big Apple and the Bay Area, Python in Big Sur'
+        old_trie = self.kp.keyword_trie_dict
+        with self.kp.batch_update() as batch:
+            batch.add_keyword('Big Sur', categories=['location'])
+            batch.add_keyword('python')
+            batch.remove_keyword('Bay Area')
+            # nothing is visible before the commit
+            self.assertEqual(self.kp.extract_keywords(sentence), ['Java', 'New York', 'Bay Area'])
+        self.assertEqual(self.kp.version, 1)
+        self.assertEqual(self.kp.extract_keywords(sentence), ['Java', 'New York', 'python', 'Big Sur'])
+        self.assertEqual(self.kp.extract_keywords(sentence, categories='location'), ['Big Sur'])
+        self.assertEqual(len(self.kp), 4)
+        # the previous version is untouched
+        self.assertIsNot(self.kp.keyword_trie_dict, old_trie)
+        self.assertIn('a', old_trie['b'])
+        self.assertNotIn('p', old_trie)
+
+    def test_only_changed_paths_are_copied(self):
+        old_trie = self.kp.keyword_trie_dict
+        batch = self.kp.batch_update()
+        batch.add_keyword('Bay Bridge')
+        self.assertEqual(batch.commit(), 1)
+        new_trie = self.kp.keyword_trie_dict
+        self.assertIs(new_trie['j'], old_trie['j'])
+        self.assertIsNot(new_trie['b'], old_trie['b'])
+        self.assertIs(new_trie['b'], new_trie['B'])
+        self.assertIs(new_trie['b']['i'], old_trie['b']['i'])
+        self.assertIs(new_trie['b']['a']['y'][' ']['a'], old_trie['b']['a']['y'][' ']['a'])
+
+    def test_failed_batch_is_dropped(self):
+        with self.assertRaises(ValueError):
+            with self.kp.batch_update() as batch:
+                batch.add_keyword('Python')
+                raise ValueError
+        self.assertEqual(self.kp.version, 0)
+        self.assertNotIn('Python', self.kp)
+
+    def test_same_result_as_in_place_updates(self):
+        in_place = KeywordProcessor(normalization='NFKC')
+        batched = KeywordProcessor(normalization='NFKC')
+        for processor in (in_place, batched):
+            processor.add_keywords_from_list(['skype', 'ＡＢＣ', 'skyline'])
+            # build the fuzzy node meta before the update
+            processor.extract_keywords('skipe', max_cost=1)
+        in_place.add_keyword('skylight')
+        in_place.remove_keyword('skyline')
+        in_place.remove_keyword('abc')
+        with batched.batch_update() as batch:
+            batch.add_keyword('skylight')
+            batch.remove_keyword('skyline')
+            batch.remove_keyword('abc')
+        self.assertEqual(batched.get_all_keywords(), in_place.get_all_keywords())
+        sentence = 'skylighd skypee skylinr ABC'
+        self.assertEqual(batched.extract_keywords(sentence, max_cost=1, span_info=True),
+                         in_place.extract_keywords(sentence, max_cost=1, span_info=True))
+        self.assertEqual(batched._node_meta[id(batched.keyword_trie_dict['s'])],
+                         in_place._node_meta[id(in_place.keyword_trie_dict['s'])])
+
+    def test_overlay_batch(self):
+        tenant = OverlayKeywordProcessor(self.kp)
+        tenant.add_keyword('Rust')
+        with tenant.batch_update() as batch:
+            batch.add_keyword('Javascript')
+            batch.remove_keyword('Rust')
+        self.assertEqual(tenant.extract_keywords('Java Javascript Rust'), ['Java', 'Javascript'])
+        self.assertEqual(self.kp.extract_keywords('Java Javascript Rust'), ['Java'])
+        # nodes of the batch belong to the overlay afterwards
+        tenant.add_keyword('Javadoc')
+        self.assertIs(tenant.keyword_trie_dict['j'], tenant.keyword_trie_dict['J'])
+
+    def test_readers_see_whole_batches(self):
+        sentence = ' '.join('alpha{0} beta{0}'.format(index) for index in range(30))
+        inconsistent = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                found = set(self.kp.extract_keywords(sentence))
+                for index in range(30):
+                    if ('alpha%d' % index in found) != ('beta%d' % index in found):
+                        inconsistent.append(found)
+                        return
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        try:
+            for index in range(30):
+                with self.kp.batch_update() as batch:
+                    batch.add_keyword('alpha%d' % index)
+                    batch.add_keyword('beta%d' % index)
+                    if index:
+                        batch.remove_keyword('alpha%d' % (index - 1))
+                        batch.remove_keyword('beta%d' % (index - 1))
+        finally:
+            done.set()
+            for reader in readers:
+                reader.join()
+        self.assertEqual(inconsistent, [])
+        self.assertEqual(self.kp.extract_keywords(sentence), ['alpha29', 'beta29'])
+
+    def test_single_changes_wait_for_batch(self):
+        class BlockingCategories(object):
+            """Categories whose iteration holds the batch until released."""
+            started = threading.Event()
+            release = threading.Event()
+
+            def __iter__(self):
+                self.started.set()
+                self.release.wait(5)
+                yield 'language'
+
+        categories = BlockingCategories()
+        batch = self.kp.batch_update()
+        batch.add_keyword('Python', categories=categories)
+        committer = threading.Thread(target=batch.commit)
+        committer.start()
+        self.assertTrue(categories.started.wait(5))
+        adder = threading.Thread(target=self.kp.add_keyword, args=('Rust',))
+        remover = threading.Thread(target=self.kp.remove_keyword, args=('Java',))
+        adder.start()
+        remover.start()
+        time.sleep(0.05)
+        categories.release.set()
+        for thread in (committer, adder, remover):
+            thread.join()
+        self.assertEqual(self.kp.version, 1)
+        self.assertEqual(self.kp.extract_keywords('Python, Rust and Java'), ['Python', 'Rust'])
+        self.assertEqual(len(self.kp), 4)
+
+    def test_pickle_and_deepcopy(self):
+        with self.kp.batch_update() as batch:
+            batch.add_keyword('Python')
+        for clone in (pickle.loads(pickle.dumps(self.kp)), copy.deepcopy(self.kp)):
+            self.assertEqual(clone.version, 1)
+            with clone.batch_update() as batch:
+                batch.remove_keyword('Java')
+            clone.add_keyword('Rust')
+            self.assertEqual(clone.extract_keywords('Python, Rust and Java'), ['Python', 'Rust'])
+        self.assertEqual(self.kp.extract_keywords('Python, Rust and Java'), ['Python', 'Java'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+from flashtext import bench
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestBench(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_generators_are_seeded(self):
+        keywords = bench.generate_keywords(200, 'mixed', seed=3)
+        self.assertEqual(keywords, bench.generate_keywords(200, 'mixed', seed=3))
+        self.assertEqual(len(set(keywords)), 200)
+        self.assertNotEqual(keywords, bench.generate_keywords(200, 'mixed', seed=4))
+        corpus = bench.generate_corpus(keywords, 1000, 'mixed', density=0.2, seed=1)
+        self.assertEqual(corpus, bench.generate_corpus(keywords, 1000, 'mixed', density=0.2, seed=1))
+
+    def test_density(self):
+        keywords = bench.generate_keywords(100, 'cjk')
+        processor = bench.build_processor(keywords)
+        sparse = processor.extract_keywords(bench.generate_corpus(keywords, 2000, 'cjk', density=0.01))
+        dense = processor.extract_keywords(bench.generate_corpus(keywords, 2000, 'cjk', density=0.3))
+        self.assertGreater(len(dense), 5 * len(sparse))
+        # Zipfian: the first keyword is the most frequent
+        self.assertEqual(max(set(dense), key=dense.count), keywords[0])
+
+    def test_mixed_case_processor(self):
+        processor = bench.build_processor(bench.generate_keywords(20), case='mixed')
+        self.assertEqual(len(processor), 20)
+
+    def test_run_and_compare(self):
+        scenarios = list(bench.iter_scenarios([50], scripts=('latin', 'cjk'), cases=('sensitive',)))
+        self.assertEqual([bench.scenario_name(s) for s in scenarios],
+                         ['latin-50-d0.01-sensitive', 'cjk-50-d0.01-sensitive'])
+        results = bench.run(scenarios, num_words=300, repeat=2, fuzzy_words=50, churn=10)
+        operations = results['results']['latin-50-d0.01-sensitive']['operations']
+        self.assertEqual(set(operations), set(bench.OPERATIONS))
+        self.assertEqual(operations['build']['items'], 50)
+        self.assertEqual(operations['extract']['repeat'], 2)
+        self.assertLessEqual(operations['extract']['min'], operations['extract']['median'])
+        rows = bench.compare(results, json.loads(json.dumps(results)))
+        self.assertEqual(len(rows), 2 * len(bench.OPERATIONS))
+        self.assertTrue(all(ratio in (1.0, None) for _, _, _, _, ratio in rows))
+
+    def test_memory(self):
+        entries, case_sensitive = bench.generate_shape('multi_label', 50, seed=1)
+        self.assertEqual(entries, bench.generate_shape('multi_label', 50, seed=1)[0])
+        self.assertFalse(case_sensitive)
+        self.assertTrue(all(len(clean_name) == 3 for _, clean_name in entries))
+        results = bench.run_memory(['cjk_short', 'latin_sensitive'], [200], rss=False)
+        report = results['memory']['cjk_short-200']
+        self.assertEqual(report['keywords'], 200)
+        self.assertGreater(report['nodes'], 200)
+        self.assertGreater(report['bytes_per_node'], 0)
+        self.assertLessEqual(report['bytes'], report['peak_bytes'])
+        self.assertIsNone(report['rss_bytes'])
+        self.assertEqual(bench.check_budget(results, max_bytes_per_keyword=10 ** 6), [])
+        violations = bench.check_budget(results, max_bytes_per_node=1)
+        self.assertEqual(len(violations), 2)
+        self.assertTrue(violations[0].startswith('cjk_short-200: bytes_per_node'))
+        rows = bench.compare(results, results)
+        self.assertEqual([row[:2] for row in rows], [('cjk_short-200', 'bytes'), ('latin_sensitive-200', 'bytes')])
+
+    def test_cli_output(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            bench.main(['run', '--sizes', '30', '--scripts', 'latin', '--cases', 'insensitive',
+                        '--densities', '0.1', '--operations', 'build,extract', '--words', '200',
+                        '--repeat', '1', '--output', output])
+            with open(output) as f:
+                results = json.load(f)
+        self.assertEqual(list(results['results']), ['latin-30-d0.1-insensitive'])
+        self.assertEqual(set(results['results']['latin-30-d0.1-insensitive']['operations']), {'build', 'extract'})
+        self.assertIn('python', results['meta'])
+
+
+if __name__ == '__main__':
+    unittest.main()
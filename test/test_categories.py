@@ -0,0 +1,164 @@
+from flashtext import KeywordProcessor
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestCategories(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.kp = KeywordProcessor()
+        self.kp.add_keyword('Apple', 'Apple Inc.', categories=['brand'])
+        self.kp.add_keyword('Paris', categories='location')
+        self.kp.add_keyword('Paris Hilton', categories=['person'])
+        self.kp.add_keyword('flu', 'influenza', categories=['disease'])
+        self.kp.add_keyword('Hilton', categories=['brand', 'location'])
+        self.kp.add_keyword('today')
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_no_filter_matches_everything(self):
+        sentence = 'Paris Hilton had the flu today in Paris'
+        self.assertEqual(self.kp.extract_keywords(sentence), ['Paris Hilton', 'influenza', 'today', 'Paris'])
+
+    def test_filter(self):
+        sentence = 'Apple and the flu today in Paris'
+        self.assertEqual(self.kp.extract_keywords(sentence, categories={'brand'}), ['Apple Inc.'])
+        self.assertEqual(self.kp.extract_keywords(sentence, categories={'brand', 'disease'}),
+                         ['Apple Inc.', 'influenza'])
+        self.assertEqual(self.kp.extract_keywords(sentence, categories='location', span_info=True),
+                         [('Paris', 27, 32)])
+        self.assertEqual(self.kp.extract_keywords(sentence, categories=['unknown']), [])
+
+    def test_longest_match_among_enabled(self):
+        """'Paris Hilton' is a person: with locations only, 'Paris' and 'Hilton' match instead"""
+        sentence = 'Paris Hilton'
+        self.assertEqual(self.kp.extract_keywords(sentence, categories={'person'}), ['Paris Hilton'])
+        self.assertEqual(self.kp.extract_keywords(sentence, categories={'location'}, span_info=True),
+                         [('Paris', 0, 5), ('Hilton', 6, 12)])
+
+    def test_replace(self):
+        sentence = 'Apple had the flu'
+        self.assertEqual(self.kp.replace_keywords(sentence, categories={'disease'}), 'Apple had the influenza')
+
+    def test_get_categories(self):
+        self.assertEqual(self.kp.get_categories('Hilton'), {'brand', 'location'})
+        self.assertEqual(self.kp.get_categories('today'), set())
+        self.assertEqual(self.kp.get_categories('missing'), set())
+
+    def test_shared_payload_per_category(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('NY', 'New York', categories=['location'])
+        kp.add_keyword('NYC', 'New York', categories=['location'])
+        kp.add_keyword('New York', categories=['title'])
+        self.assertEqual(kp._payloads, ['New York', 'New York'])
+        self.assertEqual(kp.extract_keywords('NY is New York', categories='title'), ['New York'])
+
+    def test_added_again_merges_categories(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('jordan', 'Jordan', categories={'location'})
+        kp.add_keyword('jordan', 'Jordan', categories={'brand'})
+        self.assertEqual(kp.get_categories('jordan'), {'location', 'brand'})
+        self.assertEqual(kp.extract_keywords('jordan', categories='location'), ['Jordan'])
+        self.assertEqual(kp.extract_keywords('jordan', categories='brand'), ['Jordan'])
+        self.assertEqual(kp.extract_keywords('jordan'), ['Jordan'])
+
+    def test_clean_name_per_category(self):
+        kp = KeywordProcessor(fuzzy_index=1)
+        kp.add_keyword('jordan', 'Jordan', categories={'location'})
+        kp.add_keyword('jordan', 'Air Jordan', categories={'brand'})
+        sentence = 'I went to jordan'
+        self.assertEqual(kp.extract_keywords(sentence, categories='location'), ['Jordan'])
+        self.assertEqual(kp.extract_keywords(sentence, categories='brand', span_info=True),
+                         [('Air Jordan', 10, 16)])
+        self.assertEqual(kp.extract_keywords(sentence, categories={'brand', 'location'}), ['Jordan', 'Air Jordan'])
+        self.assertEqual(kp.extract_keywords(sentence), ['Jordan', 'Air Jordan'])
+        self.assertEqual(kp.extract_keywords('I went to jordn', max_cost=1, categories='brand'), ['Air Jordan'])
+        self.assertEqual(kp.replace_keywords(sentence, categories='location'), 'I went to Jordan')
+        matches = kp.extract_keywords(sentence, as_array=True, return_ids=True, categories='brand')
+        self.assertEqual(matches.clean_names(), ['Air Jordan'])
+        self.assertEqual(kp.get_categories('jordan'), {'location', 'brand'})
+
+        # a category takes the clean name it was added with last
+        kp.add_keyword('jordan', 'Nike Jordan', categories={'brand'})
+        self.assertEqual(kp.extract_keywords(sentence), ['Jordan', 'Nike Jordan'])
+        kp.add_keyword('jordan', 'Jordan', categories={'brand'})
+        self.assertEqual(kp.extract_keywords(sentence, categories='brand'), ['Jordan'])
+        self.assertEqual(kp.extract_keywords(sentence), ['Jordan'])
+        copy = pickle.loads(pickle.dumps(kp))
+        self.assertEqual(copy.get_categories('jordan'), {'location', 'brand'})
+
+    def test_ids_of_enabled_categories(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('jordan', 'Jordan', categories={'location'})
+        kp.add_keyword('jordan', 'Air Jordan', categories={'brand'})
+        kp.add_keyword('nike', 'Nike', categories={'brand'})
+        sentence = 'jordan by nike'
+        for categories, expected in (('brand', ['Air Jordan', 'Nike']), ('location', ['Jordan']),
+                                     ({'brand', 'location'}, ['Jordan', 'Air Jordan', 'Nike'])):
+            ids = kp.extract_keywords(sentence, return_ids=True, categories=categories)
+            self.assertEqual([kp.get_payload(payload_id) for payload_id in ids], expected)
+            spans = kp.extract_keywords(sentence, span_info=True, return_ids=True, categories=categories)
+            self.assertEqual([payload_id for payload_id, _, _ in spans], ids)
+            matches = kp.extract_keywords(sentence, as_array=True, return_ids=True, categories=categories)
+            self.assertEqual(list(matches.ids), ids)
+            self.assertEqual(matches.clean_names(), expected)
+        # without a filter the id stands for every clean name
+        payload_id = kp.extract_keywords('jordan', return_ids=True)[0]
+        self.assertEqual(kp.get_payload(payload_id), ['Jordan', 'Air Jordan'])
+        # the alternative ids stay in use while the keyword holds them
+        for index in range(3000):
+            kp.add_keyword('filler', str(index))
+        ids = kp.extract_keywords(sentence, return_ids=True, categories='location')
+        self.assertEqual([kp.get_payload(payload_id) for payload_id in ids], ['Jordan'])
+
+    def test_overlapping_category_files(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        files = {
+            'location': 'jordan=>Jordan\nparis=>Paris\ngeorgia=>Georgia\n',
+            'brand': 'jordan=>Air Jordan\nhilton=>Hilton\ngeorgia=>Georgia\n',
+        }
+        kp = KeywordProcessor()
+        for category, content in files.items():
+            path = os.path.join(directory, category + '.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    keyword, clean_name = line.strip().split('=>')
+                    kp.add_keyword(keyword, clean_name, categories=category)
+        sentence = 'jordan, paris, hilton and georgia'
+        self.assertEqual(kp.extract_keywords(sentence, categories='location'), ['Jordan', 'Paris', 'Georgia'])
+        self.assertEqual(kp.extract_keywords(sentence, categories='brand'), ['Air Jordan', 'Hilton', 'Georgia'])
+        self.assertEqual(kp.get_categories('georgia'), {'location', 'brand'})
+        self.assertEqual(kp.extract_keywords(sentence), ['Jordan', 'Air Jordan', 'Paris', 'Hilton', 'Georgia'])
+
+    def test_untagged_keyword_replaced(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('jordan', 'Jordan')
+        kp.add_keyword('jordan', 'Air Jordan', categories='brand')
+        self.assertEqual(kp.extract_keywords('jordan'), ['Air Jordan'])
+        kp.add_keyword('jordan', 'Michael Jordan')
+        self.assertEqual(kp.extract_keywords('jordan'), ['Michael Jordan'])
+        self.assertEqual(kp.get_categories('jordan'), set())
+
+    def test_fuzzy_and_cjk(self):
+        kp = KeywordProcessor(fuzzy_index=1)
+        kp.add_keyword('人工智慧', categories=['tech'])
+        kp.add_keyword('智慧', categories=['virtue'])
+        sentence = '人工智慧'
+        self.assertEqual(kp.extract_keywords(sentence, categories={'virtue'}), ['智慧'])
+        self.assertEqual(kp.extract_keywords('人工智障', max_cost=1, categories={'tech'}, indexed=True), ['人工智慧'])
+        # with 'tech' disabled the typo is one edit away from '智慧'
+        self.assertEqual(kp.extract_keywords('人工智障', max_cost=1, categories={'virtue'}, indexed=True), ['智慧'])
+
+
+if __name__ == '__main__':
+    unittest.main()
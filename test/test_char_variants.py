@@ -0,0 +1,56 @@
+from flashtext import KeywordProcessor
+from flashtext.normalize import load_variant_table
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestCharVariants(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_load_variant_table(self):
+        variants = load_variant_table('test/char_variants.txt')
+        self.assertEqual(variants['詩'], '诗')
+        self.assertEqual(variants['髮'], '发')
+        self.assertNotIn('诗', variants)
+
+    def test_invalid_table(self):
+        with self.assertRaises(IOError):
+            load_variant_table('test/missing_variants.txt')
+        with self.assertRaises(ValueError):
+            KeywordProcessor(char_variants={'詩': '诗歌'})
+
+    def test_one_keyword_matches_all_variants(self):
+        keyword_proc = KeywordProcessor(char_variants='test/char_variants.txt')
+        keyword_proc.add_keyword('雅詩蘭黛', 'Estee Lauder')
+        self.assertEqual(len(keyword_proc), 1)
+        for sentence in ('我買了雅詩蘭黛的', '我买了雅诗兰黛的', '我買了雅诗蘭黛的'):
+            self.assertEqual(keyword_proc.extract_keywords(sentence, span_info=True),
+                             [('Estee Lauder', 3, 7)])
+        self.assertEqual(keyword_proc.replace_keywords('雅诗兰黛，機器學習'), 'Estee Lauder，機器學習')
+        self.assertIn('雅诗兰黛', keyword_proc)
+
+    def test_default_clean_name_is_original(self):
+        keyword_proc = KeywordProcessor(char_variants={'學': '学', '習': '习', '機': '机'})
+        keyword_proc.add_keyword('機器學習')
+        self.assertEqual(keyword_proc.extract_keywords('我喜歡机器学习'), ['機器學習'])
+
+    def test_with_normalization(self):
+        keyword_proc = KeywordProcessor(normalization='NFKC', char_variants='test/char_variants.txt')
+        keyword_proc.add_keyword('學習 AI', 'learning')
+        sentence = '學习 ＡＩ 很好'
+        self.assertEqual(keyword_proc.extract_keywords(sentence, span_info=True), [('learning', 0, 5)])
+
+    def test_fuzzy_on_folded_text(self):
+        keyword_proc = KeywordProcessor(char_variants='test/char_variants.txt')
+        keyword_proc.add_keyword('機器學習')
+        self.assertEqual(keyword_proc.extract_keywords('我喜歡机器学刁', max_cost=1), ['機器學習'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+from flashtext import KeywordProcessor, DiskKeywordProcessor
+from flashtext.disk import write_trie_store
+import json
+import logging
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestDiskTrie(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'keywords.sqlite')
+        with open('test/keyword_extractor_test_cases.json') as f:
+            self.test_cases = json.load(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        logger.info("Ending.")
+
+    def disk_copy(self, processor, **kwargs):
+        write_trie_store(self.path, processor)
+        return DiskKeywordProcessor(self.path, **kwargs)
+
+    def assertSameExtraction(self, processor, disk_processor, sentence, message=None, categories=None):
+        for span_info in (False, True):
+            for return_ids in (False, True):
+                self.assertEqual(
+                    disk_processor.extract_keywords(sentence, span_info, return_ids=return_ids, categories=categories),
+                    processor.extract_keywords(sentence, span_info, return_ids=return_ids, categories=categories),
+                    message)
+        self.assertEqual(list(disk_processor.extract_keywords(sentence, as_array=True)),
+                         list(processor.extract_keywords(sentence, as_array=True)), message)
+        self.assertEqual(disk_processor.replace_keywords(sentence, categories=categories),
+                         processor.replace_keywords(sentence, categories=categories), message)
+
+    def test_test_cases(self):
+        for test_id, test_case in enumerate(self.test_cases):
+            for case_sensitive in (False, True):
+                processor = KeywordProcessor(case_sensitive=case_sensitive)
+                processor.add_keywords_from_dict(test_case['keyword_dict'])
+                disk_processor = self.disk_copy(processor, cache_size=2)
+                self.assertSameExtraction(processor, disk_processor, test_case['sentence'],
+                                          "disk trie differs for test case: {}".format(test_id))
+                disk_processor.close()
+
+    def test_random_dictionaries(self):
+        alphabets = ('abAB .,-_', '雅詩蘭黛小棕瓶。 ', 'aB雅詩 .İiσςΣ1')
+        rng = random.Random(11)
+        for trial in range(150):
+            processor = KeywordProcessor(case_sensitive=rng.random() < 0.3)
+            if rng.random() < 0.1:
+                processor.set_non_word_boundaries(set('ab'))
+            dictionary_alphabet = rng.choice(alphabets)
+            for _ in range(rng.randint(1, 8)):
+                keyword = ''.join(rng.choice(dictionary_alphabet) for _ in range(rng.randint(1, 4)))
+                clean_name = rng.choice([None, 'X', ['L1', 'L2']])
+                processor.add_keyword(keyword, clean_name, case_sensitive=rng.choice([None, True, False]),
+                                      categories=rng.choice([None, 'c1', ['c1', 'c2']]))
+            disk_processor = self.disk_copy(processor, cache_size=rng.choice([0, 1, 4, 1000]),
+                                            payload_cache_size=rng.choice([0, 2]))
+            for _ in range(5):
+                text_alphabet = rng.choice(alphabets)
+                sentence = ''.join(rng.choice(text_alphabet) for _ in range(rng.randint(1, 25)))
+                message = "trial {}: {!r}".format(trial, sentence)
+                self.assertSameExtraction(processor, disk_processor, sentence, message)
+                self.assertSameExtraction(processor, disk_processor, sentence, message, categories='c2')
+                self.assertEqual(disk_processor.extract_keywords(sentence, True, max_cost=1),
+                                 processor.extract_keywords(sentence, True, max_cost=1), message)
+            disk_processor.close()
+
+    def test_settings_restored(self):
+        processor = KeywordProcessor(case_sensitive=True, normalization='NFKC', char_variants={'詩': '诗'})
+        processor.add_keyword('ABC', 'abc')
+        processor.add_keyword('雅诗兰黛')
+        processor.add_non_word_boundary('-')
+        disk_processor = self.disk_copy(processor)
+        sentence = 'ＡＢＣ abc 雅詩兰黛 ABC-x'
+        self.assertEqual(disk_processor.extract_keywords(sentence, span_info=True),
+                         processor.extract_keywords(sentence, span_info=True))
+        self.assertEqual(disk_processor.extract_keywords(sentence), ['abc', '雅诗兰黛'])
+        self.assertTrue(disk_processor.case_sensitive)
+        self.assertIn('-', disk_processor.non_word_boundaries)
+
+    def test_lookups(self):
+        processor = KeywordProcessor()
+        processor.add_keyword('Big Apple', 'New York', categories='city')
+        processor.add_keyword('Bay Area', ['California', 'SF'])
+        disk_processor = self.disk_copy(processor, cache_size=1)
+        self.assertEqual(len(disk_processor), 2)
+        self.assertIn('big apple', disk_processor)
+        self.assertNotIn('big', disk_processor)
+        self.assertEqual(disk_processor['BIG APPLE'], 'New York')
+        self.assertEqual(disk_processor.get_categories('Big Apple'), {'city'})
+        self.assertEqual(disk_processor.get_all_keywords(), processor.get_all_keywords())
+        self.assertEqual(disk_processor.trie_stats(), processor.trie_stats())
+        payload_id = disk_processor.extract_keywords('Bay Area', return_ids=True)[0]
+        self.assertEqual(disk_processor.get_payload(payload_id), ['California', 'SF'])
+        self.assertEqual(next(disk_processor.levensthein('big aple', max_cost=1))[1:],
+                         next(processor.levensthein('big aple', max_cost=1))[1:])
+
+    def test_cache_stats(self):
+        processor = KeywordProcessor()
+        processor.add_keywords_from_list(['python', 'java', 'javascript', 'rust'])
+        disk_processor = self.disk_copy(processor, cache_size=4, payload_cache_size=1)
+        sentence = 'python and java, not javascript or rust'
+        expected = processor.extract_keywords(sentence)
+        self.assertEqual(disk_processor.extract_keywords(sentence), expected)
+        stats = disk_processor.cache_stats()
+        self.assertGreater(stats['node_misses'], 0)
+        self.assertEqual(stats['node_cache_size'], 4)
+        self.assertEqual(stats['node_cache_maxsize'], 4)
+        self.assertEqual(stats['payload_cache_size'], 1)
+        self.assertEqual(stats['node_hit_rate'], stats['node_hits'] / (stats['node_hits'] + stats['node_misses']))
+
+        disk_processor.cache_stats(reset=True)
+        disk_processor = self.disk_copy(processor, cache_size=1000)
+        disk_processor.extract_keywords(sentence)
+        disk_processor.cache_stats(reset=True)
+        self.assertEqual(disk_processor.extract_keywords(sentence), expected)
+        stats = disk_processor.cache_stats()
+        self.assertEqual((stats['node_misses'], stats['payload_misses']), (0, 0))
+        self.assertEqual(stats['node_hit_rate'], 1.0)
+
+    def test_memory_bounded(self):
+        processor = KeywordProcessor()
+        processor.add_keywords_from_list(['keyword{}'.format(index) for index in range(2000)])
+        disk_processor = self.disk_copy(processor, cache_size=10, payload_cache_size=10)
+        sentence = ' '.join('keyword{}'.format(index) for index in range(0, 2000, 7))
+        self.assertEqual(disk_processor.extract_keywords(sentence), processor.extract_keywords(sentence))
+        usage = disk_processor.memory_usage(deep=True)
+        self.assertLess(usage['trie'], processor.memory_usage()['trie'] / 20)
+        self.assertEqual(usage['total'], sum(value for key, value in usage.items() if key != 'total'))
+
+    def test_read_only(self):
+        processor = KeywordProcessor()
+        processor.add_keyword('python')
+        disk_processor = self.disk_copy(processor)
+        with self.assertRaises(TypeError):
+            disk_processor.add_keyword('java', categories='language')
+        with self.assertRaises(TypeError):
+            disk_processor.remove_keyword('python')
+        with self.assertRaises(TypeError):
+            disk_processor.apply_delta(['- python'])
+        with self.assertRaises(TypeError):
+            with disk_processor.batch_update() as batch:
+                batch.add_keyword('java')
+        self.assertEqual(disk_processor.extract_keywords('python java'), ['python'])
+        self.assertEqual(disk_processor.get_categories('python'), set())
+        self.assertEqual(len(disk_processor), 1)
+
+    def test_pickle(self):
+        processor = KeywordProcessor()
+        processor.add_keyword('Big Apple', 'New York')
+        disk_processor = self.disk_copy(processor, cache_size=5)
+        disk_processor.add_non_word_boundary('-')
+        copy = pickle.loads(pickle.dumps(disk_processor))
+        self.assertEqual(copy.extract_keywords('Big Apple-s, big apple'), ['New York'])
+        self.assertEqual(copy.cache_stats()['node_cache_maxsize'], 5)
+
+    def test_store_files(self):
+        processor = KeywordProcessor()
+        processor.add_keyword('python')
+        self.assertEqual(write_trie_store(self.path, processor), {'nodes': 7, 'payloads': 1})
+        processor.add_keyword('java')
+        write_trie_store(self.path, processor)
+        self.assertEqual(os.listdir(self.directory), ['keywords.sqlite'])
+        self.assertEqual(DiskKeywordProcessor(self.path).extract_keywords('python java'), ['python', 'java'])
+
+        with self.assertRaises(IOError):
+            DiskKeywordProcessor(os.path.join(self.directory, 'missing.sqlite'))
+        not_a_store = os.path.join(self.directory, 'keywords.txt')
+        with open(not_a_store, 'w') as f:
+            f.write('python\n')
+        with self.assertRaises(ValueError):
+            DiskKeywordProcessor(not_a_store)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+from flashtext import KeywordProcessor
+from flashtext.columns import ColumnMatches, iter_column_values
+from array import array
+from types import SimpleNamespace
+from unittest import mock
+import logging
+import sys
+import unittest
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+
+class AmbiguousNull(object):
+    """Null sentinel that cannot be tested for truth, like `pandas.NA`."""
+
+    def __bool__(self):
+        raise TypeError("boolean value of NA is ambiguous")
+
+
+class FakeArray(object):
+    """Stands for a pyarrow.Array: zero-copy slices converted with to_pylist."""
+
+    def __init__(self, values, converted=None):
+        self.values = values
+        # sizes of the conversions to Python objects, shared by the slices
+        self.converted = [] if converted is None else converted
+
+    def __len__(self):
+        return len(self.values)
+
+    def slice(self, offset, length):
+        return FakeArray(self.values[offset:offset + length], self.converted)
+
+    def to_pylist(self):
+        self.converted.append(len(self.values))
+        return list(self.values)
+
+
+class FakeChunkedArray(object):
+    """Stands for a pyarrow.ChunkedArray: a list of arrays."""
+
+    def __init__(self, *chunks):
+        self.chunks = [FakeArray(chunk) for chunk in chunks]
+
+
+def fake_pyarrow():
+    """pyarrow stand-in recording the buffers given to Array.from_buffers."""
+    def from_buffers(arrow_type, length, buffers):
+        return SimpleNamespace(type=arrow_type, length=length, buffers=buffers)
+    return SimpleNamespace(
+        int32=lambda: 'int32', int64=lambda: 'int64', py_buffer=memoryview,
+        Array=SimpleNamespace(from_buffers=from_buffers), table=dict,
+    )
+
+
+def fake_numpy_pandas():
+    """numpy and pandas stand-ins: frombuffer copies into an array, DataFrame is a dict."""
+    numpy = SimpleNamespace(frombuffer=lambda buffer, dtype: array(dtype, bytes(buffer)),
+                            zeros=lambda length, dtype: array(dtype, [0] * length))
+    return numpy, SimpleNamespace(DataFrame=dict)
+
+
+class TestExtractColumn(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.kp = KeywordProcessor()
+        self.kp.add_keyword('Big Apple', 'New York')
+        self.kp.add_keyword('NY', 'New York')
+        self.kp.add_keyword('Bay Area')
+        self.rows = ['I love Big Apple', None, 'nothing here', 'NY and Bay Area', float('nan'), '']
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_exploded_rows(self):
+        matches = self.kp.extract_keywords_column(self.rows)
+        self.assertIsInstance(matches, ColumnMatches)
+        self.assertEqual(list(matches.rows), [0, 3, 3])
+        self.assertEqual(list(matches.ids), [0, 0, 1])
+        self.assertEqual(list(matches.starts), [7, 0, 7])
+        self.assertEqual(list(matches.ends), [16, 2, 15])
+        self.assertEqual(matches[2], (3, 'Bay Area', 7, 15))
+        self.assertIs(matches.names, self.kp._payloads)
+
+    def test_same_as_row_by_row(self):
+        matches = self.kp.extract_keywords_column(self.rows, max_cost=1)
+        expected = []
+        for row, value in enumerate(self.rows):
+            if isinstance(value, str):
+                for name, start, end in self.kp.extract_keywords(value, span_info=True, max_cost=1):
+                    expected.append((row, name, start, end))
+        self.assertEqual(matches, expected)
+
+    def test_null_sentinels_skipped(self):
+        rows = self.rows + [AmbiguousNull(), 'Bay Area']
+        matches = self.kp.extract_keywords_column(rows)
+        self.assertEqual(list(matches.rows), [0, 3, 3, 7])
+
+    def test_chunked_input(self):
+        chunked = FakeChunkedArray(self.rows[:2], self.rows[2:])
+        self.assertEqual(self.kp.extract_keywords_column(chunked), self.kp.extract_keywords_column(self.rows))
+
+    def test_arrow_slices(self):
+        column = FakeArray(self.rows * 5)
+        self.assertEqual(list(iter_column_values(column, slice_rows=4)), self.rows * 5)
+        self.assertEqual(column.converted, [4] * 7 + [2])
+        chunked = FakeChunkedArray(self.rows * 2, self.rows)
+        self.assertEqual(list(iter_column_values(chunked, slice_rows=5)), self.rows * 3)
+        self.assertEqual(max(chunked.chunks[0].converted), 5)
+
+    def test_to_arrow_wraps_buffers(self):
+        matches = self.kp.extract_keywords_column(self.rows)
+        with mock.patch.dict(sys.modules, {'pyarrow': fake_pyarrow()}):
+            table = matches.to_arrow()
+        self.assertEqual(list(table), ['row', 'keyword_id', 'start', 'end'])
+        end = table['end']
+        self.assertEqual((end.type, end.length), ('int64' if matches.ends.itemsize == 8 else 'int32', 3))
+        validity, data = end.buffers
+        self.assertIsNone(validity)
+        # the data buffer is the array itself, not a copy
+        self.assertIs(data.obj, matches.ends)
+        self.assertEqual(data.tolist(), [16, 2, 15])
+
+    def test_to_pandas_columns(self):
+        numpy, pandas_module = fake_numpy_pandas()
+        with mock.patch.dict(sys.modules, {'numpy': numpy, 'pandas': pandas_module}):
+            frame = self.kp.extract_keywords_column(self.rows).to_pandas()
+            empty = self.kp.extract_keywords_column(['nothing here']).to_pandas()
+        self.assertEqual(frame, {'row': array('l', [0, 3, 3]), 'keyword_id': array('l', [0, 0, 1]),
+                                 'start': array('l', [7, 0, 7]), 'end': array('l', [16, 2, 15])})
+        self.assertEqual(empty['row'], array('l'))
+
+    def test_missing_optional_dependencies(self):
+        matches = self.kp.extract_keywords_column(self.rows)
+        with mock.patch.dict(sys.modules, {'pyarrow': None, 'pandas': None}):
+            with self.assertRaises(ImportError):
+                matches.to_arrow()
+            with self.assertRaises(ImportError):
+                matches.to_pandas()
+
+    @unittest.skipIf(pandas is None, "pandas not installed")
+    def test_pandas_series(self):
+        frame = self.kp.extract_keywords_column(pandas.Series(self.rows)).to_pandas()
+        self.assertEqual(list(frame.columns), ['row', 'keyword_id', 'start', 'end'])
+        self.assertEqual(frame['row'].tolist(), [0, 3, 3])
+
+    @unittest.skipIf(pandas is None, "pandas not installed")
+    def test_nullable_string_series(self):
+        matches = self.kp.extract_keywords_column(pandas.Series(['Big Apple', pandas.NA], dtype='string'))
+        self.assertEqual(list(matches.rows), [0])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_arrow_array(self):
+        column = pyarrow.chunked_array([self.rows[:2], [value for value in self.rows[2:] if value == value]])
+        table = self.kp.extract_keywords_column(column).to_arrow()
+        self.assertEqual(table.column('row').to_pylist(), [0, 3, 3])
+        self.assertEqual(table.column('end').to_pylist(), [16, 2, 15])
+
+
+if __name__ == '__main__':
+    unittest.main()
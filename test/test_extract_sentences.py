@@ -78,5 +78,34 @@ class TestExtractSentences(unittest.TestCase):
         self.assertEqual(len(sentences), 2)
         self.assertTrue(sentences[0][0].strip().endswith("!!!"))
 
+    def test_cjk_delimiters(self):
+        """Test full-width CJK sentence delimiters are split by default."""
+        kp = KeywordProcessor()
+        kp.add_keyword('機器學習')
+        text = "我喜歡機器學習。你呢？機器學習很好！"
+        sentences = kp.extract_sentences(text)
+        self.assertEqual(sentences, [("我喜歡機器學習。", ['機器學習']), ("機器學習很好！", ['機器學習'])])
+
+    def test_sentence_spans(self):
+        """Test span_info returns sentence offsets instead of copies."""
+        text = "Hello world. I love Python. Java too!"
+        sentences = self.kp.extract_sentences(text, span_info=True)
+        self.assertEqual(sentences, [(12, 27, ["Python"]), (27, 37, ["Java"])])
+        self.assertEqual(text[12:27], " I love Python.")
+
+    def test_delimiters_not_modified(self):
+        """Test the caller's delimiter list is left as it was."""
+        delimiters = ['|', '||']
+        self.kp.extract_sentences("Python||Java", delimiters=delimiters)
+        self.assertEqual(delimiters, ['|', '||'])
+
+    def test_keyword_across_sentences(self):
+        """Test a keyword containing a delimiter joins the sentences it spans."""
+        kp = KeywordProcessor()
+        kp.add_keyword('node.js')
+        kp.add_keyword('js')
+        self.assertEqual(kp.extract_sentences("I use node.js daily"), [("I use node.js daily", ['node.js'])])
+        self.assertEqual(kp.extract_sentences("node.js. js"), [("node.js.", ['node.js']), (" js", ['js'])])
+
 if __name__ == '__main__':
     unittest.main()
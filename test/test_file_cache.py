@@ -0,0 +1,146 @@
+from flashtext import KeywordProcessor
+from unittest import mock
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, 'cache')
+        self.keyword_file = os.path.join(self.directory, 'keywords.txt')
+        self.write_keywords('java_2e=>java\njava programing=>java\n台北=>Taipei\nproduct management\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        logger.info("Ending.")
+
+    def write_keywords(self, content, keyword_file=None):
+        with open(keyword_file or self.keyword_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def artifacts(self):
+        return sorted(os.listdir(self.cache_dir)) if os.path.isdir(self.cache_dir) else []
+
+    def test_hit_skips_parsing(self):
+        sentence = 'I know java_2e, product management and 台北.'
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        expected = keyword_processor.extract_keywords(sentence, span_info=True)
+        self.assertEqual([keyword for keyword, _, _ in expected], ['java', 'product management', 'Taipei'])
+        self.assertEqual(len(self.artifacts()), 1)
+
+        keyword_processor = KeywordProcessor()
+        with mock.patch.object(KeywordProcessor, 'add_keyword') as add_keyword:
+            keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        add_keyword.assert_not_called()
+        self.assertEqual(keyword_processor.extract_keywords(sentence, span_info=True), expected)
+        self.assertEqual(len(keyword_processor), 4)
+        self.assertEqual(keyword_processor.get_keyword('java programing'), 'java')
+
+        # the restored processor is independent and can still be updated
+        keyword_processor.add_keyword('python')
+        keyword_processor.remove_keyword('java_2e')
+        self.assertEqual(keyword_processor.extract_keywords('java_2e python'), ['python'])
+        reloaded = KeywordProcessor()
+        reloaded.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        self.assertEqual(reloaded.extract_keywords('java_2e python'), ['java'])
+
+    def test_content_change_invalidates(self):
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        old_artifacts = self.artifacts()
+        self.write_keywords('java_2e=>java\nscala\n')
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        self.assertEqual(keyword_processor.extract_keywords('java_2e scala product management'), ['java', 'scala'])
+        # the artifact of the old content is deleted
+        self.assertEqual(len(self.artifacts()), 1)
+        self.assertNotEqual(self.artifacts(), old_artifacts)
+
+    def test_settings_change_invalidates(self):
+        KeywordProcessor().add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        keyword_processor = KeywordProcessor(case_sensitive=True)
+        keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        self.assertEqual(keyword_processor.extract_keywords('JAVA_2E java_2e'), ['java'])
+        artifacts = [self.artifacts()]
+
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_non_word_boundary('-')
+        keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        artifacts.append(self.artifacts())
+
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword_from_file(self.keyword_file, encoding='utf-8-sig', cache_dir=self.cache_dir)
+        artifacts.append(self.artifacts())
+        # one artifact per source file, replaced by every change
+        self.assertEqual([len(names) for names in artifacts], [1, 1, 1])
+        self.assertEqual(len(set(map(tuple, artifacts))), 3)
+
+    def test_older_artifacts_of_other_files_kept(self):
+        other_file = os.path.join(self.directory, 'other', 'keywords.txt')
+        os.makedirs(os.path.dirname(other_file))
+        self.write_keywords('scala\n', other_file)
+        KeywordProcessor().add_keyword_from_file(other_file, cache_dir=self.cache_dir)
+        other_artifact, = self.artifacts()
+        for content in ('java\n', 'python\n', 'rust\n'):
+            self.write_keywords(content)
+            KeywordProcessor().add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        self.assertEqual(len(self.artifacts()), 2)
+        self.assertIn(other_artifact, self.artifacts())
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword_from_file(other_file, cache_dir=self.cache_dir)
+        self.assertEqual(keyword_processor.extract_keywords('scala rust'), ['scala'])
+
+    def test_corrupt_artifact_rebuilt(self):
+        KeywordProcessor().add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        artifact, = self.artifacts()
+        with open(os.path.join(self.cache_dir, artifact), 'r+b') as f:
+            f.truncate(10)
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        self.assertEqual(keyword_processor.extract_keywords('java_2e'), ['java'])
+        self.assertEqual(self.artifacts(), [artifact])
+        self.assertGreater(os.path.getsize(os.path.join(self.cache_dir, artifact)), 10)
+
+    def test_failed_write_leaves_no_files(self):
+        keyword_processor = KeywordProcessor()
+        with mock.patch('flashtext.cache.pickle.dump', side_effect=RuntimeError('disk full')):
+            keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        self.assertEqual(keyword_processor.extract_keywords('java_2e'), ['java'])
+        self.assertEqual(self.artifacts(), [])
+
+    def test_non_empty_processor_not_cached(self):
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword('python')
+        keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        self.assertEqual(keyword_processor.extract_keywords('python java_2e'), ['python', 'java'])
+        self.assertEqual(self.artifacts(), [])
+
+    def test_json_file(self):
+        keyword_file = os.path.join(self.directory, 'keywords.json')
+        with open(keyword_file, 'w', encoding='utf-8') as f:
+            json.dump({"Color": ["red", "blue"], "Vehicle": ["car"]}, f)
+        KeywordProcessor().add_keyword_from_file(keyword_file, cache_dir=self.cache_dir)
+        keyword_processor = KeywordProcessor()
+        with mock.patch.object(KeywordProcessor, 'add_keyword') as add_keyword:
+            keyword_processor.add_keyword_from_file(keyword_file, cache_dir=self.cache_dir)
+        add_keyword.assert_not_called()
+        self.assertEqual(keyword_processor.extract_keywords('a red car'), ['Color', 'Vehicle'])
+
+    def test_fuzzy_index_restored(self):
+        KeywordProcessor(fuzzy_index=1).add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        keyword_processor = KeywordProcessor(fuzzy_index=1)
+        keyword_processor.add_keyword_from_file(self.keyword_file, cache_dir=self.cache_dir)
+        self.assertEqual(keyword_processor.extract_keywords('I know jav_2e', max_cost=1, indexed=True), ['java'])
+
+
+if __name__ == '__main__':
+    unittest.main()
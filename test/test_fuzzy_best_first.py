@@ -0,0 +1,75 @@
+from flashtext import KeywordProcessor
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestFuzzyBestFirst(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_cheapest_match_first(self):
+        """
+        'abxd' is two edits away from 'aaad' but an exact prefix of 'abxd', the
+        cheaper match must come first whatever the insertion order
+        """
+        keyword_proc = KeywordProcessor(case_sensitive=True)
+        keyword_proc.add_keyword('aaad')
+        keyword_proc.add_keyword('abxd')
+        node, cost, depth = next(keyword_proc.levensthein('abxd', max_cost=2))
+        self.assertEqual(cost, 0)
+        self.assertIs(node, keyword_proc.keyword_trie_dict['a']['b']['x']['d'])
+
+    def test_costs_non_decreasing(self):
+        keyword_proc = KeywordProcessor(case_sensitive=True)
+        keyword_proc.add_keywords_from_list(['kitten', 'sitten', 'sittin', 'sitting', 'mitten'])
+        costs = [cost for _, cost, _ in keyword_proc.levensthein('sitting', max_cost=3)]
+        self.assertEqual(costs, sorted(costs))
+        # 'sittin' is a match on the way, but the exact 'sitting' below it is cheaper
+        self.assertEqual(costs[0], 0)
+
+    def test_extract_prefers_cheapest(self):
+        """
+        From node 'ab', 'xde' is two edits from 'qqe' (inserted first) but one from 'cde'
+        """
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('abqqe')
+        keyword_proc.add_keyword('abcde')
+        self.assertEqual(keyword_proc.extract_keywords('abxde', max_cost=2), ['abcde'])
+
+    def test_budget_caps_work(self):
+        keyword_proc = KeywordProcessor(fuzzy_budget=3, fuzzy_cache_size=0)
+        keyword_proc.add_keyword('abcdefghij')
+        self.assertEqual(keyword_proc.extract_keywords('xbcdefghij', max_cost=1), [])
+        stats = keyword_proc.fuzzy_stats()
+        self.assertEqual(stats['budget_exhausted'], 1)
+        self.assertLessEqual(stats['nodes_expanded'], 3)
+
+        keyword_proc.fuzzy_budget = None
+        self.assertEqual(keyword_proc.extract_keywords('xbcdefghij', max_cost=1), ['abcdefghij'])
+        self.assertEqual(keyword_proc.fuzzy_stats()['budget_exhausted'], 1)
+
+    def test_budget_keeps_found_match(self):
+        """
+        'ab' is queued at cost 1 before the budget runs out exploring 'abcdzz'
+        """
+        keyword_proc = KeywordProcessor(case_sensitive=True)
+        keyword_proc.add_keyword('ab')
+        keyword_proc.add_keyword('abcdzz')
+        root = keyword_proc.keyword_trie_dict
+        keyword_proc.fuzzy_budget = 3
+        found = [(cost, depth) for _, cost, depth in keyword_proc.levensthein('abc', 1, root)]
+        self.assertEqual(found, [(1, 2)])
+        self.assertEqual(keyword_proc.fuzzy_stats()['budget_exhausted'], 1)
+        keyword_proc.fuzzy_budget = 4
+        self.assertEqual(next(keyword_proc.levensthein('abc', 1, root))[1:], (1, 2))
+        keyword_proc.fuzzy_budget = 1
+        self.assertEqual(list(keyword_proc.levensthein('abc', 1, root)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+from flashtext import KeywordProcessor
+from flashtext.utils import LRUCache
+import logging
+import pickle
+import threading
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestFuzzyCache(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_repeated_words_hit_cache(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('skype', 'messenger')
+        sentence = "skpe and skpe and skpe"
+        expected = [('messenger', 0, 4), ('messenger', 9, 13), ('messenger', 18, 22)]
+        self.assertEqual(keyword_proc.extract_keywords(sentence, span_info=True, max_cost=1), expected)
+        stats = keyword_proc.fuzzy_stats()
+        self.assertGreater(stats['cache_hits'], 0)
+        self.assertGreater(stats['cache_misses'], 0)
+        # second pass is answered from the cache only
+        misses = stats['cache_misses']
+        self.assertEqual(keyword_proc.extract_keywords(sentence, span_info=True, max_cost=1), expected)
+        self.assertEqual(keyword_proc.fuzzy_stats()['cache_misses'], misses)
+
+    def test_cache_invalidated_on_add(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('skype', 'messenger')
+        self.assertEqual(keyword_proc.extract_keywords('skpe', max_cost=1), ['messenger'])
+        keyword_proc.add_keyword('skpe', 'typo')
+        self.assertEqual(keyword_proc.fuzzy_stats()['cache_size'], 0)
+        self.assertEqual(keyword_proc.extract_keywords('skpe', max_cost=1), ['typo'])
+
+    def test_cache_invalidated_on_remove(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('skype', 'messenger')
+        self.assertEqual(keyword_proc.extract_keywords('skpe', max_cost=1), ['messenger'])
+        keyword_proc.remove_keyword('skype')
+        self.assertEqual(keyword_proc.extract_keywords('skpe', max_cost=1), [])
+
+    def test_cache_bounded(self):
+        keyword_proc = KeywordProcessor(fuzzy_cache_size=2)
+        keyword_proc.add_keyword('skype')
+        keyword_proc.extract_keywords('skpe skye skyp sype', max_cost=1)
+        self.assertLessEqual(keyword_proc.fuzzy_stats()['cache_size'], 2)
+
+    def test_cache_disabled(self):
+        keyword_proc = KeywordProcessor(fuzzy_cache_size=0)
+        keyword_proc.add_keyword('skype', 'messenger')
+        self.assertEqual(keyword_proc.extract_keywords('skpe', max_cost=1), ['messenger'])
+        self.assertEqual(keyword_proc.fuzzy_stats()['cache_hits'], 0)
+        self.assertEqual(keyword_proc.fuzzy_stats()['cache_maxsize'], 0)
+
+    def test_shared_between_threads(self):
+        cache = LRUCache(8)
+        errors = []
+
+        def work(seed):
+            try:
+                for index in range(5000):
+                    key = (seed * index) % 13
+                    if cache.get(key) is None:
+                        cache.put(key, index)
+                    if index % 500 == 0:
+                        cache.clear()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work, args=(seed,)) for seed in range(1, 7)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.hits + cache.misses, 6 * 5000)
+        self.assertLessEqual(len(cache), 8)
+
+    def test_pickled_with_processor(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('skype', 'messenger')
+        keyword_proc.extract_keywords('skpe', max_cost=1)
+        copy = pickle.loads(pickle.dumps(keyword_proc))
+        self.assertEqual(copy.extract_keywords('skpe', max_cost=1), ['messenger'])
+        self.assertEqual(copy.fuzzy_stats()['cache_misses'], keyword_proc.fuzzy_stats()['cache_misses'] + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
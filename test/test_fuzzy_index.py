@@ -0,0 +1,195 @@
+from flashtext import KeywordProcessor
+from flashtext.fuzzy_index import DeletionIndex, deletion_variants
+from flashtext.utils import compile_token_pattern
+import logging
+import random
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+def levenshtein(source, target):
+    row = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        previous, row[0] = row[0], i
+        for j, target_char in enumerate(target, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (source_char != target_char))
+    return row[-1]
+
+
+def indexed_extraction(processor, keywords, sentence, max_cost):
+    """
+    Brute-force version of the rules of `_extract_keywords_indexed`: every
+    window between a token start and a token end is compared with every
+    keyword, without the length bounds and the index.
+    """
+    char_classes = processor._get_char_classes()
+    token_pattern = compile_token_pattern(char_classes.word_class)
+
+    def shape(text):
+        is_word_char = char_classes.classify(text)
+        words = sum(1 for token in token_pattern.findall(text) if is_word_char[token[0]])
+        return words, is_word_char[text[0]], is_word_char[text[-1]]
+
+    tokens = [match.span() for match in token_pattern.finditer(sentence)]
+    found = []
+    idx = 0
+    while idx < len(tokens):
+        start = tokens[idx][0]
+        best = None
+        for idy in range(idx, len(tokens)):
+            window = sentence[start:tokens[idy][1]]
+            costs = sorted((levenshtein(window if case_sensitive else window.lower(),
+                                        keyword if case_sensitive else keyword.lower()), keyword)
+                           for keyword, case_sensitive in keywords if shape(keyword) == shape(window))
+            if costs and costs[0][0] <= max_cost:
+                best = (costs[0][1], tokens[idy][1], idy)
+        if best is None:
+            idx += 1
+            continue
+        keyword, end, idx = best
+        idx += 1
+        found.append((processor[keyword], start, end))
+    return found
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_deletion_variants(self):
+        self.assertEqual(deletion_variants('abc', 1), {'abc', 'bc', 'ac', 'ab'})
+        self.assertEqual(deletion_variants('ab', 2), {'ab', 'a', 'b', ''})
+
+    def test_lookup_cheapest_first(self):
+        index = DeletionIndex(2)
+        index.add('skype', False)
+        index.add('skyline', False)
+        self.assertEqual(index.lookup('Skpe', 2)[0], ('skype', 1))
+        self.assertEqual(index.lookup('skype', 0), [('skype', 0)])
+
+    def test_case_sensitive_entries(self):
+        index = DeletionIndex(1)
+        index.add('US', True)
+        self.assertEqual(index.lookup('UK', 1), [('US', 1)])
+        self.assertEqual(index.lookup('uk', 1), [])
+
+    def test_matches_trie_search(self):
+        """
+        The index must agree with the trie-wide search on the fuzzy test cases
+        """
+        keywords = [('skype', 'messenger'), ('colour here', 'couleur ici'), ('and heere', 'et ici'),
+                    ('made of multiple words', None), ('人工智慧', None), ('機器學習', None),
+                    ('iPhone 15', None), ('keyword', None), ('keyword with many words', None)]
+        sentences = [
+            ("hello, do you have skpe ?", 1),
+            ("color here blabla and here", 1),
+            ("this sentence contains a keyword maade of multple words", 2),
+            ("這是人工智障應用", 1),
+            ("我喜歡機器習", 1),
+            ("New iPhone 1S is here", 1),
+            ("This sentence contains a keywrd with many woords", 2),
+            ("This sentence contains a keywrd with many woords", 1),
+        ]
+        plain = KeywordProcessor()
+        indexed = KeywordProcessor(fuzzy_index=2)
+        for keyword, clean_name in keywords:
+            plain.add_keyword(keyword, clean_name)
+            indexed.add_keyword(keyword, clean_name)
+        for sentence, max_cost in sentences:
+            self.assertEqual(indexed.extract_keywords(sentence, span_info=True, max_cost=max_cost, indexed=True),
+                             plain.extract_keywords(sentence, span_info=True, max_cost=max_cost))
+            self.assertEqual(indexed.replace_keywords(sentence, max_cost=max_cost, indexed=True),
+                             plain.replace_keywords(sentence, max_cost=max_cost))
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(5)
+        alphabets = ('abc .,', 'ab 雅詩-', 'aAbB .')
+        for trial in range(400):
+            alphabet = rng.choice(alphabets)
+            processor = KeywordProcessor(case_sensitive=rng.random() < 0.3, fuzzy_index=2)
+            keywords = set()
+            for _ in range(rng.randint(1, 5)):
+                keyword = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))).strip(' ')
+                if keyword and keyword not in processor:
+                    processor.add_keyword(keyword)
+                    keywords.add((keyword, processor.case_sensitive))
+            sentence = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 20)))
+            for max_cost in (1, 2):
+                self.assertEqual(processor.extract_keywords(sentence, span_info=True, max_cost=max_cost, indexed=True),
+                                 indexed_extraction(processor, keywords, sentence, max_cost),
+                                 "trial {}: {!r} {!r}".format(trial, sentence, keywords))
+
+    def test_differs_from_trie_search(self):
+        # the index probes whole windows: 'a' is one deletion away from 'aa' at the end
+        # of the sentence, where the trie walk has no word left to spend the edit on
+        keyword_proc = KeywordProcessor(fuzzy_index=1)
+        keyword_proc.add_keyword('aa')
+        self.assertEqual(keyword_proc.extract_keywords('b a', span_info=True, max_cost=1, indexed=True),
+                         [('aa', 2, 3)])
+        self.assertEqual(keyword_proc.extract_keywords('b a', span_info=True, max_cost=1), [])
+
+    def test_scans_without_indexed_match_trie_search(self):
+        """
+        Building the index must not change the results of scans that do not ask for it
+        """
+        rng = random.Random(7)
+        alphabets = ('abc .,', 'ab 雅詩-', 'aAbB .', 'Big Apple pie')
+        for trial in range(300):
+            alphabet = rng.choice(alphabets)
+            case_sensitive = rng.random() < 0.3
+            plain = KeywordProcessor(case_sensitive=case_sensitive)
+            indexed = KeywordProcessor(case_sensitive=case_sensitive, fuzzy_index=2)
+            for _ in range(rng.randint(1, 5)):
+                keyword = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))).strip(' ')
+                if keyword:
+                    plain.add_keyword(keyword)
+                    indexed.add_keyword(keyword)
+            sentence = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 20)))
+            message = "trial {}: {!r}".format(trial, sentence)
+            for max_cost in (1, 2):
+                self.assertEqual(indexed.extract_keywords(sentence, span_info=True, max_cost=max_cost),
+                                 plain.extract_keywords(sentence, span_info=True, max_cost=max_cost), message)
+                self.assertEqual(indexed.replace_keywords(sentence, max_cost=max_cost),
+                                 plain.replace_keywords(sentence, max_cost=max_cost), message)
+                self.assertEqual(indexed.extract_keywords_column([sentence], max_cost=max_cost),
+                                 plain.extract_keywords_column([sentence], max_cost=max_cost), message)
+
+    def test_ties_ordered_by_keyword(self):
+        index = DeletionIndex(1)
+        for keyword in ('cat', 'bat', 'hat', 'rat'):
+            index.add(keyword, False)
+        self.assertEqual(index.lookup('at', 1), [('bat', 1), ('cat', 1), ('hat', 1), ('rat', 1)])
+
+    def test_index_follows_removal(self):
+        keyword_proc = KeywordProcessor(fuzzy_index=1)
+        keyword_proc.add_keyword('skype', 'messenger')
+        self.assertEqual(keyword_proc.extract_keywords('do you have skpe', max_cost=1, indexed=True), ['messenger'])
+        keyword_proc.remove_keyword('skype')
+        self.assertEqual(len(keyword_proc.fuzzy_index), 0)
+        self.assertEqual(keyword_proc.extract_keywords('do you have skpe', max_cost=1, indexed=True), [])
+
+    def test_cost_above_index(self):
+        keyword_proc = KeywordProcessor(fuzzy_index=1)
+        keyword_proc.add_keyword('made of multiple words')
+        sentence = "a keyword maade of multple words"
+        self.assertEqual(keyword_proc.extract_keywords(sentence, max_cost=2), ['made of multiple words'])
+        with self.assertRaises(ValueError):
+            keyword_proc.extract_keywords(sentence, max_cost=2, indexed=True)
+        with self.assertRaises(ValueError):
+            KeywordProcessor().replace_keywords(sentence, max_cost=1, indexed=True)
+        # exact scans have nothing to look up in the index
+        self.assertEqual(keyword_proc.extract_keywords(sentence, indexed=True), [])
+
+    def test_punctuation_not_swallowed(self):
+        keyword_proc = KeywordProcessor(fuzzy_index=2)
+        keyword_proc.add_keyword('No. of Colors', 'Número de colores')
+        sentence = "No. of colours: 10"
+        self.assertEqual(keyword_proc.replace_keywords(sentence, max_cost=2, indexed=True), "Número de colores: 10")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+from flashtext import KeywordProcessor
+from flashtext.trie_dict import build_node_meta
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestFuzzyPrune(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_node_meta_window(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('ab')
+        keyword_proc.add_keyword('abcde')
+        keyword_proc.add_keyword('x y')
+        trie = keyword_proc.keyword_trie_dict
+        node_meta = build_node_meta(trie, keyword_proc._white_space_chars, keyword_proc._keyword)
+        self.assertEqual(node_meta[id(trie)], (1, 5))
+        self.assertEqual(node_meta[id(trie['a']['b'])], (0, 3))
+        # 'x' has an outgoing white space edge, so a fuzzy match may stop there
+        self.assertEqual(node_meta[id(trie['x'])], (0, 2))
+
+    def test_node_meta_maintained_incrementally(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keywords_from_list(['skype', 'sky', 'colour here'])
+        keyword_proc.extract_keywords('skpe', max_cost=1)
+        keyword_proc.add_keyword('skyline', case_sensitive=True)
+        keyword_proc.add_keyword('Skylight')
+        keyword_proc.remove_keyword('skype')
+        keyword_proc.remove_keyword('colour here')
+        fresh = build_node_meta(keyword_proc.keyword_trie_dict, keyword_proc._white_space_chars,
+                                keyword_proc._keyword)
+        self.assertEqual(keyword_proc._node_meta, fresh)
+
+    def test_pruning_keeps_results(self):
+        keywords = ['ab', 'abcdefgh', 'abcdefghijkl', 'skype', 'colour here']
+        sentence = "abcdefxyz and skpe and abcdefgijkl or color here"
+        pruned = KeywordProcessor(fuzzy_cache_size=0)
+        pruned.add_keywords_from_list(keywords)
+        unpruned = KeywordProcessor(fuzzy_cache_size=0)
+        unpruned.add_keywords_from_list(keywords)
+        # an empty table gives the search no length window to prune with
+        unpruned._node_meta = {}
+        self.assertEqual(pruned.extract_keywords(sentence, span_info=True, max_cost=1),
+                         unpruned.extract_keywords(sentence, span_info=True, max_cost=1))
+        stats = pruned.fuzzy_stats()
+        self.assertGreater(stats['nodes_pruned'], 0)
+        self.assertLess(stats['nodes_expanded'], unpruned.fuzzy_stats()['nodes_expanded'])
+        self.assertEqual(unpruned.fuzzy_stats()['prune_rate'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
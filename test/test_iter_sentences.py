@@ -0,0 +1,74 @@
+from flashtext import KeywordProcessor
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+def chunked(text, size):
+    return (text[idx:idx + size] for idx in range(0, len(text), size))
+
+
+class TestIterSentences(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.kp = KeywordProcessor()
+        self.kp.add_keyword('Python')
+        self.kp.add_keyword('Java')
+        self.kp.add_keyword('機器學習', 'Machine Learning')
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_string_input(self):
+        text = "I love Python. Hello world. Java is old!"
+        self.assertEqual(list(self.kp.iter_sentences(text)),
+                         [(0, 14, ['Python']), (27, 40, ['Java'])])
+        self.assertEqual(list(self.kp.iter_sentences(text)), self.kp.extract_sentences(text, span_info=True))
+
+    def test_chunks_match_whole_text(self):
+        text = "I love Python... Hello world. 我喜歡機器學習。Java is old!! Bye\nPython"
+        expected = list(self.kp.iter_sentences(text))
+        self.assertEqual(len(expected), 4)
+        for size in range(1, len(text) + 1):
+            self.assertEqual(list(self.kp.iter_sentences(chunked(text, size))), expected,
+                             "Failed with chunk size {}".format(size))
+
+    def test_multi_char_delimiter_across_chunks(self):
+        text = "Python||Java||Ruby"
+        expected = [(0, 8, ['Python']), (8, 14, ['Java'])]
+        for size in range(1, len(text) + 1):
+            self.assertEqual(list(self.kp.iter_sentences(chunked(text, size), delimiters=['||'])), expected)
+
+    def test_keep_empty_sentences(self):
+        text = "Hello world. I love Python.  ;Bye.   "
+        sentences = list(self.kp.iter_sentences(chunked(text, 5), skip_empty=False))
+        # the trailing white space is not a sentence, a lone delimiter is
+        self.assertEqual(sentences, [(0, 12, []), (12, 27, ['Python']), (27, 30, []), (30, 34, [])])
+        self.assertEqual(text[27:30], "  ;")
+
+    def test_generator_is_lazy(self):
+        def chunks():
+            yield "Python. "
+            yield "Java."
+            raise AssertionError("read past the needed chunks")
+        sentences = self.kp.iter_sentences(chunks())
+        self.assertEqual(next(sentences), (0, 7, ['Python']))
+
+    def test_empty_input(self):
+        self.assertEqual(list(self.kp.iter_sentences('')), [])
+        self.assertEqual(list(self.kp.iter_sentences(iter([]))), [])
+
+    def test_no_delimiters(self):
+        # without delimiters the whole input is one sentence, as in extract_sentences
+        text = 'I use Python. And Java'
+        expected = [(0, len(text), ['Python', 'Java'])]
+        self.assertEqual(list(self.kp.iter_sentences(text, delimiters=[])), expected)
+        self.assertEqual(list(self.kp.iter_sentences(['I use Pyt', 'hon. And ', 'Java'], delimiters=[])), expected)
+        self.assertEqual(self.kp.extract_sentences(text, delimiters=[]), [(text, ['Python', 'Java'])])
+        self.assertEqual(self.kp.extract_sentences(text, delimiters=[], span_info=True), expected)
+        self.assertEqual(list(self.kp.iter_sentences(text, delimiters=[''])), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+from flashtext import KeywordProcessor, OverlayKeywordProcessor
+from flashtext.kernels import scan_exact, scan_boundary_free
+import json
+import logging
+import random
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+def kernel_of(processor):
+    return processor._select_kernel(processor._get_char_classes())
+
+
+class TestKernels(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        with open('test/keyword_extractor_test_cases.json') as f:
+            self.test_cases = json.load(f)
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def assertSameAsGenericLoop(self, processor, sentence, message=None):
+        for span_info in (False, True):
+            for return_ids in (False, True):
+                processor._use_kernels = True
+                specialized = processor.extract_keywords(sentence, span_info=span_info, return_ids=return_ids)
+                processor._use_kernels = False
+                generic = processor.extract_keywords(sentence, span_info=span_info, return_ids=return_ids)
+                processor._use_kernels = True
+                self.assertEqual(specialized, generic, message)
+
+    def test_test_cases(self):
+        for test_id, test_case in enumerate(self.test_cases):
+            for case_sensitive in (False, True):
+                processor = KeywordProcessor(case_sensitive=case_sensitive)
+                processor.add_keywords_from_dict(test_case['keyword_dict'])
+                self.assertSameAsGenericLoop(processor, test_case['sentence'],
+                                             "kernel differs for test case: {}".format(test_id))
+
+    def test_random_dictionaries(self):
+        alphabets = ('abAB .,-_', '雅詩蘭黛小棕瓶。 ', 'aB雅詩 .İiσςΣ1')
+        rng = random.Random(7)
+        for trial in range(1500):
+            processor = KeywordProcessor(case_sensitive=rng.random() < 0.3)
+            if rng.random() < 0.1:
+                processor.set_non_word_boundaries(set('ab'))
+            dictionary_alphabet = rng.choice(alphabets)
+            for _ in range(rng.randint(1, 6)):
+                keyword = ''.join(rng.choice(dictionary_alphabet) for _ in range(rng.randint(1, 4)))
+                clean_name = rng.choice([None, 'X', ['L1', 'L2']])
+                processor.add_keyword(keyword, clean_name, case_sensitive=rng.choice([None, True, False]))
+            text_alphabet = rng.choice(alphabets)
+            sentence = ''.join(rng.choice(text_alphabet) for _ in range(rng.randint(1, 25)))
+            self.assertSameAsGenericLoop(processor, sentence, "trial {}: {!r}".format(trial, sentence))
+
+    def test_dispatch(self):
+        processor = KeywordProcessor()
+        processor.add_keywords_from_list(['雅詩蘭黛', '小棕瓶'])
+        self.assertIs(kernel_of(processor), scan_boundary_free)
+        self.assertEqual(processor.extract_keywords('推薦雅詩蘭黛小棕瓶超好用', span_info=True),
+                         [('雅詩蘭黛', 2, 6), ('小棕瓶', 6, 9)])
+        processor.add_keyword('iPhone')
+        self.assertIs(kernel_of(processor), scan_exact)
+        self.assertEqual(processor.extract_keywords('買iPhone和小棕瓶'), ['iPhone', '小棕瓶'])
+
+        # word characters are what the processor says they are, case variants included
+        processor = KeywordProcessor()
+        processor.set_non_word_boundaries(set('ab'))
+        processor.add_keyword('A')
+        self.assertIs(kernel_of(processor), scan_exact)
+        self.assertSameAsGenericLoop(processor, 'xa a')
+        processor = KeywordProcessor(case_sensitive=True)
+        processor.add_keyword('雅詩')
+        self.assertIs(kernel_of(processor), scan_boundary_free)
+        processor.set_non_word_boundaries(set('雅詩'))
+        self.assertIs(kernel_of(processor), scan_exact)
+
+    def test_updates(self):
+        processor = KeywordProcessor()
+        processor.add_keyword('台北')
+        self.assertIs(kernel_of(processor), scan_boundary_free)
+        with processor.batch_update() as batch:
+            batch.add_keyword('Taipei')
+        self.assertIs(kernel_of(processor), scan_exact)
+
+        processor = KeywordProcessor()
+        processor.add_keyword('台北')
+        self.assertIs(kernel_of(processor), scan_boundary_free)
+        processor.apply_delta(['+ Taipei'])
+        self.assertIs(kernel_of(processor), scan_exact)
+
+        base = KeywordProcessor()
+        base.add_keyword('Apple', ['Fruit', 'Tech'])
+        overlay = OverlayKeywordProcessor(base)
+        self.assertIs(kernel_of(overlay), scan_exact)
+        self.assertEqual(overlay.extract_keywords('an Apple'), ['Fruit', 'Tech'])
+
+    def test_choice_kept_between_calls(self):
+        processor = KeywordProcessor()
+        processor.add_keywords_from_list(['雅詩蘭黛', '小棕瓶'])
+        self.assertIs(kernel_of(processor), scan_boundary_free)
+        choice = processor._kernel_choice
+        processor.add_keyword('蘭')
+        processor.extract_keywords('雅詩蘭黛')
+        # known characters and non-word characters leave the choice as it is
+        self.assertIs(processor._kernel_choice, choice)
+        processor.add_keyword('İstanbul')
+        self.assertIs(kernel_of(processor), scan_exact)
+        # new boundaries classify the keyword characters again
+        processor.non_word_boundaries = set()
+        self.assertIs(kernel_of(processor), scan_boundary_free)
+        self.assertSameAsGenericLoop(processor, 'İstanbul雅詩蘭黛 x')
+
+    def test_generic_loop_options(self):
+        """Fuzzy, category and columnar scans keep the generic loop and agree with the kernels."""
+        processor = KeywordProcessor()
+        processor.add_keyword('Big Apple', 'New York', categories=['city'])
+        processor.add_keyword('雅詩蘭黛')
+        sentence = 'I love Big Apple and 雅詩蘭黛'
+        expected = processor.extract_keywords(sentence, span_info=True)
+        self.assertEqual(processor.extract_keywords(sentence, span_info=True, max_cost=1), expected)
+        self.assertEqual(list(processor.extract_keywords(sentence, as_array=True)), expected)
+        self.assertEqual(processor.extract_keywords(sentence, categories=['city']), ['New York'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,5 +20,33 @@ class TestKPNextWord(unittest.TestCase):
         self.assertEqual(keyword_proc.get_next_word('random sentence'), 'random')
         self.assertEqual(keyword_proc.get_next_word(' random sentence'), '')
 
+    def test_next_word_cjk(self):
+        """
+        A CJK character outside the word set is a word by itself
+        """
+        keyword_proc = KeywordProcessor()
+        self.assertEqual(keyword_proc.get_next_word('機器學習'), '機')
+        self.assertEqual(keyword_proc.get_next_word('abc機器'), 'abc')
+
+    def test_next_word_end(self):
+        """
+        Offsets are taken in place, from any start position
+        """
+        keyword_proc = KeywordProcessor()
+        sentence = 'I love Big Apple 機器'
+        self.assertEqual(keyword_proc.get_next_word_end(sentence, 7), 10)
+        self.assertEqual(keyword_proc.get_next_word_end(sentence, 8), 10)
+        self.assertEqual(keyword_proc.get_next_word_end(sentence, 6), 6)
+        self.assertEqual(keyword_proc.get_next_word_end(sentence, 17), 18)
+        self.assertEqual(keyword_proc.get_next_word_end(sentence, len(sentence)), len(sentence))
+        self.assertEqual(keyword_proc.get_next_word_end('random sentence'), 6)
+
+    def test_next_word_end_follows_boundaries(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_non_word_boundary('-')
+        self.assertEqual(keyword_proc.get_next_word_end('new-york city'), 8)
+        keyword_proc.non_word_boundaries.discard('-')
+        self.assertEqual(keyword_proc.get_next_word_end('new-york city'), 3)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,121 @@
+from flashtext import KeywordProcessor
+from flashtext.latency import LatencyHistogram, LatencyRecorder, bucket_index, bucket_value
+import json
+import logging
+import pickle
+import sys
+import threading
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestLatency(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.kp = KeywordProcessor(latency=True)
+        self.kp.add_keyword('Big Apple', 'New York')
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_buckets(self):
+        previous = -1
+        for value in list(range(2000)) + [10 ** 6, 10 ** 9 + 7, 3 * 10 ** 12]:
+            index = bucket_index(value)
+            self.assertGreaterEqual(index, previous)
+            previous = index
+            self.assertLessEqual(abs(bucket_value(index) - value), value / 16.0)
+        for value in range(32):
+            self.assertEqual(bucket_value(bucket_index(value)), value)
+
+    def test_percentiles_and_merge(self):
+        low, high = LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 1001):
+            low.record(value * 1000)
+            high.record((value + 1000) * 1000)
+        self.assertAlmostEqual(low.percentile(50), 500000, delta=500000 / 16.0)
+        self.assertAlmostEqual(low.percentile(100), 1000000, delta=1000000 / 16.0)
+        low.merge(high)
+        self.assertEqual(low.count, 2000)
+        self.assertAlmostEqual(low.percentile(99), 1980000, delta=1980000 / 16.0)
+        self.assertEqual((low.min, low.max), (1000, 2000000))
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+    def test_processor_calls(self):
+        self.kp.extract_keywords('I love Big Apple')
+        self.kp.extract_keywords('I love Big Aple', max_cost=1)
+        self.kp.replace_keywords('I love Big Apple. ' * 10)
+        self.kp.extract_sentences('I love Big Apple. Me too.')
+        report = self.kp.latency_report(percentiles=(50, 99))
+        # calls made by replace_keywords and extract_sentences are not counted as extract_keywords
+        self.assertEqual(report['extract_keywords']['count'], 2)
+        self.assertEqual(report['extract_keywords']['by_mode']['fuzzy']['count'], 1)
+        self.assertEqual(set(report['extract_keywords']['by_length']), {'<16', '<32'})
+        self.assertEqual(report['replace_keywords']['by_length']['<256']['count'], 1)
+        self.assertEqual(report['extract_sentences']['count'], 1)
+        summary = report['extract_keywords']
+        self.assertGreater(summary['p50'], 0)
+        self.assertLessEqual(summary['p50'], summary['p99'])
+        self.assertLessEqual(summary['p99'], summary['max'])
+        self.assertEqual(self.kp.replace_keywords('Big Apple', 1), 'New York')
+        self.assertEqual(self.kp.latency_report()['replace_keywords']['by_mode']['fuzzy']['count'], 1)
+
+    def test_workers_merge(self):
+        other = KeywordProcessor(latency=True)
+        other.extract_keywords('nothing here')
+        self.kp.extract_keywords('I love Big Apple')
+        # recorders travel between processes as JSON
+        merged = LatencyRecorder.from_dict(json.loads(json.dumps(self.kp.latency_recorder.to_dict())))
+        merged.merge(LatencyRecorder.from_dict(other.latency_recorder.to_dict()))
+        self.assertEqual(merged.report()['extract_keywords']['count'], 2)
+
+    def test_threads_share_recorder(self):
+        recorder = LatencyRecorder()
+        interval = sys.getswitchinterval()
+        # switch threads as often as possible, so unguarded increments would be lost
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+        def record():
+            for duration in range(2000):
+                recorder.record('extract_keywords', 100, 0, duration)
+                recorder.record('extract_keywords', 100, 1, duration)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report = recorder.report()['extract_keywords']
+        self.assertEqual(report['count'], 32000)
+        self.assertEqual(report['by_mode']['fuzzy']['count'], 16000)
+        self.assertEqual(sum(recorder.histograms[('extract_keywords', 'exact', 7)].counts), 16000)
+
+        # a call recorded while the lock is held waits for it
+        recorded = threading.Thread(target=recorder.record, args=('replace_keywords', 10, 0, 5))
+        with recorder._lock:
+            recorded.start()
+            recorded.join(0.05)
+            self.assertTrue(recorded.is_alive())
+            self.assertNotIn(('replace_keywords', 'exact', 4), recorder.histograms)
+        recorded.join()
+        self.assertEqual(recorder.report()['replace_keywords']['count'], 1)
+
+    def test_pickle(self):
+        self.kp.extract_keywords('I love Big Apple')
+        copy = pickle.loads(pickle.dumps(self.kp))
+        self.assertEqual(copy.extract_keywords('Big Apple'), ['New York'])
+        self.assertEqual(copy.latency_report()['extract_keywords']['count'], 2)
+        plain = pickle.loads(pickle.dumps(KeywordProcessor()))
+        self.assertNotIn('extract_keywords', plain.__dict__)
+
+    def test_disabled(self):
+        kp = KeywordProcessor()
+        self.assertNotIn('extract_keywords', kp.__dict__)
+        with self.assertRaises(ValueError):
+            kp.latency_report()
+
+
+if __name__ == '__main__':
+    unittest.main()
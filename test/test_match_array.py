@@ -0,0 +1,89 @@
+from flashtext import KeywordProcessor
+from flashtext.matches import MatchArray
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestMatchArray(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.kp = KeywordProcessor()
+        self.kp.add_keyword('Big Apple', 'New York')
+        self.kp.add_keyword('NY', 'New York')
+        self.kp.add_keyword('Bay Area')
+        self.kp.add_keyword('Apple', ['Fruit', 'Tech'])
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_same_matches_as_span_info(self):
+        sentence = 'I love Big Apple, NY and Bay Area. Apple'
+        matches = self.kp.extract_keywords(sentence, as_array=True)
+        expected = self.kp.extract_keywords(sentence, span_info=True)
+        self.assertIsInstance(matches, MatchArray)
+        self.assertEqual(matches, expected)
+        self.assertEqual(len(matches), 5)
+        self.assertEqual(matches[1], ('New York', 18, 20))
+        self.assertEqual(matches[-2:], expected[-2:])
+        self.assertEqual(matches.clean_names(), self.kp.extract_keywords(sentence))
+
+    def test_names_interned(self):
+        matches = self.kp.extract_keywords('NY NY Big Apple NY', as_array=True)
+        self.assertEqual(matches.names, ['New York'])
+        self.assertEqual(list(matches.ids), [0, 0, 0, 0])
+        self.assertEqual(list(matches.starts), [0, 3, 6, 16])
+        self.assertEqual(list(matches.ends), [2, 5, 15, 18])
+
+    def test_empty(self):
+        matches = self.kp.extract_keywords('', as_array=True)
+        self.assertEqual(len(matches), 0)
+        self.assertEqual(self.kp.extract_keywords('nothing here', as_array=True), [])
+
+    def test_fuzzy_and_normalized(self):
+        kp = KeywordProcessor(normalization='NFKC', fuzzy_index=1)
+        kp.add_keyword('skype', 'messenger')
+        kp.add_keyword('kg')
+        sentence = '㎏ of ｓｋｐｅ'
+        self.assertEqual(kp.extract_keywords(sentence, as_array=True),
+                         kp.extract_keywords(sentence, span_info=True, max_cost=0))
+        self.assertEqual(kp.extract_keywords(sentence, max_cost=1, as_array=True, indexed=True),
+                         [('kg', 0, 1), ('messenger', 5, 9)])
+
+    def test_consumed_by_replace_and_sentences(self):
+        sentence = 'I love Big Apple. Bay Area too.'
+        matches = self.kp.extract_keywords(sentence, as_array=True)
+        self.assertEqual(self.kp.replace_keywords(sentence, matches=matches), self.kp.replace_keywords(sentence))
+        self.assertEqual(self.kp.extract_sentences(sentence, matches=matches), self.kp.extract_sentences(sentence))
+
+    def test_replace_with_ids_and_labels(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('python', ['Python', 'Py'])
+        kp.add_keyword('java', 'Java', categories='language')
+        sentence = 'I like python and java'
+        expected = kp.replace_keywords(sentence)
+        self.assertEqual(expected, 'I like Python and Java')
+        for matches in (kp.extract_keywords(sentence, as_array=True, return_ids=True),
+                        kp.extract_keywords(sentence, span_info=True, return_ids=True),
+                        kp.extract_keywords(sentence, as_array=True)):
+            self.assertEqual(kp.replace_keywords(sentence, matches=matches), expected)
+        matches = kp.extract_keywords(sentence, span_info=True, return_ids=True, categories='language')
+        self.assertEqual(kp.replace_keywords(sentence, matches=matches, categories='language'),
+                         'I like python and Java')
+        with self.assertRaises(ValueError):
+            kp.replace_keywords(sentence, matches=kp.extract_keywords(sentence, return_ids=True))
+        with self.assertRaises(ValueError):
+            kp.replace_keywords(sentence, matches=kp.extract_keywords(sentence))
+        kp.add_keyword('rust', {'id': 3})
+        with self.assertRaises(ValueError):
+            kp.replace_keywords('I like rust')
+
+    def test_from_tuples(self):
+        matches = MatchArray.from_tuples([('a', 0, 1), ('b', 2, 3), ('a', 4, 5)])
+        self.assertEqual(matches.names, ['a', 'b'])
+        self.assertEqual(matches.to_list(), [('a', 0, 1), ('b', 2, 3), ('a', 4, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+from flashtext import KeywordProcessor
+from flashtext.normalize import Normalizer, map_span
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestNormalization(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_one_to_one_keeps_positions(self):
+        normalizer = Normalizer('NFKC')
+        self.assertEqual(normalizer.normalize('ＡＢＣ１２３ abc'), ('ABC123 abc', None))
+        self.assertEqual(normalizer.normalize('plain text'), ('plain text', None))
+
+    def test_offset_map(self):
+        normalizer = Normalizer('NFKC')
+        # half-width ｶ + voiced mark compose into one char, ㎏ expands into two
+        normalized, offsets = normalizer.normalize('ｶﾞ ㎏')
+        self.assertEqual(normalized, 'ガ kg')
+        self.assertEqual(list(offsets), [0, 2, 3, 3, 4])
+        self.assertEqual(map_span(offsets, 0, 1), (0, 2))
+        self.assertEqual(map_span(offsets, 2, 4), (3, 4))
+        # a span ending inside an expansion covers the whole original char
+        self.assertEqual(map_span(offsets, 2, 3), (3, 4))
+
+    def test_full_width_keyword(self):
+        keyword_proc = KeywordProcessor(normalization='NFKC')
+        keyword_proc.add_keyword('iPhone 15', 'Apple')
+        sentence = 'new ｉＰｈｏｎｅ １５ here'
+        self.assertEqual(keyword_proc.extract_keywords(sentence, span_info=True), [('Apple', 4, 13)])
+        self.assertEqual(keyword_proc.replace_keywords(sentence), 'new Apple here')
+
+    def test_spans_refer_to_original(self):
+        keyword_proc = KeywordProcessor(normalization='NFKC')
+        keyword_proc.add_keyword('ガンダム', 'Gundam')
+        keyword_proc.add_keyword('kg')
+        sentence = '㎏の ｶﾞﾝﾀﾞﾑ です'
+        found = keyword_proc.extract_keywords(sentence, span_info=True)
+        self.assertEqual(found, [('kg', 0, 1), ('Gundam', 3, 9)])
+        self.assertEqual(sentence[3:9], 'ｶﾞﾝﾀﾞﾑ')
+        self.assertEqual(keyword_proc.replace_keywords(sentence), 'kgの Gundam です')
+        self.assertEqual(keyword_proc.extract_keywords(sentence), ['kg', 'Gundam'])
+
+    def test_keyword_stored_once(self):
+        keyword_proc = KeywordProcessor(normalization='NFKC')
+        keyword_proc.add_keyword('ＡＢＣ')
+        self.assertEqual(len(keyword_proc), 1)
+        self.assertFalse(keyword_proc.add_keyword('ABC'))
+        self.assertIn('ＡＢＣ', keyword_proc)
+        self.assertIn('abc', keyword_proc)
+        self.assertEqual(keyword_proc.get_keyword('abc'), 'ABC')
+        self.assertTrue(keyword_proc.remove_keyword('ａｂｃ'))
+        self.assertEqual(len(keyword_proc), 0)
+
+    def test_default_clean_name_is_original(self):
+        keyword_proc = KeywordProcessor(normalization='NFKC')
+        keyword_proc.add_keyword('ｶﾞﾝﾀﾞﾑ')
+        self.assertEqual(keyword_proc.extract_keywords('ガンダム'), ['ｶﾞﾝﾀﾞﾑ'])
+
+    def test_fuzzy_on_normalized_text(self):
+        keyword_proc = KeywordProcessor(normalization='NFKC')
+        keyword_proc.add_keyword('skype', 'messenger')
+        sentence = 'do you have ｓｋｐｅ ?'
+        self.assertEqual(keyword_proc.extract_keywords(sentence, span_info=True, max_cost=1),
+                         [('messenger', 12, 16)])
+
+    def test_disabled_by_default(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('ABC')
+        self.assertIsNone(keyword_proc.normalizer)
+        self.assertEqual(keyword_proc.extract_keywords('ＡＢＣ'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
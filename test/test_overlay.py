@@ -0,0 +1,97 @@
+from flashtext import KeywordProcessor, OverlayKeywordProcessor
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestOverlay(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        self.base = KeywordProcessor()
+        self.base.add_keyword('New York', categories=['location'])
+        self.base.add_keyword('Big Apple', 'New York')
+        self.base.add_keyword('Java')
+        self.base.add_keyword('機器學習', 'Machine Learning')
+        self.sentence = 'I love Java and New York Times in the Big Apple. 機器學習'
+        self.base_matches = self.base.extract_keywords(self.sentence, span_info=True)
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_additions_and_removals(self):
+        tenant = OverlayKeywordProcessor(self.base)
+        tenant.add_keyword('New York Times', 'NYT')
+        tenant.add_keyword('學習')
+        self.assertTrue(tenant.remove_keyword('java'))
+        self.assertEqual(tenant.extract_keywords(self.sentence),
+                         ['NYT', 'New York', 'Machine Learning'])
+        self.assertEqual(len(tenant), 5)
+        self.assertNotIn('Java', tenant)
+        self.assertEqual(tenant['big apple'], 'New York')
+        # the base is untouched
+        self.assertEqual(self.base.extract_keywords(self.sentence, span_info=True), self.base_matches)
+        self.assertEqual(len(self.base), 4)
+        self.assertIn('Java', self.base)
+        self.assertNotIn('學習', self.base)
+
+    def test_same_as_merged_processor(self):
+        tenant = OverlayKeywordProcessor(self.base)
+        merged = KeywordProcessor()
+        for keyword, clean_name in self.base.get_all_keywords().items():
+            merged.add_keyword(keyword, clean_name)
+        for processor in (tenant, merged):
+            processor.add_keyword('Big', 'big')
+            processor.add_keyword('Big Apple Pie')
+            processor.remove_keyword('New York')
+        sentence = 'Big Apple Pie, Big Apple, Big Apples and New York'
+        self.assertEqual(tenant.extract_keywords(sentence, span_info=True),
+                         merged.extract_keywords(sentence, span_info=True))
+        self.assertEqual(tenant.get_all_keywords(), merged.get_all_keywords())
+
+    def test_tenants_are_independent(self):
+        first = OverlayKeywordProcessor(self.base)
+        second = OverlayKeywordProcessor(self.base)
+        first.add_keyword('Java', 'JVM')
+        second.remove_keyword('Big Apple')
+        self.assertEqual(first.extract_keywords('Java Big Apple'), ['JVM', 'New York'])
+        self.assertEqual(second.extract_keywords('Java Big Apple'), ['Java'])
+        self.assertEqual(self.base.extract_keywords('Java Big Apple'), ['Java', 'New York'])
+
+    def test_case_edges_moved_together(self):
+        tenant = OverlayKeywordProcessor(self.base)
+        tenant.add_keyword('JAVASCRIPT')
+        self.assertIs(tenant.keyword_trie_dict['j'], tenant.keyword_trie_dict['J'])
+        self.assertEqual(tenant.extract_keywords('java javascript'), ['Java', 'JAVASCRIPT'])
+        self.assertEqual(self.base.extract_keywords('java javascript'), ['Java'])
+
+    def test_only_changed_paths_are_copied(self):
+        tenant = OverlayKeywordProcessor(self.base)
+        self.assertEqual(tenant.owned_nodes(), 1)
+        tenant.add_keyword('Javac')
+        # root plus 'j', 'a', 'v', 'a' copied and 'c' added
+        self.assertEqual(tenant.owned_nodes(), 6)
+        self.assertIs(tenant.keyword_trie_dict['b'], self.base.keyword_trie_dict['b'])
+
+    def test_payload_ids_and_categories(self):
+        tenant = OverlayKeywordProcessor(self.base)
+        tenant.add_keyword('Paris', categories=['location'])
+        tenant.add_keyword('Tokyo', categories=['capital'])
+        self.assertEqual(tenant.extract_keywords('Paris, New York, Tokyo', categories='location'),
+                         ['Paris', 'New York'])
+        ids = tenant.extract_keywords('Big Apple Tokyo', return_ids=True)
+        self.assertEqual([tenant.get_payload(payload_id) for payload_id in ids], ['New York', 'Tokyo'])
+        self.assertEqual(self.base.get_categories('Tokyo'), set())
+        self.assertNotIn('capital', self.base._category_bits)
+
+    def test_normalized_base(self):
+        base = KeywordProcessor(normalization='NFKC')
+        base.add_keyword('ABC')
+        tenant = OverlayKeywordProcessor(base)
+        tenant.add_keyword('ｘｙｚ', 'XYZ')
+        self.assertEqual(tenant.extract_keywords('ＡＢＣ xyz', span_info=True), [('ABC', 0, 3), ('XYZ', 4, 7)])
+        self.assertEqual(base.extract_keywords('ＡＢＣ xyz'), ['ABC'])
+
+
+if __name__ == '__main__':
+    unittest.main()
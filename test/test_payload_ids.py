@@ -0,0 +1,113 @@
+from flashtext import KeywordProcessor
+from flashtext.matches import MatchArray
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestPayloadIds(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_clean_names_stored_once(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keywords_from_dict({'New York': ['NY', 'NYC', 'Big Apple', 'new-york']})
+        keyword_proc.add_keyword('Apple', ['Fruit', 'Tech'])
+        keyword_proc.add_keyword('Pomme', ['Fruit', 'Tech'])
+        self.assertEqual(keyword_proc._payloads, ['New York', ['Fruit', 'Tech']])
+        trie = keyword_proc.keyword_trie_dict
+        self.assertEqual(trie['n']['y']['_keyword_'], trie['b']['i']['g'][' ']['a']['p']['p']['l']['e']['_keyword_'])
+
+    def test_return_ids(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('NY', 'New York')
+        keyword_proc.add_keyword('Big Apple', 'New York')
+        keyword_proc.add_keyword('SF', 'San Francisco')
+        sentence = 'NY, SF and Big Apple'
+        self.assertEqual(keyword_proc.extract_keywords(sentence, return_ids=True), [0, 1, 0])
+        self.assertEqual(keyword_proc.extract_keywords(sentence, span_info=True, return_ids=True),
+                         [(0, 0, 2), (1, 4, 6), (0, 11, 20)])
+        self.assertEqual(keyword_proc.get_payload(1), 'San Francisco')
+
+    def test_first_id_is_zero(self):
+        """id 0 is falsy, it must still count as a match, also for adjacent CJK keywords"""
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('人工')
+        keyword_proc.add_keyword('智慧')
+        self.assertEqual(keyword_proc.extract_keywords('人工智慧', span_info=True, return_ids=True),
+                         [(0, 0, 2), (1, 2, 4)])
+        self.assertEqual(keyword_proc.extract_keywords('人工智慧'), ['人工', '智慧'])
+
+    def test_metadata_payload(self):
+        keyword_proc = KeywordProcessor()
+        entity = {'id': 'Q60', 'type': 'city'}
+        keyword_proc.add_keyword('NYC', entity)
+        keyword_proc.add_keyword('NY', entity)
+        self.assertEqual(len(keyword_proc._payloads), 2)
+        self.assertIs(keyword_proc.extract_keywords('NYC')[0], entity)
+        self.assertIs(keyword_proc.get_keyword('NY'), entity)
+
+    def test_multi_label_single_id(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('Apple', ['Fruit', 'Tech'])
+        self.assertEqual(keyword_proc.extract_keywords('Apple', return_ids=True), [0])
+        self.assertEqual(keyword_proc.extract_keywords('Apple'), ['Fruit', 'Tech'])
+
+    def test_ids_as_array(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('NY', 'New York')
+        keyword_proc.add_keyword('SF', 'San Francisco')
+        matches = keyword_proc.extract_keywords('SF NY SF', as_array=True, return_ids=True)
+        self.assertIsInstance(matches, MatchArray)
+        self.assertEqual(list(matches.ids), [1, 0, 1])
+        self.assertIs(matches.names, keyword_proc._payloads)
+        self.assertEqual(matches[0], ('San Francisco', 0, 2))
+
+    def test_fuzzy_index_and_normalization(self):
+        keyword_proc = KeywordProcessor(fuzzy_index=1, normalization='NFKC')
+        keyword_proc.add_keyword('skype', 'messenger')
+        keyword_proc.add_keyword('kg')
+        matches = keyword_proc.extract_keywords('ｓｋｐｅ ㎏', span_info=True, max_cost=1, return_ids=True, indexed=True)
+        self.assertEqual(matches, [(0, 0, 4), (1, 5, 6)])
+        self.assertEqual(keyword_proc.extract_keywords('ㄅ ㎏', as_array=True, return_ids=True), [('kg', 2, 3)])
+
+    def test_unused_ids_reclaimed(self):
+        keyword_proc = KeywordProcessor()
+        table_sizes = []
+        for cycle in range(5):
+            keywords = ['keyword{}'.format(index) for index in range(1000)]
+            for index, keyword in enumerate(keywords):
+                keyword_proc.add_keyword(keyword, 'name{}'.format(index))
+            keyword_proc.add_keyword('entity', {'id': cycle})
+            keyword_proc.apply_delta(['~ {}=>renamed{}-{}'.format(keyword, cycle, index)
+                                      for index, keyword in enumerate(keywords)])
+            self.assertEqual(keyword_proc.extract_keywords('keyword7 entity'),
+                             ['renamed{}-7'.format(cycle), {'id': cycle}])
+            keyword_proc.apply_delta(['- {}'.format(keyword) for keyword in keywords])
+            keyword_proc.remove_keyword('entity')
+            table_sizes.append(len(keyword_proc._payloads))
+        self.assertEqual(len(keyword_proc), 0)
+        # ids are recycled once retired ids are released: the table stops growing
+        self.assertEqual(len(set(table_sizes[2:])), 1)
+        self.assertLess(sum(payload is not None for payload in keyword_proc._payloads), 2100)
+
+        # recycled ids resolve to their new payloads
+        keyword_proc.add_keyword('python', 'Python')
+        keyword_proc.add_keyword('py', 'Python')
+        payload_id, = keyword_proc.extract_keywords('python', return_ids=True)
+        self.assertEqual(keyword_proc.get_payload(payload_id), 'Python')
+        self.assertEqual(keyword_proc.extract_keywords('py python keyword1'), ['Python', 'Python'])
+
+    def test_get_all_keywords_returns_clean_names(self):
+        keyword_proc = KeywordProcessor()
+        keyword_proc.add_keyword('j2ee', 'Java')
+        keyword_proc.add_keyword('Python', 'Python')
+        self.assertEqual(keyword_proc.get_all_keywords(), {'j2ee': 'Java', 'python': 'Python'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+from flashtext import KeywordProcessor
+import json
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestScanStats(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+        with open('test/keyword_extractor_test_cases.json') as f:
+            self.test_cases = json.load(f)
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_same_results_as_regular_scan(self):
+        """The instrumented copy of the scan loop must find exactly what the regular loop finds."""
+        for test_id, test_case in enumerate(self.test_cases):
+            for max_cost in (0, 1):
+                regular = KeywordProcessor()
+                instrumented = KeywordProcessor(stats=True)
+                for processor in (regular, instrumented):
+                    processor.add_keywords_from_dict(test_case['keyword_dict'])
+                sentence = test_case['sentence']
+                self.assertEqual(instrumented.extract_keywords(sentence, span_info=True, max_cost=max_cost),
+                                 regular.extract_keywords(sentence, span_info=True, max_cost=max_cost),
+                                 "instrumented scan differs for test case: {}".format(test_id))
+                self.assertEqual(instrumented.extract_keywords(sentence, as_array=True, return_ids=True),
+                                 regular.extract_keywords(sentence, as_array=True, return_ids=True))
+
+    def test_counters(self):
+        kp = KeywordProcessor(stats=True)
+        kp.add_keyword('New York')
+        kp.add_keyword('New York Times')
+        kp.add_keyword('機器學習')
+        kp.add_keyword('學習')
+        kp.extract_keywords('New York is big')
+        stats = kp.scan_stats()
+        self.assertEqual(stats['sentences'], 1)
+        self.assertEqual(stats['chars_scanned'], 15)
+        self.assertEqual(stats['matches'], 1)
+        # the look-ahead from 'New' finds 'New York', then reads 'i' looking for 'New York Times'
+        self.assertEqual(stats['lookahead_runs'], 1)
+        self.assertEqual(stats['lookahead_chars'], 6)
+        self.assertEqual(stats['lookahead_backtracks'], 0)
+        # 'is' and 'big' are skipped after their first character
+        self.assertEqual(stats['skipped_chars'], 3)
+        self.assertEqual(stats['fuzzy_calls'], 0)
+
+        kp.extract_keywords('New Jersey')
+        self.assertEqual(kp.scan_stats()['lookahead_backtracks'], 1)
+
+        kp.scan_stats(reset=True)
+        self.assertEqual(kp.scan_stats()['sentences'], 0)
+        kp.extract_keywords('我喜歡機器學習學習')
+        stats = kp.scan_stats()
+        self.assertEqual(stats['matches'], 2)
+        self.assertEqual(stats['cjk_rechecks'], 2)
+
+    def test_fuzzy_counters(self):
+        kp = KeywordProcessor(stats=True)
+        kp.add_keyword('Big Apple')
+        self.assertEqual(kp.extract_keywords('I love Big Aple', max_cost=1), ['Big Apple'])
+        stats = kp.scan_stats()
+        # every word missing from the trie is resolved: 'I', 'love' and 'Aple'
+        self.assertEqual(stats['fuzzy_calls'], 3)
+        self.assertGreater(stats['fuzzy_nodes_expanded'], 0)
+
+        # with indexed scans every probed window counts: 'I love Big', 'love Big' and 'Big Aple'
+        kp = KeywordProcessor(stats=True, fuzzy_index=1)
+        kp.add_keyword('Big Apple')
+        self.assertEqual(kp.extract_keywords('I love Big Aple', max_cost=1, indexed=True), ['Big Apple'])
+        matches = kp.extract_keywords('I love Big Aple', max_cost=1, as_array=True, indexed=True)
+        self.assertEqual(matches.clean_names(), ['Big Apple'])
+        self.assertEqual(kp.scan_stats()['fuzzy_calls'], 6)
+
+    def test_disabled(self):
+        kp = KeywordProcessor()
+        with self.assertRaises(ValueError):
+            kp.scan_stats()
+
+
+if __name__ == '__main__':
+    unittest.main()
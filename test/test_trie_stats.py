@@ -0,0 +1,76 @@
+from flashtext import KeywordProcessor, OverlayKeywordProcessor
+import logging
+import unittest
+
+logger = logging.getLogger(__name__)
+
+
+class TestTrieStats(unittest.TestCase):
+    def setUp(self):
+        logger.info("Starting...")
+
+    def tearDown(self):
+        logger.info("Ending.")
+
+    def test_case_links(self):
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword('Big Apple')
+        stats = keyword_processor.trie_stats()
+        # 9 characters, each an upper and a lower case edge to one node, but ' '
+        self.assertEqual((stats['nodes'], stats['edges'], stats['shared_edges']), (10, 17, 8))
+        self.assertEqual(stats['keywords'], 1)
+        self.assertEqual(stats['max_depth'], 9)
+        self.assertEqual(stats['depth'], [1] * 10)
+        self.assertEqual(stats['fanout'], {0: 1, 1: 1, 2: 8})
+
+        keyword_processor = KeywordProcessor(case_sensitive=True)
+        keyword_processor.add_keywords_from_list(['Big Apple', 'Big Sur'])
+        stats = keyword_processor.trie_stats()
+        self.assertEqual((stats['nodes'], stats['edges'], stats['shared_edges']), (13, 12, 0))
+        self.assertEqual(stats['keywords'], 2)
+        self.assertEqual(stats['fanout'][2], 1)
+
+    def test_shared_nodes_counted_once(self):
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword('σ')
+        keyword_processor.add_keyword('ς')
+        stats = keyword_processor.trie_stats()
+        self.assertEqual(stats['nodes'], 2)
+        self.assertEqual(stats['edges'] - stats['shared_edges'], 1)
+
+    def test_deep_trie(self):
+        keyword_processor = KeywordProcessor(case_sensitive=True)
+        keyword_processor.add_keyword('字' * 20000)
+        stats = keyword_processor.trie_stats()
+        self.assertEqual(stats['max_depth'], 20000)
+        self.assertEqual(stats['nodes'], 20001)
+
+    def test_memory_usage(self):
+        keyword_processor = KeywordProcessor(fuzzy_index=1)
+        keyword_processor.add_keyword('Big Apple', 'New York')
+        shallow = keyword_processor.memory_usage()
+        deep = keyword_processor.memory_usage(deep=True)
+        self.assertEqual(set(deep), {'trie', 'payloads', 'fuzzy_index', 'fuzzy_meta', 'fuzzy_cache', 'total'})
+        self.assertEqual(deep['total'], sum(value for key, value in deep.items() if key != 'total'))
+        self.assertGreater(deep['trie'], shallow['trie'])
+        self.assertGreater(deep['payloads'], shallow['payloads'])
+        self.assertGreater(deep['fuzzy_index'], 0)
+        self.assertEqual(deep['fuzzy_meta'], 0)
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keyword('Big Apple', 'New York')
+        keyword_processor.extract_keywords('I love Big Aple', max_cost=1)
+        self.assertGreater(keyword_processor.memory_usage()['fuzzy_meta'], 0)
+
+    def test_overlay(self):
+        base = KeywordProcessor()
+        base.add_keywords_from_list(['Python', 'Java'])
+        overlay = OverlayKeywordProcessor(base)
+        overlay.add_keyword('Rust')
+        overlay.remove_keyword('Java')
+        self.assertEqual(overlay.trie_stats()['keywords'], 2)
+        self.assertEqual(base.trie_stats()['keywords'], 2)
+        self.assertGreater(overlay.memory_usage(deep=True)['total'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
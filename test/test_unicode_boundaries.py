@@ -0,0 +1,64 @@
+"""Test cases for Issue #4: Internationalized word boundaries.
+
+Non-ASCII letters, digits and combining marks are part of a word by default,
+while scripts written without spaces (CJK, Thai, ...) keep matching anywhere.
+"""
+import unittest
+from flashtext import KeywordProcessor
+
+
+class TestUnicodeBoundaries(unittest.TestCase):
+    """Test the Unicode word boundary mode."""
+
+    def test_latin_accents(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('café')
+        kp.add_keyword('caf')
+        self.assertEqual(kp.extract_keywords('I went to a café.'), ['café'])
+        self.assertEqual(kp.extract_keywords('I went to a cafés.'), [])
+
+    def test_devanagari(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('नमस्ते')
+        kp.add_keyword('नम')
+        self.assertEqual(kp.extract_keywords('नमस्ते दुनिया', span_info=True), [('नमस्ते', 0, 6)])
+
+    def test_cjk_and_thai_still_match_inside_text(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('雅詩蘭黛')
+        kp.add_keyword('小棕瓶')
+        kp.add_keyword('สวัสดี')
+        self.assertEqual(kp.extract_keywords('推薦雅詩蘭黛小棕瓶超好用'), ['雅詩蘭黛', '小棕瓶'])
+        self.assertEqual(kp.extract_keywords('พูดสวัสดีครับ'), ['สวัสดี'])
+
+    def test_ascii_mode(self):
+        """The previous ASCII-only behaviour is still available."""
+        kp = KeywordProcessor(unicode_boundaries=False)
+        kp.add_keyword('caf')
+        self.assertEqual(kp.extract_keywords('I went to a café.'), ['caf'])
+
+    def test_explicit_boundaries_replace_unicode(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('caf')
+        kp.set_non_word_boundaries(set('abcdefghijklmnopqrstuvwxyz'))
+        self.assertFalse(kp.unicode_boundaries)
+        self.assertEqual(kp.extract_keywords('café'), ['caf'])
+
+    def test_in_place_changes_are_seen(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('new')
+        self.assertEqual(kp.extract_keywords('new-york'), ['new'])
+        kp.add_non_word_boundary('-')
+        self.assertEqual(kp.extract_keywords('new-york'), [])
+        kp.non_word_boundaries.discard('-')
+        self.assertEqual(kp.extract_keywords('new-york'), ['new'])
+
+    def test_fuzzy_word_scan(self):
+        kp = KeywordProcessor()
+        kp.add_keyword('crème brûlée')
+        self.assertEqual(kp.extract_keywords('une crème brulée', max_cost=1), ['crème brûlée'])
+        self.assertEqual(kp.get_next_word('brûlée!'), 'brûlée')
+
+
+if __name__ == '__main__':
+    unittest.main()